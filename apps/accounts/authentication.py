@@ -0,0 +1,193 @@
+"""
+JWT authentication that resolves the user without a query per request.
+
+The access token already proves who the caller is; what still needs a
+lookup is the current user row (is_active, profile fields). Users are
+cached in two tiers, keyed by user id and a per-user version:
+
+1. a small process-local LRU with a short TTL, and
+2. the shared Django cache.
+
+Any change to a user (profile update, password change, deactivation,
+...) bumps the version, which retires both tiers at once. If the shared
+cache is unavailable (e.g. DummyCache) every version is fresh, so lookups
+simply fall through to the database.
+
+Only column values are cached, without the password hash: credentials
+never reach the shared cache. A user rebuilt from the cache has `password`
+deferred, so `check_password()` loads it, and `save()` writes only the
+loaded fields instead of blanking it.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.fields.files import FieldFile
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.core.cache import aget_generation, bump_generation, get_generation
+from apps.core.metrics import record_cache
+
+USER_CACHE_NAMESPACE = 'auth_user'
+USER_CACHE_TIMEOUT   = 300
+LOCAL_CACHE_TTL      = 30
+LOCAL_CACHE_SIZE     = 1024
+
+
+class LocalLRU:
+    """Thread-safe, size-bounded LRU whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self._data   = OrderedDict()
+        self._lock   = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_users = LocalLRU(LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL)
+
+
+def _user_key(user_id, version):
+    return f'{USER_CACHE_NAMESPACE}_{user_id}_{version}'
+
+
+def invalidate_user(user_id):
+    """Retire every cached copy of the user (call after any change to the row)."""
+    bump_generation(USER_CACHE_NAMESPACE, user_id)
+
+
+def _cached_values(user):
+    """The user's column values to cache: everything but the password hash."""
+    values = {}
+    for field in user._meta.concrete_fields:
+        if field.attname != 'password':
+            value = field.value_from_object(user)
+            values[field.attname] = value.name if isinstance(value, FieldFile) else value
+    return values
+
+
+def _rebuild(values):
+    """A fresh user from `_cached_values()`, with `password` deferred."""
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+def get_cached_user(user_id):
+    """Return the user with `user_id` (a private copy), or None if there is none."""
+    version = get_generation(USER_CACHE_NAMESPACE, user_id)
+    key     = _user_key(user_id, version)
+
+    values = local_users.get(key)
+    if values is None:
+        values = cache.get(key)
+        record_cache('user', values is not None)
+        if values is None:
+            User = get_user_model()
+            # Always the primary: new and deactivated users must count at once
+            user = User.objects.using(DEFAULT_DB_ALIAS).filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is None:
+                return None
+            values = _cached_values(user)
+            cache.set(key, values, timeout=USER_CACHE_TIMEOUT)
+            local_users.set(key, values)
+            # Already a private instance, and with its password loaded
+            return user
+        local_users.set(key, values)
+    else:
+        record_cache('user', True)
+    # Requests may modify request.user; every call builds its own instance
+    return _rebuild(values)
+
+
+async def aget_cached_user(user_id):
+    """Async `get_cached_user()`, for the async views."""
+    version = await aget_generation(USER_CACHE_NAMESPACE, user_id)
+    key     = _user_key(user_id, version)
+
+    values = local_users.get(key)
+    if values is None:
+        values = await cache.aget(key)
+        record_cache('user', values is not None)
+        if values is None:
+            User = get_user_model()
+            user = await User.objects.using(DEFAULT_DB_ALIAS).filter(**{api_settings.USER_ID_FIELD: user_id}).afirst()
+            if user is None:
+                return None
+            values = _cached_values(user)
+            await cache.aset(key, values, timeout=USER_CACHE_TIMEOUT)
+            local_users.set(key, values)
+            return user
+        local_users.set(key, values)
+    else:
+        record_cache('user', True)
+    return _rebuild(values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """`JWTAuthentication` backed by `get_cached_user()` instead of a SELECT."""
+
+    def get_user(self, validated_token):
+        return self.check_user(get_cached_user(self.get_user_id(validated_token)), validated_token)
+
+    async def aget_user(self, validated_token):
+        return self.check_user(await aget_cached_user(self.get_user_id(validated_token)), validated_token)
+
+    async def aauthenticate(self, request):
+        """Async `authenticate()`; token validation itself is CPU-only."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def check_user(self, user, validated_token):
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
@@ -0,0 +1,156 @@
+"""
+Avatar variants.
+
+The upload is stored as-is; a worker then re-encodes it in place (upright,
+at most `ORIGINAL_MAX_SIZE` px, without EXIF such as GPS position) and
+renders square WebP and JPEG copies at each size in `AVATAR_SIZES`, so
+clients never have to download the full photo just to draw a 36px avatar.
+"""
+import io
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .authentication import invalidate_user
+
+AVATAR_SIZES      = (64, 128, 256)
+AVATAR_FORMATS    = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+ORIGINAL_MAX_SIZE = 1024
+ORIGINAL_FORMATS  = {'JPEG': {'quality': 90}, 'PNG': {'optimize': True}, 'WEBP': {'quality': 90}}
+MAX_UPLOAD_SIZE   = 10 * 1024 * 1024
+MAX_PIXELS        = 40_000_000
+
+
+def _variant_name(original, size, extension):
+    stem = os.path.splitext(os.path.basename(original))[0]
+    return f'avatars/variants/{stem}-{size}.{extension}'
+
+
+def _flatten(image):
+    """RGB copy for JPEG; transparent areas become white."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image      = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _open(name, draft_size):
+    """The stored image at `name`, decoded, with its EXIF orientation applied."""
+    with default_storage.open(name, 'rb') as fileobj:
+        image = Image.open(fileobj)
+        if image.width * image.height > MAX_PIXELS:
+            raise ValueError('Image is too large.')
+        pil_format = image.format
+        # Let the decoder downscale JPEGs while reading (much cheaper than resizing after)
+        image.draft('RGB', (draft_size, draft_size))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    return image, pil_format
+
+
+def sanitize_original(original):
+    """
+    Re-encode the upload stored at `original` from its pixels alone and
+    return its (normally unchanged) name.
+
+    EXIF, including GPS, is dropped and the image is capped at
+    `ORIGINAL_MAX_SIZE`; formats other than JPEG and WebP are written as PNG.
+    """
+    image, pil_format = _open(original, ORIGINAL_MAX_SIZE)
+    image.thumbnail((ORIGINAL_MAX_SIZE, ORIGINAL_MAX_SIZE), Image.Resampling.LANCZOS)
+    if pil_format not in ORIGINAL_FORMATS:
+        pil_format = 'PNG'
+    if pil_format == 'JPEG':
+        image = _flatten(image)
+    elif image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+        image = image.convert('RGBA')
+
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **ORIGINAL_FORMATS[pil_format])
+    name = original
+    if pil_format == 'PNG' and not original.lower().endswith('.png'):
+        name = f'{os.path.splitext(original)[0]}.png'
+    default_storage.delete(original)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def render_variants(original):
+    """
+    Render every variant of the image stored at `original`.
+
+    Returns `{size: {extension: bytes}}`. Only pixels are copied into the
+    new files, so EXIF (GPS, camera, ...) is dropped; the EXIF orientation
+    is applied first so the result is upright.
+    """
+    image, _ = _open(original, max(AVATAR_SIZES) * 2)
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    rgb       = _flatten(image)
+    rgba      = image.convert('RGBA') if has_alpha else rgb
+
+    variants = {}
+    for size in sorted(AVATAR_SIZES, reverse=True):
+        rendered = {}
+        for extension, (pil_format, options) in AVATAR_FORMATS.items():
+            source = rgba if extension == 'webp' else rgb
+            square = ImageOps.fit(source, (size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            square.save(buffer, pil_format, **options)
+            rendered[extension] = buffer.getvalue()
+        variants[size] = rendered
+    return variants
+
+
+def process_avatar(user_id, original, stale=None):
+    """
+    Sanitize `original`, store its variants and point the user at both.
+
+    `stale` variants (from the previous avatar) are deleted. A no-op if the
+    user has uploaded a different avatar in the meantime.
+    """
+    User  = get_user_model()
+    delete_variants(stale)
+    if not original:
+        return {}
+
+    sanitized = sanitize_original(original)
+    names     = {}
+    for size, rendered in render_variants(sanitized).items():
+        names[str(size)] = {
+            extension: default_storage.save(_variant_name(sanitized, size, extension), ContentFile(data))
+            for extension, data in rendered.items()
+        }
+
+    updated = User.objects.filter(pk=user_id, avatar=original).update(avatar=sanitized, avatar_variants=names)
+    if updated:
+        # update() skips post_save, so retire cached copies explicitly
+        invalidate_user(user_id)
+    else:
+        # Superseded by a newer upload
+        delete_variants(names)
+    return names
+
+
+def delete_variants(variants):
+    for formats in (variants or {}).values():
+        for name in formats.values():
+            default_storage.delete(name)
+
+
+def variant_urls(user, request=None):
+    """`{size: {extension: url}}` for the user's processed avatar."""
+    urls = {}
+    for size, formats in (user.avatar_variants or {}).items():
+        urls[size] = {}
+        for extension, name in formats.items():
+            url = default_storage.url(name)
+            urls[size][extension] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -0,0 +1,145 @@
+"""
+Google ID token verification without a certificate download per login.
+
+`google.oauth2.id_token` fetches Google's signing certificates on every
+call through whatever transport it is given. `CachingRequest` is a
+google-auth transport that keeps one pooled `requests.Session` and serves
+repeat GETs from process memory, then from the shared Django cache, for as
+long as the response's `Cache-Control: max-age` allows. In the common case
+verifying a token is then pure CPU work.
+"""
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from google.auth import exceptions, transport
+from google.auth.transport import requests as google_requests
+from google.oauth2 import id_token
+
+GOOGLE_ISSUERS       = ('accounts.google.com', 'https://accounts.google.com')
+CACHE_NAMESPACE      = 'google_certs'
+FETCH_TIMEOUT        = 5
+MIN_REFETCH_INTERVAL = 60
+
+
+def max_age(headers):
+    """Seconds the response may be reused for, per Cache-Control and Age."""
+    directives = {}
+    for part in headers.get('cache-control', '').split(','):
+        name, _, value = part.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+    try:
+        seconds = int(directives.get('max-age', 0))
+        age     = int(headers.get('age', 0))
+    except ValueError:
+        return 0
+    return max(seconds - age, 0)
+
+
+class CachedResponse(transport.Response):
+
+    def __init__(self, status, headers, data):
+        self._status  = status
+        self._headers = headers
+        self._data    = data
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def headers(self):
+        return self._headers
+
+    @property
+    def data(self):
+        return self._data
+
+
+class CachingRequest(transport.Request):
+    """google-auth transport that caches successful GETs for their max-age."""
+
+    def __init__(self, session=None):
+        self._request = google_requests.Request(session or requests.Session())
+        self._memory  = {}
+        self._lock    = threading.Lock()
+
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=FETCH_TIMEOUT, **kwargs):
+        if method != 'GET' or body is not None:
+            return self._request(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+        entry = self._lookup(url)
+        if entry is None:
+            with self._lock:
+                # Another thread may have fetched it while we waited
+                entry = self._lookup(url)
+                if entry is None:
+                    entry = self._fetch(url, headers, timeout, **kwargs)
+        return entry['response']
+
+    def _lookup(self, url):
+        now   = time.time()
+        entry = self._memory.get(url)
+        if entry is None or entry['expires_at'] <= now:
+            entry = cache.get(self._key(url))
+            if entry is None or entry['expires_at'] <= now:
+                return None
+            self._memory[url] = entry
+        return entry
+
+    def _fetch(self, url, headers, timeout, **kwargs):
+        response = self._request(url, method='GET', headers=headers, timeout=timeout, **kwargs)
+        stored   = CachedResponse(response.status, dict(response.headers), response.data)
+        lifetime = max_age({name.lower(): value for name, value in stored.headers.items()})
+        now      = time.time()
+        entry    = {'response': stored, 'fetched_at': now, 'expires_at': now + lifetime}
+        if response.status == 200 and lifetime:
+            self._memory[url] = entry
+            cache.set(self._key(url), entry, timeout=lifetime)
+        return entry
+
+    def forget(self, url, older_than=0):
+        """
+        Drop the cached response for `url` if it was fetched more than
+        `older_than` seconds ago; return whether it was dropped.
+        """
+        entry = self._lookup(url)
+        if entry is None or time.time() - entry['fetched_at'] < older_than:
+            return False
+        with self._lock:
+            self._memory.pop(url, None)
+            cache.delete(self._key(url))
+        return True
+
+    @staticmethod
+    def _key(url):
+        return f'{CACHE_NAMESPACE}_{url}'
+
+
+certs_transport = CachingRequest()
+
+
+def verify_oauth2_token(token, audience):
+    """
+    `id_token.verify_oauth2_token()` against `settings.GOOGLE_OAUTH2_CERTS_URL`,
+    using the cached certificates.
+
+    If verification fails with certificates fetched more than
+    `MIN_REFETCH_INTERVAL` seconds ago (e.g. Google started signing with a
+    new key) they are fetched again and verification is retried once.
+    """
+    url = settings.GOOGLE_OAUTH2_CERTS_URL
+    try:
+        idinfo = id_token.verify_token(token, certs_transport, audience=audience, certs_url=url)
+    except ValueError:
+        if not certs_transport.forget(url, older_than=MIN_REFETCH_INTERVAL):
+            raise
+        idinfo = id_token.verify_token(token, certs_transport, audience=audience, certs_url=url)
+
+    if idinfo['iss'] not in GOOGLE_ISSUERS:
+        raise exceptions.GoogleAuthError(f"Wrong issuer. 'iss' should be one of {GOOGLE_ISSUERS}.")
+    return idinfo
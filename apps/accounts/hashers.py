@@ -0,0 +1,66 @@
+"""
+Password hashing.
+
+Hashing is the most expensive CPU work the API does, so every PBKDF2 run
+goes through a small, bounded thread pool (`PASSWORD_HASHING_THREADS`).
+The request thread waits for the result; since `hashlib` releases the GIL,
+a burst of logins is held to that many cores and cannot starve the rest of
+the requests, including the per-request threads Django uses for sync views
+under ASGI.
+
+The iteration count comes from `PASSWORD_HASH_ITERATIONS`. Stored hashes
+with a different count are re-hashed on the user's next successful login
+(Django calls `must_update()` for that).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+THREAD_NAME_PREFIX = 'password-hashing'
+
+_executor      = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_THREADS,
+                    thread_name_prefix=THREAD_NAME_PREFIX,
+                )
+    return _executor
+
+
+def run_hashing(func, *args):
+    """Call `func(*args)` in the hashing pool and wait for the result."""
+    if not settings.PASSWORD_HASHING_THREADS or threading.current_thread().name.startswith(THREAD_NAME_PREFIX):
+        return func(*args)
+    return _pool().submit(func, *args).result()
+
+
+@receiver(setting_changed)
+def _reset_pool(setting, **kwargs):
+    global _executor
+    if setting == 'PASSWORD_HASHING_THREADS':
+        with _executor_lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """Django's PBKDF2-SHA256 hasher, run in the hashing pool with configurable iterations."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        return run_hashing(super().encode, password, salt, iterations)
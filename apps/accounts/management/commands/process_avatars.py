@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.accounts.tasks import process_avatar
+
+
+class Command(BaseCommand):
+    help = 'Queue avatar variant processing for users whose avatar has no variants yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Reprocess every avatar, not only the missing ones.'
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.exclude(avatar='').exclude(avatar__isnull=True).order_by('pk')
+        if not options['all']:
+            users = users.filter(avatar_variants={})
+
+        queued = 0
+        for user_id, avatar, variants in users.values_list('pk', 'avatar', 'avatar_variants').iterator(chunk_size=1000):
+            process_avatar.delay(user_id, avatar, variants if options['all'] else None)
+            queued += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Queued {queued} avatar(s).'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.tokens import PRUNE_BATCH_SIZE, prune_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh tokens (and their blacklist entries) in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=PRUNE_BATCH_SIZE,
+            help='Rows deleted per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired token(s).'))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index simplejwt's outstanding tokens by expiry so the blacklist pruning
+    (`prune_token_blacklist`) finds expired rows without a full scan.
+    """
+
+    dependencies = [
+        ('accounts', '0003_user_avatar_variants'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS token_outstanding_expires_idx '
+            'ON token_blacklist_outstandingtoken (expires_at);',
+            'DROP INDEX IF EXISTS token_outstanding_expires_idx;',
+        ),
+    ]
@@ -7,6 +7,9 @@ class User(AbstractUser):
     bio    = models.TextField(blank=True)
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
 
+    # Resized copies of `avatar`, written by a worker (see avatars.py)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
+
     USERNAME_FIELD  = 'email'
     REQUIRED_FIELDS = ['username']
 
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth import get_user_model
+
+from . import avatars
 
 User = get_user_model()
 
@@ -27,23 +29,30 @@ class RegisterSerializer(serializers.ModelSerializer):
 
 
 class LoginSerializer(serializers.Serializer):
+    """Shape of the login payload only; `LoginView` checks the password (once)."""
     email    = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
-    def validate(self, attrs):
-        user = authenticate(username=attrs['email'], password=attrs['password'])
-        if not user:
-            raise serializers.ValidationError('Invalid email or password.')
-        attrs['user'] = user
-        return attrs
-
 
 class UserProfileSerializer(serializers.ModelSerializer):
+    avatar_urls = serializers.SerializerMethodField()
+
     class Meta:
         model  = User
-        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'bio', 'avatar', 'date_joined']
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'bio', 'avatar', 'avatar_urls', 'date_joined']
         read_only_fields = ['id', 'email', 'date_joined']
 
+    def get_avatar_urls(self, user):
+        """`{"64": {"webp": url, "jpeg": url}, ...}`; empty until processing finishes."""
+        return avatars.variant_urls(user, self.context.get('request'))
+
+    def validate_avatar(self, value):
+        if value and value.size > avatars.MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                f"Avatar must be at most {avatars.MAX_UPLOAD_SIZE // (1024 * 1024)} MB."
+            )
+        return value
+
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True)
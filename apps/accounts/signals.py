@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import invalidate_user
+from .tokens import remember_revoked
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid='accounts_invalidate_user_on_save')
+@receiver(post_delete, sender=get_user_model(), dispatch_uid='accounts_invalidate_user_on_delete')
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Profile edits, password changes, deactivation, admin edits, ... retire cached copies."""
+    user_id = instance.pk
+    invalidate_user(user_id)
+    # Again after commit, in case a concurrent request cached the row before it was committed
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+@receiver(post_save, sender=BlacklistedToken, dispatch_uid='accounts_revoke_cached_token')
+def revoke_cached_token(sender, instance, **kwargs):
+    """Tokens blacklisted outside `RefreshToken.blacklist()` (the admin, a shell) are revoked in the cache too."""
+    remember_revoked(instance)
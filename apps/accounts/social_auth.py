@@ -1,12 +1,13 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from google.auth import exceptions as google_exceptions
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-import os
+
+from .google_certs import verify_oauth2_token
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -25,11 +26,7 @@ def google_login(request):
         return Response({'error': 'Token required'}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            google_requests.Request(),
-            os.environ.get('GOOGLE_CLIENT_ID')
-        )
+        idinfo = verify_oauth2_token(token, settings.GOOGLE_CLIENT_ID)
 
         email      = idinfo.get('email')
         name       = idinfo.get('name', '')
@@ -60,5 +57,7 @@ def google_login(request):
             'created': created
         })
 
-    except ValueError as e:
+    except google_exceptions.TransportError:
+        return Response({'error': 'Could not reach Google.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    except (ValueError, google_exceptions.GoogleAuthError) as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
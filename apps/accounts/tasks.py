@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from . import avatars, tokens
+
+
+@shared_task
+def process_avatar(user_id, original, stale=None):
+    """Strip the EXIF from a user's uploaded avatar and render its resized variants."""
+    avatars.process_avatar(user_id, original, stale)
+
+
+@shared_task
+def prune_token_blacklist():
+    """Drop expired refresh tokens from the outstanding/blacklist tables."""
+    return tokens.prune_expired()
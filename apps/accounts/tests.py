@@ -1,7 +1,38 @@
-from django.test import TestCase
-from django.contrib.auth import get_user_model
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model, hashers
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt as google_jwt
+from PIL import Image
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.cache import get_generation
+from apps.core.testing import QueryBudgetMixin
+from . import google_certs
+from .authentication import USER_CACHE_NAMESPACE, get_cached_user, local_users
+from .hashers import THREAD_NAME_PREFIX
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -72,4 +103,440 @@ class AuthTests(TestCase):
         self.client.force_authenticate(user=user)
         response = self.client.get(self.me_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['email'], 'test@example.com')
\ No newline at end of file
+        self.assertEqual(response.data['email'], 'test@example.com')
+
+
+class AvatarTests(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def photo(self, size=(800, 400)):
+        """A landscape JPEG with GPS-ish EXIF and an orientation tag that rotates it to portrait."""
+        exif = Image.Exif()
+        exif[0x0112] = 6                 # Orientation: rotate 90° CW
+        exif[0x010F] = 'PhoneMaker'      # Make
+        buffer = io.BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif)
+        return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def upload(self, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/auth/me/', {'avatar': file}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        # Re-read the user the worker updated
+        self.user.refresh_from_db()
+        self.client.force_authenticate(user=self.user)
+        return self.client.get('/api/auth/me/').data
+
+    def test_upload_produces_exif_free_variants(self):
+        data = self.upload(self.photo())
+        self.assertEqual(sorted(data['avatar_urls'], key=int), ['64', '128', '256'])
+
+        for size, formats in data['avatar_urls'].items():
+            self.assertEqual(sorted(formats), ['jpeg', 'webp'])
+            for url in formats.values():
+                path = os.path.join(self.media, url.split('/media/', 1)[1])
+                with Image.open(path) as image:
+                    self.assertEqual(image.size, (int(size), int(size)))
+                    self.assertEqual(len(image.getexif()), 0)
+
+    def test_original_is_reencoded_without_exif(self):
+        self.upload(self.photo((3000, 1500)))
+        with Image.open(os.path.join(self.media, self.user.avatar.name)) as image:
+            self.assertEqual(len(image.getexif()), 0)
+            # Upright (the orientation tag was applied) and capped
+            self.assertEqual(image.size, (512, 1024))
+
+    def test_new_upload_replaces_old_variants(self):
+        first = self.upload(self.photo())
+        old   = [url.split('/media/', 1)[1] for formats in first['avatar_urls'].values() for url in formats.values()]
+        self.upload(self.photo((300, 300)))
+        for name in old:
+            self.assertFalse(os.path.exists(os.path.join(self.media, name)), name)
+        self.assertEqual(len(self.user.avatar_variants), 3)
+
+    def test_stale_job_does_not_overwrite_newer_avatar(self):
+        from .avatars import process_avatar
+        self.upload(self.photo())
+        old_name = self.user.avatar.name
+        self.upload(self.photo((200, 200)))
+        current = self.user.avatar_variants
+
+        # A late job for the previous upload must not win
+        process_avatar(self.user.pk, old_name)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar_variants, current)
+
+    def test_oversized_upload_rejected(self):
+        from . import avatars
+        original, avatars.MAX_UPLOAD_SIZE = avatars.MAX_UPLOAD_SIZE, 100
+        try:
+            response = self.client.patch('/api/auth/me/', {'avatar': self.photo()}, format='multipart')
+        finally:
+            avatars.MAX_UPLOAD_SIZE = original
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PasswordHashingTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        # Record the thread of every actual PBKDF2 run
+        self.calls = []
+        original   = hashers.PBKDF2PasswordHasher.encode
+
+        def encode(hasher, *args, **kwargs):
+            self.calls.append(threading.current_thread().name)
+            return original(hasher, *args, **kwargs)
+
+        hashers.PBKDF2PasswordHasher.encode = encode
+        self.addCleanup(setattr, hashers.PBKDF2PasswordHasher, 'encode', original)
+
+    def login(self, password='Test@1234'):
+        return self.client.post('/api/auth/login/', {
+            'email': 'test@example.com', 'password': password,
+        }, format='json')
+
+    def test_login_hashes_once_in_pool(self):
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(self.calls[0].startswith(THREAD_NAME_PREFIX))
+
+        self.calls.clear()
+        self.assertEqual(self.login('Wrong@1234').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_stored_hash_upgraded_to_configured_iterations(self):
+        with self.settings(PASSWORD_HASH_ITERATIONS=1000):
+            self.user.set_password('Test@1234')
+            self.user.save()
+        self.assertIn('$1000$', self.user.password)
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        algorithm, iterations = self.user.password.split('$')[:2]
+        self.assertEqual(algorithm, 'pbkdf2_sha256')
+        self.assertEqual(int(iterations), settings.PASSWORD_HASH_ITERATIONS)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_HASHING_THREADS=0)
+    def test_hashing_inline_when_pool_disabled(self):
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.calls, [threading.current_thread().name])
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.url = '/api/auth/me/'
+
+    def test_user_is_resolved_from_cache(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['email'], 'test@example.com')
+
+        # The shared tier serves other processes (simulated by an empty LRU)
+        local_users.clear()
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_profile_update_is_visible_immediately(self):
+        self.client.get(self.url)
+        self.client.patch(self.url, {'first_name': 'Ada'}, format='json')
+        self.assertEqual(self.client.get(self.url).data['first_name'], 'Ada')
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.client.get(self.url)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates(self):
+        self.client.get(self.url)
+        response = self.client.post('/api/auth/change-password/', {
+            'old_password': 'Test@1234', 'new_password': 'Better@5678',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_cached_instance_is_not_shared(self):
+        self.client.get(self.url)
+        first = get_cached_user(self.user.pk)
+        first.first_name = 'Mutated'
+        self.assertEqual(get_cached_user(self.user.pk).first_name, '')
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(self.url)
+        key = f'{USER_CACHE_NAMESPACE}_{self.user.pk}_{get_generation(USER_CACHE_NAMESPACE, self.user.pk)}'
+        self.assertNotIn('password', cache.get(key))
+        self.assertNotIn(self.user.password, repr(cache.get(key)))
+
+        # Saving a user rebuilt from the cache must not blank the password
+        user = get_cached_user(self.user.pk)
+        user.first_name = 'Ada'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('Test@1234'))
+        self.assertTrue(get_cached_user(self.user.pk).check_password('Test@1234'))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AccountQueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        local_users.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def issue_tokens(self, count):
+        for _ in range(count):
+            RefreshToken.for_user(self.user).blacklist()
+        local_users.clear()
+
+    def create_users(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='x')
+
+    def test_profile(self):
+        self.assertQueryBudget('/api/auth/me/', 1, seed=self.issue_tokens)
+
+    def test_token_refresh(self):
+        self.assertQueryBudget(
+            '/api/auth/token/refresh/', 13, seed=self.issue_tokens, method='post',
+            data=lambda: {'refresh': str(RefreshToken.for_user(self.user))},
+        )
+
+    def test_login(self):
+        self.assertQueryBudget(
+            '/api/auth/login/', 3, seed=self.create_users, method='post',
+            data={'email': 'test@example.com', 'password': 'Test@1234'},
+        )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TokenBlacklistTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.url = '/api/auth/token/refresh/'
+
+    def refresh(self, token):
+        return self.client.post(self.url, {'refresh': str(token)}, format='json')
+
+    def test_rotated_token_cannot_be_reused(self):
+        token    = RefreshToken.for_user(self.user)
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('refresh', response.data)
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+    def test_blacklist_check_is_served_from_cache(self):
+        token = RefreshToken.for_user(self.user)
+        with self.assertNumQueries(0):
+            RefreshToken(str(token))
+        token.blacklist()
+        with self.assertNumQueries(0):
+            with self.assertRaises(TokenError):
+                RefreshToken(str(token))
+
+    def test_blacklisting_outside_refresh_token_revokes_cached_state(self):
+        token = RefreshToken.for_user(self.user)
+        RefreshToken(str(token))
+        # As the admin's "add blacklisted token" form does
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        with self.assertNumQueries(0):
+            with self.assertRaises(TokenError):
+                RefreshToken(str(token))
+
+    def test_cache_miss_falls_back_to_database(self):
+        token = RefreshToken.for_user(self.user)
+        self.refresh(token)
+        cache.clear()
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_blacklists_token(self):
+        token = RefreshToken.for_user(self.user)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post('/api/auth/logout/', {'refresh': str(token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=token['jti']).exists())
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_prune_deletes_only_expired_tokens(self):
+        live    = RefreshToken.for_user(self.user)
+        expired = RefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired['jti']).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        out = io.StringIO()
+        call_command('prune_token_blacklist', batch_size=1, stdout=out)
+        self.assertIn('Deleted 1', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [live['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+def make_signing_key(kid):
+    """An RSA signer and its self-signed certificate, as Google publishes them."""
+    key  = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+    now  = datetime.now(dt_timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    signer = crypt.RSASigner.from_string(private_pem, key_id=kid)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class CertsHandler(BaseHTTPRequestHandler):
+    """Stub of Google's certificate endpoint; serves `server.certs`."""
+
+    def do_GET(self):
+        self.server.hits += 1
+        body = json.dumps(self.server.certs).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.server.cache_control:
+            self.send_header('Cache-Control', self.server.cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    GOOGLE_CLIENT_ID='test-client',
+)
+class GoogleLoginTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.keys   = {kid: make_signing_key(kid) for kid in ('key-1', 'key-2')}
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), CertsHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.certs_url = f'http://127.0.0.1:{cls.server.server_port}/oauth2/v1/certs'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.hits          = 0
+        self.server.certs         = {'key-1': self.keys['key-1'][1]}
+        self.server.cache_control = 'public, max-age=3600'
+        self.client = APIClient()
+
+        original = google_certs.certs_transport
+        google_certs.certs_transport = google_certs.CachingRequest()
+        self.addCleanup(setattr, google_certs, 'certs_transport', original)
+        certs_url = self.settings(GOOGLE_OAUTH2_CERTS_URL=self.certs_url)
+        certs_url.enable()
+        self.addCleanup(certs_url.disable)
+
+    def id_token(self, kid='key-1', **claims):
+        now     = int(time.time())
+        payload = {
+            'iss': 'https://accounts.google.com', 'aud': 'test-client', 'sub': '1234',
+            'iat': now, 'exp': now + 300,
+            'email': 'ada@example.com', 'given_name': 'Ada', 'family_name': 'Lovelace',
+            **claims,
+        }
+        return google_jwt.encode(self.keys[kid][0], payload).decode()
+
+    def login(self, token):
+        return self.client.post('/api/auth/google/', {'token': token}, format='json')
+
+    def test_certificates_are_fetched_once(self):
+        response = self.login(self.id_token())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['email'], 'ada@example.com')
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.server.hits, 1)
+
+        # Other processes (a fresh transport) are served by the shared cache
+        google_certs.certs_transport = google_certs.CachingRequest()
+        self.assertEqual(self.login(self.id_token()).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.server.hits, 1)
+
+    def test_uncacheable_response_is_fetched_every_time(self):
+        self.server.cache_control = 'no-cache'
+        self.login(self.id_token())
+        self.login(self.id_token())
+        self.assertEqual(self.server.hits, 2)
+
+    def test_new_signing_key_triggers_refetch(self):
+        self.login(self.id_token())
+        self.server.certs['key-2'] = self.keys['key-2'][1]
+
+        # Certificates fetched moments ago are trusted as-is
+        self.assertEqual(self.login(self.id_token(kid='key-2')).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.server.hits, 1)
+
+        google_certs.certs_transport._memory[self.certs_url]['fetched_at'] -= google_certs.MIN_REFETCH_INTERVAL
+        self.assertEqual(self.login(self.id_token(kid='key-2')).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.server.hits, 2)
+
+    def test_invalid_tokens_rejected(self):
+        self.assertEqual(self.login(self.id_token(aud='other-client')).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.login(self.id_token(iss='evil.example.com')).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(email='ada@example.com').exists())
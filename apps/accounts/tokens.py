@@ -0,0 +1,150 @@
+"""
+Refresh tokens whose blacklist check is served from the cache.
+
+With rotation and blacklist-after-rotation on, every refresh and logout
+adds a row to simplejwt's `token_blacklist` tables, and every refresh
+checks them. Here the state of each refresh token is also kept in the
+cache under its jti until the token expires:
+
+- `ISSUED` when the token is minted, so its (single) refresh is a cache hit,
+- `REVOKED` when a `BlacklistedToken` row is saved, whether by `blacklist()`,
+  the admin or any other code (see `signals.py`).
+
+The cache is only a fast path: on a miss (eviction, DummyCache, tokens
+minted before this module existed) the database decides. Expired rows are
+dropped by `prune_expired()` (`manage.py prune_token_blacklist`, or the
+scheduled Celery task), so the tables stay bounded by the token lifetime.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers, tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+from apps.core.metrics import record_cache
+
+from .authentication import get_cached_user
+
+BLACKLIST_NAMESPACE = 'jwt_blacklist'
+ISSUED              = 'issued'
+REVOKED             = 'revoked'
+PRUNE_BATCH_SIZE    = 5000
+
+
+def _key(jti):
+    return f'{BLACKLIST_NAMESPACE}_{jti}'
+
+
+def _remember(jti, exp, state):
+    timeout = max(int(exp - time.time()), 1)
+    if state == REVOKED:
+        cache.set(_key(jti), REVOKED, timeout=timeout)
+    else:
+        # Never overwrite a concurrent REVOKED with ISSUED
+        cache.add(_key(jti), ISSUED, timeout=timeout)
+
+
+def remember_revoked(blacklisted):
+    """Record a `BlacklistedToken` in the cache, so checks stop reading `ISSUED`."""
+    outstanding = blacklisted.token
+    _remember(outstanding.jti, outstanding.expires_at.timestamp(), REVOKED)
+
+
+class RefreshToken(tokens.RefreshToken):
+    """`RefreshToken` that checks and records blacklisting through the cache."""
+
+    def check_blacklist(self):
+        jti   = self.payload[api_settings.JTI_CLAIM]
+        state = cache.get(_key(jti))
+        record_cache('token_blacklist', state is not None)
+        if state is None:
+            state = REVOKED if BlacklistedToken.objects.filter(token__jti=jti).exists() else ISSUED
+            _remember(jti, self.payload['exp'], state)
+        if state == REVOKED:
+            raise TokenError(_('Token is blacklisted'))
+
+    def _outstanding(self):
+        jti  = self.payload[api_settings.JTI_CLAIM]
+        user = get_cached_user(self.payload.get(api_settings.USER_ID_CLAIM))
+        return OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                'user_id':    user.pk if user is not None else None,
+                'created_at': self.current_time,
+                'token':      str(self),
+                'expires_at': datetime_from_epoch(self.payload['exp']),
+            },
+        )
+
+    def blacklist(self):
+        with transaction.atomic():
+            token, _ = self._outstanding()
+            return BlacklistedToken.objects.get_or_create(token=token)
+
+    def outstand(self):
+        result = self._outstanding()
+        _remember(self.payload[api_settings.JTI_CLAIM], self.payload['exp'], ISSUED)
+        return result
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        _remember(token[api_settings.JTI_CLAIM], token['exp'], ISSUED)
+        return token
+
+
+class TokenRefreshSerializer(serializers.TokenRefreshSerializer):
+    """Rotating refresh backed by the cached token and user lookups."""
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user = get_cached_user(refresh.payload.get(api_settings.USER_ID_CLAIM))
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+def prune_expired(batch_size=PRUNE_BATCH_SIZE):
+    """
+    Delete expired outstanding tokens and their blacklist entries.
+
+    Rows go in batches of `batch_size` (one short transaction each), so
+    pruning a large backlog never holds long locks. Returns the number of
+    outstanding tokens deleted.
+    """
+    now     = aware_utcnow()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects
+            .filter(expires_at__lte=now)
+            .order_by()
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
@@ -5,9 +5,12 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from django.contrib.auth import get_user_model, authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
 
 from .serializers import RegisterSerializer, LoginSerializer, UserProfileSerializer, ChangePasswordSerializer
+from .tasks import process_avatar
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -83,6 +86,24 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
+    def initial(self, request, *args, **kwargs):
+        # Spool uploads to a temp file (moved into storage on save) instead of memory
+        request._request.upload_handlers = [TemporaryFileUploadHandler(request._request)]
+        super().initial(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        if 'avatar' not in serializer.validated_data:
+            serializer.save()
+            return
+
+        stale = serializer.instance.avatar_variants
+        user  = serializer.save(avatar_variants={})
+        if user.avatar:
+            # Resizing runs in a worker; clients fall back to `avatar` until it finishes
+            transaction.on_commit(lambda: process_avatar.delay(user.pk, user.avatar.name, stale))
+        elif stale:
+            transaction.on_commit(lambda: process_avatar.delay(user.pk, None, stale))
+
 
 class ChangePasswordView(APIView):
     permission_classes = [IsAuthenticated]
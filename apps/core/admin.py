@@ -0,0 +1,38 @@
+from django.contrib import admin
+from .models import ImportJob, Notification, ReminderCursor, Tombstone, UserStats
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display        = ['user', 'journal_total', 'todos_total', 'interviews_total', 'updated_at']
+    search_fields       = ['user__email']
+    list_select_related = ['user']
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display        = ['id', 'user', 'resource', 'file_format', 'status', 'imported_rows', 'failed_rows', 'created_at']
+    list_filter         = ['status', 'resource', 'file_format']
+    search_fields       = ['user__email']
+    list_select_related = ['user']
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display        = ['id', 'user', 'resource', 'object_id', 'deleted_at']
+    list_filter         = ['resource']
+    search_fields       = ['user__email']
+    list_select_related = ['user']
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display        = ['id', 'user', 'kind', 'title', 'due_at', 'created_at', 'read_at']
+    list_filter         = ['kind']
+    search_fields       = ['user__email', 'title']
+    list_select_related = ['user']
+
+
+@admin.register(ReminderCursor)
+class ReminderCursorAdmin(admin.ModelAdmin):
+    list_display = ['name', 'position']
@@ -0,0 +1,24 @@
+from django.urls import path
+
+from apps.interviews.views import InterviewViewSet
+from apps.journal.views import JournalEntryViewSet
+from apps.todos.views import TodoViewSet
+from .asyncviews import AsyncListView, AsyncQuerysetView, AsyncStatsView
+
+urlpatterns = [
+    path('journal/entries/',
+         AsyncListView.as_view(viewset_class=JournalEntryViewSet),
+         name='async-journal-list'),
+    path('todos/',
+         AsyncListView.as_view(viewset_class=TodoViewSet),
+         name='async-todo-list'),
+    path('todos/overdue/',
+         AsyncQuerysetView.as_view(viewset_class=TodoViewSet, action='overdue', queryset_method='get_overdue_queryset'),
+         name='async-todo-overdue'),
+    path('interviews/upcoming/',
+         AsyncQuerysetView.as_view(viewset_class=InterviewViewSet, action='upcoming', queryset_method='get_upcoming_queryset'),
+         name='async-interview-upcoming'),
+    path('interviews/summary/',
+         AsyncStatsView.as_view(viewset_class=InterviewViewSet, action='summary'),
+         name='async-interview-summary'),
+]
@@ -0,0 +1,128 @@
+"""
+Async read path for the busiest list endpoints (mounted under `/api/async/`).
+
+Under an ASGI server (uvicorn) an async view gives up the event loop
+while it waits on the cache or the database, so one worker keeps many slow
+requests in flight instead of one per thread. These are plain Django async
+views that reuse a DRF viewset's configuration (queryset, filter
+backends, keyset pagination, serializer, list cache, ETags) and swap only
+the blocking calls for their async counterparts (`aiterator()`,
+`aaggregate()`, `cache.aget()`, ...). Responses match the sync endpoints.
+"""
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
+
+from apps.accounts.authentication import CachedJWTAuthentication
+
+from .cache import alist_cache_key
+from .conditional import set_validator_headers
+from .metrics import record_cache
+from .stats import aget_user_stats
+
+
+class AsyncReadView(View):
+    """
+    GET-only async view over `viewset_class`, acting as its `action`.
+
+    Subclasses implement `get_data()`. Authentication is the API's JWT
+    authentication; every endpoint requires a signed-in user.
+    """
+    viewset_class     = None
+    action            = None
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request, *args, **kwargs):
+        authenticator = CachedJWTAuthentication()
+        try:
+            viewset    = await self.initial(request, authenticator)
+            validators = await self.get_validators(viewset)
+            if validators:
+                etag, last_modified = validators
+                response = get_conditional_response(
+                    request,
+                    etag=etag,
+                    last_modified=int(last_modified.timestamp()) if last_modified else None,
+                )
+                if response is not None:
+                    set_validator_headers(response, etag, last_modified)
+                    return response
+            data = await self.get_data(viewset)
+        except APIException as exc:
+            return self.handle_exception(request, exc, authenticator)
+
+        response = JsonResponse(data, safe=False)
+        if validators:
+            set_validator_headers(response, *validators)
+        return response
+
+    async def initial(self, request, authenticator):
+        """Authenticate the request and return the viewset serving it."""
+        result = await authenticator.aauthenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+
+        drf_request = Request(request)
+        drf_request.user, drf_request.auth = result
+        return self.viewset_class(request=drf_request, args=(), kwargs={}, format_kwarg=None, action=self.action)
+
+    async def get_validators(self, viewset):
+        """Async counterpart of `ConditionalGetMixin.get_validators()`."""
+        if self.action not in getattr(viewset, 'conditional_actions', ()):
+            return None
+        if self.action in viewset.stats_actions:
+            user_stats = await aget_user_stats(viewset.request.user)
+            state      = {'last_modified': user_stats.updated_at, 'total': None}
+        else:
+            state = await viewset.get_validator_queryset().order_by().aaggregate(**viewset.get_validator_aggregates())
+        return viewset.build_validators(viewset.request, state)
+
+    async def get_data(self, viewset):
+        raise NotImplementedError
+
+    def handle_exception(self, request, exc, authenticator):
+        detail   = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = JsonResponse(detail, status=exc.status_code, safe=False)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+        return response
+
+
+class AsyncListView(AsyncReadView):
+    """The viewset's `list`: filtered, keyset-paginated and cached per query string."""
+    action = 'list'
+
+    async def get_data(self, viewset):
+        request   = viewset.request
+        cache_key = await alist_cache_key(viewset.list_cache_namespace, request.user.pk, request.query_params)
+        data      = await cache.aget(cache_key)
+        record_cache('list', data is not None)
+        if data is not None:
+            return data
+
+        paginator = viewset.paginator
+        queryset  = paginator.get_page_queryset(viewset.filter_queryset(viewset.get_queryset()), request, viewset)
+        page      = paginator.build_page([row async for row in queryset.aiterator()])
+        data      = paginator.get_paginated_response(viewset.get_serializer(page, many=True).data).data
+        await cache.aset(cache_key, data, timeout=viewset.list_cache_timeout)
+        return data
+
+
+class AsyncQuerysetView(AsyncReadView):
+    """An unpaginated action: every row of `getattr(viewset, queryset_method)()`."""
+    queryset_method = None
+
+    async def get_data(self, viewset):
+        queryset = getattr(viewset, self.queryset_method)()
+        rows     = [row async for row in queryset.aiterator()]
+        return viewset.get_serializer(rows, many=True).data
+
+
+class AsyncStatsView(AsyncReadView):
+    """An action answered from `UserStats` through `viewset.summarize()`."""
+
+    async def get_data(self, viewset):
+        return viewset.summarize(await aget_user_stats(viewset.request.user))
@@ -0,0 +1,97 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .metrics import record_cache
+
+
+LIST_CACHE_TIMEOUT = 300
+
+
+def _generation_key(namespace, user_id):
+    return f"{namespace}_gen_{user_id}"
+
+
+def get_generation(namespace, user_id):
+    """Return the current cache generation for a user's collection."""
+    key        = _generation_key(namespace, user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses an old value
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key, time.time_ns())
+    return generation
+
+
+async def aget_generation(namespace, user_id):
+    """Async `get_generation()`, for the async views."""
+    key        = _generation_key(namespace, user_id)
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        generation = await cache.aget(key, time.time_ns())
+    return generation
+
+
+def bump_generation(namespace, user_id):
+    """Invalidate every cached variant of a user's collection in O(1)."""
+    key = _generation_key(namespace, user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def normalize_query_params(query_params):
+    """Return a canonical query string: sorted keys, blank values dropped."""
+    items = []
+    for key in sorted(query_params.keys()):
+        for value in query_params.getlist(key):
+            if value != '':
+                items.append((key, value))
+    return urlencode(items)
+
+
+def _list_cache_key(namespace, user_id, generation, query_params, variant=''):
+    digest = hashlib.sha1(normalize_query_params(query_params).encode()).hexdigest()
+    return f"{namespace}_{variant}list_{user_id}_{generation}_{digest}"
+
+
+def list_cache_key(namespace, user_id, query_params):
+    return _list_cache_key(namespace, user_id, get_generation(namespace, user_id), query_params)
+
+
+async def alist_cache_key(namespace, user_id, query_params):
+    """Key for the async views' copy of a list (their `next` links differ)."""
+    generation = await aget_generation(namespace, user_id)
+    return _list_cache_key(namespace, user_id, generation, query_params, variant='async_')
+
+
+class CachedListMixin:
+    """
+    Caches `list` responses per user and per normalized query string.
+
+    Keys live under a per-user generation counter, so writes only need to
+    call `invalidate_list_cache()` to retire every filtered/searched variant.
+    """
+    list_cache_namespace = None
+    list_cache_timeout   = LIST_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        cache_key = list_cache_key(self.list_cache_namespace, request.user.id, request.query_params)
+        cached    = cache.get(cache_key)
+        record_cache('list', cached is not None)
+
+        if cached is not None:
+            return Response(cached)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(cache_key, response.data, timeout=self.list_cache_timeout)
+        return response
+
+    def invalidate_list_cache(self):
+        bump_generation(self.list_cache_namespace, self.request.user.id)
@@ -0,0 +1,126 @@
+import hashlib
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import normalize_query_params
+from .models import UserStats
+from .stats import get_user_stats
+
+
+def set_validator_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Per-user data: browsers may store it but must revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+
+
+class NotModified(Exception):
+    """Raised from `initial()` to short-circuit a request with a 304."""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETag / Last-Modified validators for read actions.
+
+    Validators come from a single aggregate (max `updated_at` and row count)
+    over the user's rows, so a matching `If-None-Match` / `If-Modified-Since`
+    returns 304 before the queryset is evaluated or serialized. Actions in
+    `stats_actions` are served from `UserStats`, so they validate against
+    that single row instead.
+
+    Deleting a row other than the newest leaves max `updated_at` where it
+    was, so collections also take `UserStats.updated_at`, which every create
+    and delete moves. `Last-Modified` has whole-second resolution: it is only
+    sent once its second is over, when no later write can share it.
+    """
+    conditional_actions = ('list', 'retrieve')
+    stats_actions       = ()
+
+    def get_validator_queryset(self):
+        queryset = self.get_queryset()
+        lookup   = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is not None:
+            queryset = queryset.filter(**{self.lookup_field: lookup})
+        return queryset
+
+    def get_validator_aggregates(self):
+        """The `get_validator_state()` aggregates, shared with the async views."""
+        last_modified = Max('updated_at')
+        if self.kwargs.get(self.lookup_url_kwarg or self.lookup_field) is None:
+            stats_modified = Subquery(
+                UserStats.objects.filter(user_id=self.request.user.pk).values('updated_at')[:1]
+            )
+            # Coalesced both ways: either side is NULL before the first row / stats row exists
+            last_modified = Greatest(Coalesce(last_modified, stats_modified), Coalesce(stats_modified, last_modified))
+        return {'last_modified': last_modified, 'total': Count('pk')}
+
+    def get_validator_state(self, request):
+        if self.action in self.stats_actions:
+            user_stats = get_user_stats(request.user)
+            return {'last_modified': user_stats.updated_at, 'total': None}
+        return self.get_validator_queryset().order_by().aggregate(**self.get_validator_aggregates())
+
+    def get_validators(self, request):
+        return self.build_validators(request, self.get_validator_state(request))
+
+    def build_validators(self, request, state):
+        """`(etag, last_modified)` from a `get_validator_state()` result."""
+        last_modified = state['last_modified']
+        parts = [
+            request.user.pk,
+            request.path,
+            normalize_query_params(request.query_params),
+            state['total'],
+            last_modified.isoformat() if last_modified else '',
+            # Actions such as `overdue` depend on the current day
+            date.today().isoformat(),
+        ]
+        etag = quote_etag(hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest())
+        if last_modified and int(last_modified.timestamp()) >= int(timezone.now().timestamp()):
+            # A later write this second would get the same header value
+            last_modified = None
+        return etag, last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return
+
+        try:
+            etag, last_modified = self.get_validators(request)
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup values are left for `get_object()` to 404
+            return
+
+        self._validators = (etag, last_modified)
+        response = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_validators', None)
+        if validators and response.status_code in (200, 304):
+            set_validator_headers(response, *validators)
+        return response
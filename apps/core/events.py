@@ -0,0 +1,275 @@
+"""
+Live per-user updates as server-sent events (`GET /api/events/`, ASGI only).
+
+The viewsets' write hooks call `publish()`, which hands an event to the
+broker once the transaction commits: `<resource>.<action>` (`todos.created`,
+`journal.updated`, `interviews.deleted`, ...) with the serialized rows, or
+the deleted ids, as data. `RedisBroker` carries events between processes
+over Redis pub/sub (one channel per user, one listening connection per
+process); `InProcessBroker` keeps them inside the process (tests, a single
+dev worker). Pick one with `EVENTS_BROKER_URL` (`redis://...` or `memory://`).
+
+`EventStreamApp` serves the stream as a plain ASGI app in front of Django,
+so an idle connection costs a queue and a task rather than a thread, and a
+client disconnect ends it at once. Browsers' `EventSource` cannot send
+headers, so the access token may also be passed as `?token=`. Events are
+not replayed: on (re)connect, clients catch up with `/api/sync/`.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.accounts.authentication import CachedJWTAuthentication
+
+from .metrics import EVENT_STREAMS
+
+logger = logging.getLogger(__name__)
+
+STREAM_PATH     = '/api/events/'
+KEEPALIVE       = 15      # seconds between comments that keep proxies from closing idle streams
+RETRY           = 3000    # ms browsers wait before reconnecting
+QUEUE_SIZE      = 100     # undelivered events after which a stalled stream is closed
+CHANNEL_PREFIX  = 'lifeos:events:'
+
+
+def encode(resource, action, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f'event: {resource}.{action}\ndata: {payload}\n\n'
+
+
+def publish(user_id, resource, action, data):
+    """Send an event to the user's streams once the current transaction commits."""
+    message = encode(resource, action, data)
+    # robust: a broker outage must not fail a write that has already committed
+    transaction.on_commit(lambda: get_broker().publish(user_id, message), robust=True)
+
+
+class Subscription:
+    """One open stream's queue; fed from any thread, read on its event loop."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.loop    = asyncio.get_running_loop()
+        self.queue   = asyncio.Queue(QUEUE_SIZE)
+
+    def deliver(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client is not reading: drop its backlog and end the stream
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class Broker:
+    """Fans events out to this process's subscriptions; subclasses move them between processes."""
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock          = threading.Lock()
+
+    def publish(self, user_id, message):
+        raise NotImplementedError
+
+    async def subscribe(self, user_id):
+        subscription = Subscription(user_id)
+        with self.lock:
+            self.subscriptions[user_id].add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        with self.lock:
+            remaining = self.subscriptions[subscription.user_id]
+            remaining.discard(subscription)
+            if not remaining:
+                del self.subscriptions[subscription.user_id]
+
+    def deliver(self, user_id, message):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+
+class InProcessBroker(Broker):
+    """Delivers straight to this process's streams."""
+
+    def publish(self, user_id, message):
+        self.deliver(user_id, message)
+
+
+class RedisBroker(Broker):
+    """
+    Redis pub/sub, one channel per user.
+
+    Each process keeps a single pub/sub connection, subscribed to the
+    channels of the users with a stream open here, and fans messages out
+    locally.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        super().__init__()
+        self.url      = url
+        self.client   = redis.Redis.from_url(url)
+        self.pubsub   = None
+        self.listener = None
+
+    def channel(self, user_id):
+        return f'{CHANNEL_PREFIX}{user_id}'
+
+    def publish(self, user_id, message):
+        self.client.publish(self.channel(user_id), message)
+
+    async def subscribe(self, user_id):
+        first        = user_id not in self.subscriptions
+        subscription = await super().subscribe(user_id)
+        if first:
+            if self.pubsub is None:
+                import redis.asyncio
+
+                self.pubsub = redis.asyncio.Redis.from_url(self.url).pubsub(ignore_subscribe_messages=True)
+            await self.pubsub.subscribe(self.channel(user_id))
+            # Only read once subscribed: the pub/sub connection is opened by the first SUBSCRIBE
+            if self.listener is None:
+                self.listener = asyncio.create_task(self.listen())
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        await super().unsubscribe(subscription)
+        if subscription.user_id not in self.subscriptions:
+            await self.pubsub.unsubscribe(self.channel(subscription.user_id))
+
+    async def listen(self):
+        import redis
+
+        while True:
+            try:
+                message = await self.pubsub.get_message(timeout=1.0)
+            except (redis.ConnectionError, redis.TimeoutError):
+                # redis-py reconnects and resubscribes on the next call
+                logger.warning('Lost the event broker connection; retrying', exc_info=True)
+                await asyncio.sleep(1)
+                continue
+            if message is None or message['type'] != 'message':
+                continue
+            user_id = int(message['channel'].decode().removeprefix(CHANNEL_PREFIX))
+            self.deliver(user_id, message['data'].decode())
+
+
+@lru_cache(maxsize=None)
+def _broker(url):
+    if url.startswith('memory://'):
+        return InProcessBroker()
+    return RedisBroker(url)
+
+
+def get_broker():
+    return _broker(settings.EVENTS_BROKER_URL)
+
+
+async def authenticate(scope):
+    """Return the user of the stream request's access token (header or `?token=`)."""
+    authenticator = CachedJWTAuthentication()
+    headers       = dict(scope['headers'])
+    raw_token     = None
+    if b'authorization' in headers:
+        raw_token = authenticator.get_raw_token(headers[b'authorization'])
+    else:
+        token = parse_qs(scope['query_string'].decode()).get('token')
+        if token:
+            raw_token = token[0].encode()
+    if raw_token is None:
+        raise AuthenticationFailed('Authentication credentials were not provided.')
+    return await authenticator.aget_user(authenticator.get_validated_token(raw_token))
+
+
+class EventStreamApp:
+    """ASGI app answering `STREAM_PATH` with the user's event stream; the rest goes to `app`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != STREAM_PATH:
+            return await self.app(scope, receive, send)
+        if scope['method'] != 'GET':
+            return await self.reply(send, 405, {'detail': f"Method \"{scope['method']}\" not allowed."},
+                                    [(b'allow', b'GET')])
+        try:
+            user = await authenticate(scope)
+        except AuthenticationFailed as exc:
+            return await self.reply(send, 401, {'detail': exc.detail}, [(b'www-authenticate', b'Bearer realm="api"')])
+
+        broker       = get_broker()
+        subscription = await broker.subscribe(user.pk)
+        EVENT_STREAMS.inc()
+        try:
+            await self.stream(subscription, receive, send)
+        finally:
+            EVENT_STREAMS.dec()
+            await broker.unsubscribe(subscription)
+
+    async def stream(self, subscription, receive, send):
+        await send({
+            'type':    'http.response.start',
+            'status':  200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),   # nginx: do not buffer the stream
+            ],
+        })
+        await self.send_text(send, f'retry: {RETRY}\n\n')
+
+        disconnect = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        message    = None
+        try:
+            while True:
+                message = message or asyncio.ensure_future(subscription.queue.get())
+                done, _ = await asyncio.wait({message, disconnect}, timeout=KEEPALIVE,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if disconnect in done:
+                    return
+                if message in done:
+                    text, message = message.result(), None
+                    if text is None:
+                        break
+                    await self.send_text(send, text)
+                else:
+                    await self.send_text(send, ': keep-alive\n\n')
+        finally:
+            for task in (message, disconnect):
+                if task is not None:
+                    task.cancel()
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def send_text(self, send, text):
+        await send({'type': 'http.response.body', 'body': text.encode(), 'more_body': True})
+
+    async def reply(self, send, status, data, headers=()):
+        body = json.dumps(data).encode()
+        await send({
+            'type':    'http.response.start',
+            'status':  status,
+            'headers': [(b'content-type', b'application/json'), *headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
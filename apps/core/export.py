@@ -0,0 +1,138 @@
+"""
+Streaming "download my data" export.
+
+Rows are read with `QuerySet.iterator(chunk_size=...)` as plain value
+tuples and encoded line by line, so memory use depends on the chunk size,
+not on how much data the user has. Output can be gzipped on the fly.
+
+Under ASGI, Django would drain a sync iterator into a list before sending
+it, so `aiterate()` hands the stream over one buffered chunk per thread hop.
+"""
+import csv
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+CHUNK_SIZE  = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+def resources():
+    """`{name: (model, fields)}` for every exported table, in export order."""
+    from apps.interviews.models import Interview
+    from apps.journal.models import JournalEntry
+    from apps.todos.models import Todo
+
+    return {
+        'journal': (JournalEntry, [
+            'id', 'title', 'content', 'mood', 'tags', 'date', 'word_count',
+            'created_at', 'updated_at',
+        ]),
+        'todos': (Todo, [
+            'id', 'title', 'description', 'priority', 'status', 'category', 'due_date',
+            'created_at', 'updated_at',
+        ]),
+        'interviews': (Interview, [
+            'id', 'company_name', 'role', 'package_offered', 'job_url',
+            'hr_name', 'hr_contact',
+            'round_number', 'round_type', 'mode', 'platform', 'location',
+            'scheduled_at', 'follow_up_date', 'status', 'result',
+            'prep_notes', 'feedback', 'created_at', 'updated_at',
+        ]),
+    }
+
+
+PROFILE_FIELDS = ['id', 'username', 'email', 'first_name', 'last_name', 'bio', 'date_joined']
+
+RESOURCE_NAMES = ['profile', 'journal', 'todos', 'interviews']
+
+
+def iter_rows(user, name):
+    """Yield `(fields, row)` pairs for one resource of `user`."""
+    if name == 'profile':
+        yield PROFILE_FIELDS, tuple(getattr(user, field) for field in PROFILE_FIELDS)
+        return
+    model, fields = resources()[name]
+    rows = (
+        model.objects
+        .filter(user=user)
+        .order_by('id')
+        .values_list(*fields)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        yield fields, row
+
+
+def _buffered(pieces):
+    """Join small string pieces into ~BUFFER_SIZE byte chunks."""
+    buffer, size = [], 0
+    for piece in pieces:
+        data = piece.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def ndjson_lines(user, names):
+    """One `{"type": ..., "data": {...}}` JSON object per line."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for name in names:
+        for fields, row in iter_rows(user, name):
+            yield encoder.encode({'type': name, 'data': dict(zip(fields, row))}) + '\n'
+
+
+class _Echo:
+    """File-like object whose `write()` returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(user, name):
+    """A header line, then one CSV line per row of a single resource."""
+    writer = csv.writer(_Echo())
+    header = False
+    for fields, row in iter_rows(user, name):
+        if not header:
+            yield writer.writerow(fields)
+            header = True
+        yield writer.writerow([
+            json.dumps(value) if isinstance(value, (list, dict)) else value
+            for value in row
+        ])
+    if not header and name != 'profile':
+        yield writer.writerow(resources()[name][1])
+
+
+def gzipped(chunks):
+    """Compress a byte stream into a single gzip member, chunk by chunk."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(lines, compress=False):
+    chunks = _buffered(lines)
+    return gzipped(chunks) if compress else chunks
+
+
+async def aiterate(chunks):
+    """Yield the chunks of a sync iterator, reading each in the (thread-sensitive) sync thread."""
+    chunks = iter(chunks)
+    read   = sync_to_async(next)
+    try:
+        while (chunk := await read(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # A disconnected client must still release the rows' cursor
+        await sync_to_async(getattr(chunks, 'close', lambda: None))()
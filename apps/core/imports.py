@@ -0,0 +1,195 @@
+"""
+Background bulk import of journal entries, todos and interviews.
+
+The upload is parsed as a stream (CSV rows, or JSON values decoded one at a
+time from a JSON array / NDJSON file), validated in batches with the
+resource's existing serializer and inserted with one `bulk_create` per
+batch. Progress is written to the `ImportJob` after every batch so the
+status endpoint can report it while the Celery task runs.
+"""
+import codecs
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from . import stats
+from .cache import bump_generation
+from .models import ImportJob
+
+BATCH_SIZE  = 1000
+READ_SIZE   = 64 * 1024
+MAX_ERRORS  = 100
+SEPARATORS  = ' \t\r\n,[]'
+
+
+class ImportFormatError(Exception):
+    """The upload cannot be parsed at all (as opposed to invalid rows)."""
+
+
+def resources():
+    """`{resource: (model, serializer class, list cache namespace)}`."""
+    from apps.interviews.models import Interview
+    from apps.interviews.serializers import InterviewSerializer
+    from apps.journal.models import JournalEntry
+    from apps.journal.serializers import JournalEntrySerializer
+    from apps.todos.models import Todo
+    from apps.todos.serializers import TodoSerializer
+
+    return {
+        'journal':    (JournalEntry, JournalEntrySerializer, 'journal'),
+        'todos':      (Todo,         TodoSerializer,         'todo'),
+        'interviews': (Interview,    InterviewSerializer,    'interview'),
+    }
+
+
+def iter_json(fileobj):
+    """
+    Yield the top-level values of a JSON array or an NDJSON file.
+
+    Values are decoded one at a time from a sliding text buffer, so memory
+    is bounded by the largest single record rather than the file size.
+    """
+    decoder = json.JSONDecoder()
+    text    = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer  = ''
+    pos     = 0
+    eof     = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in SEPARATORS:
+            pos += 1
+        if pos < len(buffer):
+            try:
+                value, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ImportFormatError(f"Invalid JSON: {exc.msg}") from None
+            else:
+                yield value
+                continue
+        elif eof:
+            return
+
+        chunk  = fileobj.read(READ_SIZE)
+        eof    = not chunk
+        try:
+            buffer = buffer[pos:] + text.decode(chunk, final=eof)
+        except UnicodeDecodeError:
+            raise ImportFormatError("File is not valid UTF-8.") from None
+        pos = 0
+
+
+def iter_csv(fileobj):
+    """Yield each CSV row as a dict; blank cells count as missing."""
+    wrapper = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        for row in csv.DictReader(wrapper):
+            yield {
+                key: _csv_value(value) for key, value in row.items()
+                if key is not None and value not in ('', None)
+            }
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFormatError(f"Invalid CSV: {exc}") from None
+    finally:
+        # Leave the upload open for the caller
+        wrapper.detach()
+
+
+def _csv_value(value):
+    # JSON-valued columns (e.g. journal tags) are written as JSON by the export
+    if value[:1] in '[{':
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def iter_records(fileobj, file_format, resource):
+    """Yield the row dicts of `resource` from the upload."""
+    values = iter_csv(fileobj) if file_format == 'csv' else iter_json(fileobj)
+    for value in values:
+        # Records from our own NDJSON export are wrapped as {"type", "data"}
+        if isinstance(value, dict) and set(value) == {'type', 'data'}:
+            if value['type'] != resource:
+                continue
+            value = value['data']
+        yield value
+
+
+def import_batch(job, rows, first_row):
+    """Validate and insert one batch; return `(imported, errors)`."""
+    model, serializer_class, _ = resources()[job.resource]
+    serializer = serializer_class(context={'importing': True})
+    objects, errors = [], []
+    for number, row in enumerate(rows, start=first_row):
+        if not isinstance(row, dict):
+            errors.append({'row': number, 'errors': {'non_field_errors': ['Expected an object.']}})
+            continue
+        try:
+            attrs = serializer.run_validation(row)
+        except ValidationError as exc:
+            errors.append({'row': number, 'errors': exc.detail})
+            continue
+        objects.append(model(user_id=job.user_id, **attrs))
+    if objects:
+        model.objects.bulk_create(objects)
+    return len(objects), errors
+
+
+def run(job):
+    """Import `job`'s file, recording progress and the outcome on the job."""
+    _, _, namespace = resources()[job.resource]
+    job.status     = 'running'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at', 'updated_at'])
+
+    try:
+        with job.file.open('rb') as fileobj:
+            batch = []
+            for row in iter_records(fileobj, job.file_format, job.resource):
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    _flush(job, batch, fileobj)
+                    batch = []
+            _flush(job, batch, fileobj)
+        job.status = 'done'
+    except ImportFormatError as exc:
+        job.status  = 'failed'
+        job.message = str(exc)
+    finally:
+        if job.status == 'running':
+            job.status  = 'failed'
+            job.message = 'Import stopped unexpectedly.'
+        job.finished_at = timezone.now()
+        # The upload is only needed while the job runs
+        job.file.delete(save=False)
+        job.save(update_fields=['status', 'message', 'file', 'finished_at', 'updated_at'])
+        if job.imported_rows:
+            stats.rebuild(job.user_id)
+            bump_generation(namespace, job.user_id)
+    return job
+
+
+def _flush(job, batch, fileobj):
+    if not batch:
+        return
+    with transaction.atomic():
+        imported, errors = import_batch(job, batch, first_row=job.processed_rows + 1)
+        job.processed_rows += len(batch)
+        job.imported_rows  += imported
+        job.failed_rows    += len(errors)
+        job.errors          = (job.errors + errors)[:MAX_ERRORS]
+        job.bytes_read      = min(fileobj.tell(), job.file_size)
+        job.save(update_fields=[
+            'processed_rows', 'imported_rows', 'failed_rows', 'errors', 'bytes_read', 'updated_at',
+        ])
+
+
+def run_by_id(job_id):
+    job = ImportJob.objects.filter(pk=job_id, status='pending').first()
+    if job is not None:
+        run(job)
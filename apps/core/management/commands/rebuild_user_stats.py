@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.core import stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized UserStats counters from the source tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', action='append', dest='users', default=[],
+            help='Email of a user to rebuild (repeatable). Defaults to every user.'
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+        if options['users']:
+            users = users.filter(email__in=options['users'])
+
+        rebuilt = 0
+        for user_id in users.values_list('pk', flat=True).iterator(chunk_size=1000):
+            stats.rebuild(user_id)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {rebuilt} user(s).'))
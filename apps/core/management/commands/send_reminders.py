@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.core import reminders
+
+
+class Command(BaseCommand):
+    help = 'Create the reminders (todos due, interviews and follow-ups) that fell due since the last run.'
+
+    def handle(self, *args, **options):
+        created = reminders.run()
+        self.stdout.write(self.style.SUCCESS(f'Created {created} reminder(s).'))
@@ -0,0 +1,155 @@
+"""
+Per-route request metrics in the Prometheus text format.
+
+`RequestMetricsMiddleware` times every request, counts its SQL queries
+and their time (through `count_query()`, an execute wrapper installed on
+every connection as it opens) and collects the cache hits and misses
+reported by the caching code via `record_cache()`. The request's tally
+lives in a context variable, so queries the async ORM runs on a worker
+thread are counted too; the middleware runs natively under WSGI and ASGI.
+The numbers feed prometheus_client metrics labelled by the resolved URL
+name (e.g. `todo-overdue`) and the response's `Server-Timing` header.
+
+Under gunicorn, point `PROMETHEUS_MULTIPROC_DIR` at an empty directory:
+every worker then writes its samples there and `render()` merges them
+(`gunicorn.conf.py` cleans up after exited workers).
+"""
+import os
+import time
+from collections import Counter as Tally
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+QUERY_BUCKETS   = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS    = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUESTS        = Counter('lifeos_requests_total', 'Requests served.', ['route', 'method', 'status'])
+REQUEST_LATENCY = Histogram('lifeos_request_duration_seconds', 'Time to build the response.',
+                            ['route', 'method'], buckets=LATENCY_BUCKETS)
+DB_QUERIES      = Histogram('lifeos_request_db_queries', 'SQL queries per request.',
+                            ['route'], buckets=QUERY_BUCKETS)
+DB_DURATION     = Histogram('lifeos_request_db_duration_seconds', 'Time spent in SQL per request.',
+                            ['route'], buckets=LATENCY_BUCKETS)
+CACHE_LOOKUPS   = Counter('lifeos_cache_lookups_total', 'Cache lookups by cache and outcome.',
+                          ['route', 'cache', 'result'])
+RESPONSE_SIZE   = Histogram('lifeos_response_size_bytes', 'Response body size (streamed bodies excluded).',
+                            ['route'], buckets=SIZE_BUCKETS)
+EVENT_STREAMS   = Gauge('lifeos_event_streams', 'Open server-sent event streams.', multiprocess_mode='livesum')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """What one request spent; also the execute wrapper counting its queries."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache   = Tally()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def server_timing(self, duration):
+        hits   = sum(n for (_, result), n in self.cache.items() if result == 'hit')
+        misses = sum(n for (_, result), n in self.cache.items() if result == 'miss')
+        return ', '.join([
+            f'app;dur={duration * 1000:.1f}',
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'cache;desc="{hits} hits, {misses} misses"',
+        ])
+
+
+def count_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the current request's metrics, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """`connection_created` receiver (see `CoreConfig.ready()`)."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def record_cache(cache, hit):
+    """Count a lookup in the named cache against the current request, if any."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache[(cache, 'hit' if hit else 'miss')] += 1
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+class RequestMetricsMiddleware:
+    """Record latency, SQL, cache and size metrics per route; add `Server-Timing`."""
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode   = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token   = _current.set(metrics)
+        start   = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.record(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token   = _current.set(metrics)
+        start   = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.record(request, response, metrics, time.perf_counter() - start)
+
+    def record(self, request, response, metrics, duration):
+        route = route_name(request)
+        if route == 'metrics':
+            return response
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        REQUEST_LATENCY.labels(route, request.method).observe(duration)
+        DB_QUERIES.labels(route).observe(metrics.queries)
+        DB_DURATION.labels(route).observe(metrics.db_time)
+        for (cache, result), count in metrics.cache.items():
+            CACHE_LOOKUPS.labels(route, cache, result).inc(count)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route).observe(len(response.content))
+        response['Server-Timing'] = metrics.server_timing(duration)
+        return response
+
+
+def render():
+    """The Prometheus exposition of every worker's metrics."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
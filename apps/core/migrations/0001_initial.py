@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0002_alter_user_avatar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('journal_total', models.IntegerField(default=0)),
+                ('mood_great', models.IntegerField(default=0)),
+                ('mood_good', models.IntegerField(default=0)),
+                ('mood_neutral', models.IntegerField(default=0)),
+                ('mood_bad', models.IntegerField(default=0)),
+                ('mood_terrible', models.IntegerField(default=0)),
+                ('todos_total', models.IntegerField(default=0)),
+                ('todos_pending', models.IntegerField(default=0)),
+                ('todos_in_progress', models.IntegerField(default=0)),
+                ('todos_done', models.IntegerField(default=0)),
+                ('todos_low', models.IntegerField(default=0)),
+                ('todos_medium', models.IntegerField(default=0)),
+                ('todos_high', models.IntegerField(default=0)),
+                ('interviews_total', models.IntegerField(default=0)),
+                ('interviews_scheduled', models.IntegerField(default=0)),
+                ('interviews_completed', models.IntegerField(default=0)),
+                ('interviews_cancelled', models.IntegerField(default=0)),
+                ('interviews_no_show', models.IntegerField(default=0)),
+                ('result_waiting', models.IntegerField(default=0)),
+                ('result_selected', models.IntegerField(default=0)),
+                ('result_rejected', models.IntegerField(default=0)),
+                ('result_on_hold', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Stats',
+                'verbose_name_plural': 'User Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:00
+
+import apps.core.storage
+from django.core.files.storage import FileSystemStorage
+from django.db import migrations, models
+
+
+def move_pending_uploads(apps, schema_editor):
+    """Move uploads of jobs not yet imported from MEDIA_ROOT to private storage."""
+    ImportJob = apps.get_model('core', 'ImportJob')
+    public    = FileSystemStorage()
+    for job in ImportJob.objects.exclude(file=''):
+        name = job.file.name
+        if not public.exists(name):
+            continue
+        with public.open(name) as upload:
+            job.file = job.file.storage.save(name, upload)
+        job.save(update_fields=['file'])
+        public.delete(name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_reminders'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='file',
+            field=models.FileField(blank=True, storage=apps.core.storage.PrivateStorage(), upload_to='imports/'),
+        ),
+        migrations.RunPython(move_pending_uploads, migrations.RunPython.noop),
+    ]
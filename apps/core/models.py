@@ -0,0 +1,210 @@
+from django.db import models
+from django.utils import timezone
+from django.conf import settings
+
+from .storage import private_storage
+
+
+class UserStats(models.Model):
+    """
+    Denormalized per-user counters behind the summary endpoints.
+
+    Kept in step by the viewsets' write hooks (see `apps.core.stats`) and
+    rebuildable from scratch with `manage.py rebuild_user_stats`.
+    """
+
+    user                 = models.OneToOneField(
+                               settings.AUTH_USER_MODEL,
+                               on_delete=models.CASCADE,
+                               primary_key=True,
+                               related_name='stats'
+                           )
+
+    # Journal
+    journal_total        = models.IntegerField(default=0)
+    mood_great           = models.IntegerField(default=0)
+    mood_good            = models.IntegerField(default=0)
+    mood_neutral         = models.IntegerField(default=0)
+    mood_bad             = models.IntegerField(default=0)
+    mood_terrible        = models.IntegerField(default=0)
+
+    # Todos
+    todos_total          = models.IntegerField(default=0)
+    todos_pending        = models.IntegerField(default=0)
+    todos_in_progress    = models.IntegerField(default=0)
+    todos_done           = models.IntegerField(default=0)
+    todos_low            = models.IntegerField(default=0)
+    todos_medium         = models.IntegerField(default=0)
+    todos_high           = models.IntegerField(default=0)
+
+    # Interviews
+    interviews_total     = models.IntegerField(default=0)
+    interviews_scheduled = models.IntegerField(default=0)
+    interviews_completed = models.IntegerField(default=0)
+    interviews_cancelled = models.IntegerField(default=0)
+    interviews_no_show   = models.IntegerField(default=0)
+    result_waiting       = models.IntegerField(default=0)
+    result_selected      = models.IntegerField(default=0)
+    result_rejected      = models.IntegerField(default=0)
+    result_on_hold       = models.IntegerField(default=0)
+
+    updated_at           = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name        = 'User Stats'
+        verbose_name_plural = 'User Stats'
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}"
+
+
+class ImportJob(models.Model):
+    """A user's uploaded dump, imported in the background (see `apps.core.imports`)."""
+
+    RESOURCE_CHOICES = [
+        ('journal',    'Journal'),
+        ('todos',      'Todos'),
+        ('interviews', 'Interviews'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('json',   'JSON'),
+        ('ndjson', 'NDJSON'),
+        ('csv',    'CSV'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done',    'Done'),
+        ('failed',  'Failed'),
+    ]
+
+    user           = models.ForeignKey(
+                         settings.AUTH_USER_MODEL,
+                         on_delete=models.CASCADE,
+                         related_name='import_jobs'
+                     )
+    resource       = models.CharField(max_length=20, choices=RESOURCE_CHOICES)
+    file_format    = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    file           = models.FileField(upload_to='imports/', storage=private_storage, blank=True)
+    file_size      = models.PositiveBigIntegerField(default=0)
+    status         = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+
+    # Progress
+    bytes_read     = models.PositiveBigIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    imported_rows  = models.PositiveIntegerField(default=0)
+    failed_rows    = models.PositiveIntegerField(default=0)
+    errors         = models.JSONField(default=list, blank=True)
+    message        = models.TextField(blank=True)
+
+    # Timestamps
+    created_at     = models.DateTimeField(auto_now_add=True)
+    started_at     = models.DateTimeField(null=True, blank=True)
+    finished_at    = models.DateTimeField(null=True, blank=True)
+    updated_at     = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering            = ['-created_at']
+        verbose_name        = 'Import Job'
+        verbose_name_plural = 'Import Jobs'
+        indexes             = [
+            models.Index(fields=['user', '-created_at'], name='importjob_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Import {self.pk} ({self.resource}, {self.status})"
+
+    @property
+    def progress(self):
+        if self.status == 'done':
+            return 100
+        if not self.file_size:
+            return 0
+        return min(99, int(self.bytes_read * 100 / self.file_size))
+
+
+class Tombstone(models.Model):
+    """A deleted journal entry, todo or interview, reported by the sync API (see `apps.core.sync`)."""
+
+    RESOURCE_CHOICES = ImportJob.RESOURCE_CHOICES
+
+    user       = models.ForeignKey(
+                     settings.AUTH_USER_MODEL,
+                     on_delete=models.CASCADE,
+                     related_name='tombstones'
+                 )
+    resource   = models.CharField(max_length=20, choices=RESOURCE_CHOICES)
+    object_id  = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name        = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+        indexes             = [
+            # Incremental sync: the user's deletions after a (deleted_at, id) cursor
+            models.Index(fields=['user', 'deleted_at', 'id'], name='tombstone_user_deleted_idx'),
+            # Pruning
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.resource} {self.object_id}"
+
+
+class Notification(models.Model):
+    """A reminder of a todo falling due or an interview coming up (see `apps.core.reminders`)."""
+
+    KIND_CHOICES = [
+        ('todo_due',  'Todo due'),
+        ('interview', 'Upcoming interview'),
+        ('follow_up', 'Interview follow-up'),
+    ]
+
+    user       = models.ForeignKey(
+                     settings.AUTH_USER_MODEL,
+                     on_delete=models.CASCADE,
+                     related_name='notifications'
+                 )
+    kind       = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id  = models.BigIntegerField()
+    title      = models.CharField(max_length=255)
+    due_at     = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+    read_at    = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name        = 'Notification'
+        verbose_name_plural = 'Notifications'
+        constraints         = [
+            # One reminder per object and due time, however often the scheduler runs
+            models.UniqueConstraint(fields=['kind', 'object_id', 'due_at'], name='notification_once_uniq'),
+        ]
+        indexes             = [
+            # Per-user list, newest first
+            models.Index(fields=['user', '-id'], name='notification_user_idx'),
+            # Unread lists and "mark all read"
+            models.Index(
+                fields=['user'],
+                condition=models.Q(read_at__isnull=True),
+                name='notification_user_unread_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class ReminderCursor(models.Model):
+    """How far one reminder scan has got (its high-water mark); see `apps.core.reminders`."""
+
+    name     = models.CharField(max_length=20, primary_key=True)
+    position = models.DateTimeField()
+
+    class Meta:
+        verbose_name        = 'Reminder Cursor'
+        verbose_name_plural = 'Reminder Cursors'
+
+    def __str__(self):
+        return f"{self.name} up to {self.position}"
@@ -0,0 +1,186 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on the view's ordering, with `id` as tiebreaker.
+
+    The cursor carries the ordering values of the last row served, so every
+    page is a range scan starting at that row instead of an OFFSET: the cost
+    of a page does not grow with how far the client has scrolled.
+
+    A client-supplied `?ordering=` (validated by the view's OrderingFilter)
+    replaces `ordering`. Nullable keys always sort NULLs last.
+    """
+    page_size              = 50
+    max_page_size          = 200
+    page_size_query_param  = 'page_size'
+    cursor_query_param     = 'cursor'
+    ordering               = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.build_page(list(self.get_page_queryset(queryset, request, view)))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the (lazy) queryset for the requested page, plus one row."""
+        self.request   = request
+        self.page_size = self.get_page_size(request)
+        self.keys      = self.get_keys(request, queryset, view)
+        self.nullable  = {
+            name: queryset.model._meta.get_field(name).null
+            for name, _ in self.keys
+        }
+
+        queryset = queryset.order_by(*self.get_order_by())
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.get_position_filter(position))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[:self.page_size + 1]
+
+    def build_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page     = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next',    self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next':    {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param, 'required': False, 'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param, 'required': False, 'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_keys(self, request, queryset, view):
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        ordering = list(ordering or self.ordering)
+
+        keys = [(term.lstrip('-'), term.startswith('-')) for term in ordering]
+        keys = [('id' if name == 'pk' else name, desc) for name, desc in keys]
+        if 'id' not in [name for name, _ in keys]:
+            keys.append(('id', keys[0][1]))
+        return keys
+
+    def get_order_by(self):
+        order_by = []
+        for name, desc in self.keys:
+            expression = F(name).desc if desc else F(name).asc
+            order_by.append(expression(nulls_last=True) if self.nullable[name] else expression())
+        return order_by
+
+    def get_position_filter(self, position):
+        def equal(name, value):
+            if value is None:
+                return Q(**{f'{name}__isnull': True})
+            return Q(**{name: value})
+
+        def after(name, desc, value):
+            if value is None:
+                # NULLs sort last, so nothing follows a NULL on this key
+                return None
+            condition = Q(**{f"{name}__{'lt' if desc else 'gt'}": value})
+            if self.nullable[name]:
+                condition |= Q(**{f'{name}__isnull': True})
+            return condition
+
+        branches = Q()
+        prefix   = Q()
+        for (name, desc), value in zip(self.keys, position):
+            condition = after(name, desc, value)
+            if condition is not None:
+                branches |= prefix & condition
+            prefix &= equal(name, value)
+
+        # Redundant bound on the leading key lets the index range scan start at the cursor
+        name, desc = self.keys[0]
+        value      = position[0]
+        if value is None:
+            bound = Q(**{f'{name}__isnull': True})
+        else:
+            bound = Q(**{f"{name}__{'lte' if desc else 'gte'}": value})
+            if self.nullable[name]:
+                bound |= Q(**{f'{name}__isnull': True})
+        return bound & branches
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last     = self.page[-1]
+        position = [getattr(last, name) for name, _ in self.keys]
+        url      = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position))
+
+    def get_signature(self):
+        return ','.join(f"{'-' if desc else ''}{name}" for name, desc in self.keys)
+
+    def encode_cursor(self, position):
+        # isoformat() keeps full microsecond precision, which the keyset comparison needs
+        position = [value.isoformat() if isinstance(value, date) else value for value in position]
+        payload  = json.dumps({'o': self.get_signature(), 'p': position})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded    = encoded + '=' * (-len(encoded) % 4)
+            payload   = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            position  = payload['p']
+            signature = payload['o']
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A cursor is only meaningful for the ordering it was issued under
+        if signature != self.get_signature() or not isinstance(position, list) \
+                or len(position) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+        return position
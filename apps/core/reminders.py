@@ -0,0 +1,223 @@
+"""
+Reminders for todos falling due and interviews coming up, as `Notification`
+rows, pushed to open event streams and, with `REMINDER_EMAILS`, emailed
+as one digest per user and run.
+
+`run()` is called every few minutes (Celery beat, or `manage.py
+send_reminders`). Each scan has a `ReminderCursor`, the moment up to which
+its reminders have been created, and a run only reads the rows whose
+reminder falls between that cursor and now, with one range scan over a
+partial index leading with the due column. A run costs what fell due
+since the previous one, however large the tables:
+
+    todo_due    open todos, the day before `due_date`      todo_open_due_idx
+    interview   scheduled interviews, `INTERVIEW_LEAD`     interview_upcoming_idx
+                before `scheduled_at`
+    follow_up   interviews still waiting for a result,     interview_follow_up_idx
+                on `follow_up_date`
+
+A window's notifications and the cursor move commit together, so a failed
+run resumes where it stopped, and moving a cursor back re-scans its window
+without reminding anyone twice. Runs catch up in `MAX_WINDOW` slices but
+never reach back more than `MAX_LAG`: after an outage, reminders that are
+no longer useful are skipped. Rows created (or rescheduled) into a window
+that has already been scanned get no reminder; their owner has just seen
+them.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import events
+from .models import Notification, ReminderCursor
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+TODO_LEAD      = timedelta(days=1)
+INTERVIEW_LEAD = timedelta(hours=24)
+MAX_WINDOW     = timedelta(hours=1)
+MAX_LAG        = timedelta(days=1)
+BATCH_SIZE     = 1000
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Scan:
+    """One kind of reminder: the rows whose reminder falls in a window, and their notifications."""
+    kind = None
+
+    def rows(self, start, end):
+        """A `values_list` queryset of the rows to remind of in `(start, end]`."""
+        raise NotImplementedError
+
+    def notification(self, *row):
+        raise NotImplementedError
+
+
+class TodoDue(Scan):
+    kind = 'todo_due'
+
+    def rows(self, start, end):
+        from apps.todos.models import Todo
+
+        return (
+            Todo.objects
+            .filter(due_date__gt=timezone.localdate(start) + TODO_LEAD,
+                    due_date__lte=timezone.localdate(end) + TODO_LEAD)
+            .exclude(status='done')
+            .order_by()
+            .values_list('pk', 'user_id', 'title', 'due_date')
+        )
+
+    def notification(self, pk, user_id, title, due_date):
+        return Notification(user_id=user_id, kind=self.kind, object_id=pk, title=title,
+                            due_at=start_of_day(due_date))
+
+
+class UpcomingInterview(Scan):
+    kind = 'interview'
+
+    def rows(self, start, end):
+        from apps.interviews.models import Interview
+
+        return (
+            Interview.objects
+            .filter(status='scheduled',
+                    scheduled_at__gt=start + INTERVIEW_LEAD,
+                    scheduled_at__lte=end + INTERVIEW_LEAD)
+            .order_by()
+            .values_list('pk', 'user_id', 'company_name', 'role', 'scheduled_at')
+        )
+
+    def notification(self, pk, user_id, company_name, role, scheduled_at):
+        return Notification(user_id=user_id, kind=self.kind, object_id=pk,
+                            title=f'{company_name} — {role}'[:255], due_at=scheduled_at)
+
+
+class FollowUp(Scan):
+    kind = 'follow_up'
+
+    def rows(self, start, end):
+        from apps.interviews.models import Interview
+
+        return (
+            Interview.objects
+            .filter(follow_up_date__gt=timezone.localdate(start),
+                    follow_up_date__lte=timezone.localdate(end),
+                    result='waiting')
+            .order_by()
+            .values_list('pk', 'user_id', 'company_name', 'role', 'follow_up_date')
+        )
+
+    def notification(self, pk, user_id, company_name, role, follow_up_date):
+        return Notification(user_id=user_id, kind=self.kind, object_id=pk,
+                            title=f'{company_name} — {role}'[:255], due_at=start_of_day(follow_up_date))
+
+
+SCANS = [TodoDue(), UpcomingInterview(), FollowUp()]
+
+
+def by_user(notifications):
+    grouped = {}
+    for notification in notifications:
+        grouped.setdefault(notification.user_id, []).append(notification)
+    return grouped
+
+
+def create(scan, rows):
+    """Insert the notifications for `rows`, skipping reminders already created; return the new ones."""
+    created       = []
+    notifications = (scan.notification(*row) for row in rows.iterator(chunk_size=BATCH_SIZE))
+    for batch in batched(notifications, BATCH_SIZE):
+        existing = set(
+            Notification.objects
+            .filter(kind=scan.kind, object_id__in=[notification.object_id for notification in batch])
+            .values_list('object_id', 'due_at')
+        )
+        fresh = [notification for notification in batch if (notification.object_id, notification.due_at) not in existing]
+        Notification.objects.bulk_create(fresh)
+        created.extend(fresh)
+    return created
+
+
+def advance(scan, now):
+    """Create the reminders of `scan`'s next window; return them and whether it has reached `now`."""
+    with transaction.atomic():
+        # Locked, so overlapping runs take turns rather than scanning a window twice
+        cursor, _ = ReminderCursor.objects.select_for_update().get_or_create(
+            name=scan.kind, defaults={'position': now - MAX_LAG}
+        )
+        start = max(cursor.position, now - MAX_LAG)
+        end   = min(start + MAX_WINDOW, now)
+        if end <= start:
+            return [], True
+
+        notifications   = create(scan, scan.rows(start, end))
+        cursor.position = end
+        cursor.save(update_fields=['position'])
+        for user_id, batch in by_user(notifications).items():
+            events.publish(user_id, 'notifications', 'created', NotificationSerializer(batch, many=True).data)
+    return notifications, end >= now
+
+
+def describe(notification):
+    due = timezone.localtime(notification.due_at)
+    if notification.kind == 'interview':
+        return f'- {notification.get_kind_display()}: {notification.title}, {due:%a %d %b %H:%M}'
+    return f'- {notification.get_kind_display()}: {notification.title}, {due:%a %d %b}'
+
+
+def send_digests(notifications):
+    """Email each user one digest of their new reminders; return how many emails were sent."""
+    grouped = by_user(notifications)
+    sent    = 0
+    for user_ids in batched(grouped, BATCH_SIZE):
+        recipients = (
+            get_user_model().objects
+            .filter(pk__in=user_ids, is_active=True)
+            .exclude(email='')
+            .values_list('pk', 'email')
+        )
+        messages = [
+            EmailMessage(
+                subject=f'LifeOS: {len(grouped[user_id])} reminder(s)',
+                body='\n'.join(describe(notification) for notification in grouped[user_id]),
+                to=[email],
+            )
+            for user_id, email in recipients
+        ]
+        try:
+            sent += get_connection().send_messages(messages) or 0
+        except OSError:
+            # The notifications are saved; a mail outage only loses the emails
+            logger.exception('Could not send %d reminder digest(s)', len(messages))
+    return sent
+
+
+def run(now=None):
+    """Create (and, with `REMINDER_EMAILS`, email) the reminders due since the last run; return how many."""
+    now     = now or timezone.now()
+    created = []
+    for scan in SCANS:
+        caught_up = False
+        while not caught_up:
+            notifications, caught_up = advance(scan, now)
+            created.extend(notifications)
+    if created and settings.REMINDER_EMAILS:
+        send_digests(created)
+    return len(created)
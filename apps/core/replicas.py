@@ -0,0 +1,162 @@
+"""
+Read replicas.
+
+`ReplicaRouter` sends a request's reads to one of the aliases in
+`settings.DATABASE_REPLICAS` when `ReplicaRoutingMiddleware` has marked
+the request as safe to serve from a replica, and everything else
+(writes, background tasks, management commands) to `default`.
+
+A request is safe when it is a GET/HEAD of one of the view's
+`replica_actions` (lists, summaries, ...) and its user has not written
+recently: every successful write pins the user to the primary for
+`REPLICA_STICKY_SECONDS`, tracked in the cache, so they read their own
+writes despite replication lag. The middleware runs natively under WSGI
+and ASGI.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+
+from apps.accounts.authentication import CachedJWTAuthentication
+
+PIN_CACHE_NAMESPACE = 'db_pin'
+
+_replica = ContextVar('db_replica', default=None)
+
+
+def _pin_key(user_id):
+    return f'{PIN_CACHE_NAMESPACE}_{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Serve the user's reads from the primary for `REPLICA_STICKY_SECONDS`."""
+    cache.set(_pin_key(user_id), True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+async def apin_to_primary(user_id):
+    await cache.aset(_pin_key(user_id), True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+async def ais_pinned(user_id):
+    return user_id is not None and await cache.aget(_pin_key(user_id)) is not None
+
+
+def request_user_id(request):
+    """The user id in the request's access token, or None (no or invalid token)."""
+    authenticator = CachedJWTAuthentication()
+    header        = authenticator.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = authenticator.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return authenticator.get_user_id(authenticator.get_validated_token(raw_token))
+    except AuthenticationFailed:
+        # The view's authentication rejects the request anyway
+        return None
+
+
+def view_action(view_func):
+    """Return `(viewset class, action)` served by a resolved GET view."""
+    if hasattr(view_func, 'actions'):
+        # DRF viewset
+        return view_func.cls, view_func.actions.get('get')
+    view_class = getattr(view_func, 'view_class', None)
+    if view_class is not None and hasattr(view_class, 'viewset_class'):
+        # AsyncReadView
+        initkwargs = view_func.view_initkwargs
+        return (initkwargs.get('viewset_class', view_class.viewset_class),
+                initkwargs.get('action', view_class.action))
+    return None, None
+
+
+class ReplicaRoutingMiddleware:
+    """Mark replica-safe requests; pin users to the primary after a write."""
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode   = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django awaits a coroutine process_view instead of adapting it
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _replica.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+
+        user_id = self.writer_id(request, response)
+        if user_id is not None:
+            pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        token = _replica.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(token)
+
+        user_id = self.writer_id(request, response)
+        if user_id is not None:
+            await apin_to_primary(user_id)
+        return response
+
+    def writer_id(self, request, response):
+        """The user to pin to the primary after a successful write, or None."""
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS and response.status_code < 400:
+            return request_user_id(request)
+        return None
+
+    def wants_replica(self, request, view_func):
+        if not settings.DATABASE_REPLICAS or request.method not in ('GET', 'HEAD'):
+            return False
+        viewset, action = view_action(view_func)
+        return action in getattr(viewset, 'replica_actions', ())
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.wants_replica(request, view_func) and not is_pinned(request_user_id(request)):
+            # One replica per request, so all its reads see the same snapshot
+            _replica.set(random.choice(settings.DATABASE_REPLICAS))
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self.wants_replica(request, view_func) and not await ais_pinned(request_user_id(request)):
+            _replica.set(random.choice(settings.DATABASE_REPLICAS))
+        return None
+
+
+class ReplicaRouter:
+    """Reads of replica-safe requests go to their replica; the rest to `default`."""
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
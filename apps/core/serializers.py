@@ -0,0 +1,76 @@
+import os
+
+from rest_framework import serializers
+
+from .models import ImportJob, Notification
+
+
+class OwnerField(serializers.Field):
+    """
+    Read-only `str()` of a row's owner that does not query per row.
+
+    LifeOS querysets are scoped to `request.user`, so when the row's foreign
+    key matches the authenticated user that object is reused; other rows
+    (e.g. admin or background use without a request) fall back to the FK.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, instance):
+        request = self.context.get('request')
+        user    = getattr(request, 'user', None)
+        if user is not None and user.pk is not None and user.pk == getattr(instance, f'{self.source}_id'):
+            return str(user)
+        return str(getattr(instance, self.source))
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """An import upload (write) and its progress (read)."""
+    file        = serializers.FileField(write_only=True)
+    file_format = serializers.ChoiceField(choices=ImportJob.FORMAT_CHOICES, required=False)
+    progress    = serializers.ReadOnlyField()
+
+    FORMAT_EXTENSIONS = {'.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv'}
+
+    class Meta:
+        model  = ImportJob
+        fields = [
+            'id', 'resource', 'file_format', 'file', 'status', 'progress',
+            'processed_rows', 'imported_rows', 'failed_rows', 'errors', 'message',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = [
+            'id', 'status', 'processed_rows', 'imported_rows', 'failed_rows',
+            'errors', 'message', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def validate(self, attrs):
+        if not attrs.get('file_format'):
+            extension = os.path.splitext(attrs['file'].name)[1].lower()
+            if extension not in self.FORMAT_EXTENSIONS:
+                raise serializers.ValidationError({
+                    'file_format': "Could not tell the format from the file name; pass json, ndjson or csv."
+                })
+            attrs['file_format'] = self.FORMAT_EXTENSIONS[extension]
+        attrs['file_size'] = attrs['file'].size
+        return attrs
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """A reminder; `object_id` is the todo's or interview's id."""
+
+    class Meta:
+        model            = Notification
+        fields           = ['id', 'kind', 'object_id', 'title', 'due_at', 'created_at', 'read_at']
+        read_only_fields = fields
+
+
+class NotificationReadSerializer(serializers.Serializer):
+    """`ids` of the notifications to mark read; omitted, all of them."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False,
+                                allow_empty=False, max_length=1000)
@@ -0,0 +1,104 @@
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, F, IntegerField
+from django.utils import timezone
+
+from .models import UserStats
+
+
+def counter_fields():
+    return [field.name for field in UserStats._meta.concrete_fields if isinstance(field, IntegerField)]
+
+
+def buckets(instance):
+    """Return the `UserStats` counters a row contributes to."""
+    label = instance._meta.label
+    if label == 'journal.JournalEntry':
+        return ('journal_total', f'mood_{instance.mood}')
+    if label == 'todos.Todo':
+        return ('todos_total', f'todos_{instance.status}', f'todos_{instance.priority}')
+    if label == 'interviews.Interview':
+        return ('interviews_total', f'interviews_{instance.status}', f'result_{instance.result}')
+    raise ValueError(f"No stats buckets for {label}")
+
+
+def apply_deltas(user_id, deltas):
+    """Atomically add `deltas` ({counter: n}) to the user's stats row."""
+    deltas = {name: n for name, n in deltas.items() if n}
+    if not deltas:
+        return
+    updated = UserStats.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(),
+        **{name: F(name) + n for name, n in deltas.items()}
+    )
+    if not updated:
+        # No row yet: build it from the current (already written) rows
+        rebuild(user_id)
+
+
+def tally(instances):
+    """Sum the counters a batch of rows contributes to."""
+    counts = Counter()
+    for instance in instances:
+        counts.update(buckets(instance))
+    return counts
+
+
+def record_created(instance):
+    apply_deltas(instance.user_id, Counter(buckets(instance)))
+
+
+def record_deleted(instance):
+    apply_deltas(instance.user_id, {name: -1 for name in buckets(instance)})
+
+
+@contextmanager
+def track_update(instance):
+    """Apply the counter changes made to `instance` inside the block."""
+    # Re-read under a row lock so concurrent writers cannot double count
+    current = type(instance).objects.select_for_update().get(pk=instance.pk)
+    before  = Counter(buckets(current))
+    yield
+    after   = Counter(buckets(instance))
+    after.subtract(before)
+    apply_deltas(instance.user_id, after)
+
+
+def rebuild(user_id):
+    """Recount every counter for a user from the source tables."""
+    from apps.interviews.models import Interview
+    from apps.journal.models import JournalEntry
+    from apps.todos.models import Todo
+
+    counts = Counter()
+    for model, fields in (
+        (JournalEntry, ('mood',)),
+        (Todo,         ('status', 'priority')),
+        (Interview,    ('status', 'result')),
+    ):
+        # Count on the primary even during a replica read: the result is written there
+        rows = (
+            model.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id)
+            .order_by().values(*fields).annotate(n=Count('id'))
+        )
+        for row in rows:
+            for name in buckets(model(**{field: row[field] for field in fields})):
+                counts[name] += row['n']
+
+    defaults = {name: counts[name] for name in counter_fields()}
+    with transaction.atomic():
+        stats, _ = UserStats.objects.update_or_create(user_id=user_id, defaults=defaults)
+    return stats
+
+
+def get_user_stats(user):
+    """Return the user's stats row, building it on first access."""
+    return UserStats.objects.filter(user=user).first() or rebuild(user.pk)
+
+
+async def aget_user_stats(user):
+    """Async `get_user_stats()`."""
+    return await UserStats.objects.filter(user=user).afirst() or await sync_to_async(rebuild)(user.pk)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+
+@deconstructible(path='apps.core.storage.PrivateStorage')
+class PrivateStorage(FileSystemStorage):
+    """Files under `PRIVATE_MEDIA_ROOT`, outside `MEDIA_ROOT`, so nothing serves them by URL."""
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PRIVATE_MEDIA_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'PRIVATE_MEDIA_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+    def url(self, name):
+        raise ValueError('Private files are not accessible via a URL.')
+
+
+private_storage = PrivateStorage()
@@ -0,0 +1,154 @@
+"""
+Incremental sync for offline clients (`GET /api/sync/?since=<token>`).
+
+Journal entries, todos and interviews are each read as a stream in
+`(updated_at, id)` order from the user's `(user, updated_at, id)` index,
+starting after the stream's cursor; deletions come the same way from
+`Tombstone` rows, which the delete paths leave behind. The token carries
+every stream's cursor, so a sync is one range scan per stream and its
+payload grows with what changed, not with the user's history.
+
+A row's `updated_at` is set before its transaction commits, so it can
+become visible after a sync has moved past that time. Once a stream has
+caught up, its cursor is therefore held back to `OVERLAP` before the sync
+started: the next sync repeats the changes of that window (clients apply
+them idempotently) instead of missing late commits.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Tombstone
+
+PAGE_SIZE           = 500
+OVERLAP             = timedelta(seconds=30)
+TOMBSTONE_RETENTION = timedelta(days=90)
+
+RESOURCE_NAMES = ['journal', 'todos', 'interviews']
+DELETED        = 'deleted'
+
+
+class SyncTokenExpired(APIException):
+    status_code    = status.HTTP_410_GONE
+    default_detail = 'The sync token has expired; sync again without `since`.'
+    default_code   = 'sync_token_expired'
+
+
+def resources():
+    """`{name: (model, serializer class)}` for every synced table."""
+    from apps.interviews.models import Interview
+    from apps.interviews.serializers import InterviewSerializer
+    from apps.journal.models import JournalEntry
+    from apps.journal.serializers import JournalEntrySerializer
+    from apps.todos.models import Todo
+    from apps.todos.serializers import TodoSerializer
+
+    return {
+        'journal':    (JournalEntry, JournalEntrySerializer),
+        'todos':      (Todo,         TodoSerializer),
+        'interviews': (Interview,    InterviewSerializer),
+    }
+
+
+def record_deleted(model, user_id, ids):
+    """Leave tombstones for rows of `model` deleted in the current transaction."""
+    resource = next(name for name, (synced, _) in resources().items() if synced is model)
+    Tombstone.objects.bulk_create(
+        Tombstone(user_id=user_id, resource=resource, object_id=pk) for pk in ids
+    )
+
+
+def prune_tombstones():
+    """Drop tombstones older than `TOMBSTONE_RETENTION`; return how many."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+    return deleted
+
+
+def encode_token(issued_at, cursors):
+    payload = {
+        't': issued_at.isoformat(),
+        'c': {name: [moment.isoformat(), pk] for name, (moment, pk) in cursors.items()},
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def parse_moment(value):
+    moment = datetime.fromisoformat(value)
+    if timezone.is_naive(moment):
+        raise ValueError('Naive datetime in sync token')
+    return moment
+
+
+def decode_token(token):
+    """Return `(issued_at, {stream: (moment, id)})`; tokens older than the tombstones expire."""
+    try:
+        padded    = token + '=' * (-len(token) % 4)
+        payload   = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        issued_at = parse_moment(payload['t'])
+        cursors   = {
+            name: (parse_moment(moment), int(pk))
+            for name, (moment, pk) in payload['c'].items()
+            if name in RESOURCE_NAMES or name == DELETED
+        }
+    except (TypeError, ValueError, KeyError, AttributeError, binascii.Error):
+        raise ValidationError({'since': ['Invalid sync token.']})
+    if issued_at < timezone.now() - TOMBSTONE_RETENTION:
+        raise SyncTokenExpired()
+    return issued_at, cursors
+
+
+def after(queryset, field, cursor):
+    """Rows of `queryset` past `cursor` in `(field, id)` order."""
+    queryset = queryset.order_by(field, 'id')
+    if cursor is None:
+        return queryset
+    moment, pk = cursor
+    # The redundant lower bound lets the index range scan start at the cursor
+    return queryset.filter(
+        Q(**{f'{field}__gte': moment}),
+        Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': pk}),
+    )
+
+
+def next_cursor(rows, field, previous, settled):
+    """The cursor after `rows`; for a caught-up stream, held back to `settled`."""
+    if len(rows) > PAGE_SIZE:
+        last = rows[PAGE_SIZE - 1]
+        return getattr(last, field), last.pk
+    cursor = (getattr(rows[-1], field), rows[-1].pk) if rows else previous
+    if cursor is not None and cursor > settled:
+        cursor = max(settled, previous) if previous is not None else settled
+    return cursor
+
+
+def changes(request, since=None):
+    """The sync payload for `request.user`: changes since the `since` token."""
+    started = timezone.now()
+    settled = (started - OVERLAP, 0)
+    cursors = decode_token(since)[1] if since else {}
+    user    = request.user
+    data    = {}
+    more    = False
+
+    for name, (model, serializer_class) in resources().items():
+        rows = list(after(model.objects.filter(user=user), 'updated_at', cursors.get(name))[:PAGE_SIZE + 1])
+        more = more or len(rows) > PAGE_SIZE
+        cursors[name] = next_cursor(rows, 'updated_at', cursors.get(name), settled)
+        data[name]    = serializer_class(rows[:PAGE_SIZE], many=True, context={'request': request}).data
+
+    tombstones = list(after(Tombstone.objects.filter(user=user), 'deleted_at', cursors.get(DELETED))[:PAGE_SIZE + 1])
+    more = more or len(tombstones) > PAGE_SIZE
+    cursors[DELETED] = next_cursor(tombstones, 'deleted_at', cursors.get(DELETED), settled)
+    data[DELETED]    = {name: [] for name in RESOURCE_NAMES}
+    for tombstone in tombstones[:PAGE_SIZE]:
+        data[DELETED][tombstone.resource].append(tombstone.object_id)
+
+    data['token']    = encode_token(started, {name: cursor for name, cursor in cursors.items() if cursor})
+    data['has_more'] = more
+    return data
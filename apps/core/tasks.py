@@ -0,0 +1,21 @@
+from celery import shared_task
+
+from . import imports, reminders, sync
+
+
+@shared_task
+def run_import(job_id):
+    """Run a pending `ImportJob` (see `apps.core.imports`)."""
+    imports.run_by_id(job_id)
+
+
+@shared_task
+def prune_tombstones():
+    """Drop sync tombstones older than the longest-lived sync token."""
+    return sync.prune_tombstones()
+
+
+@shared_task
+def send_reminders():
+    """Create the reminders that fell due since the last run (see `apps.core.reminders`)."""
+    return reminders.run()
@@ -0,0 +1,91 @@
+"""
+Query budgets for API tests.
+
+An N+1 regression shows up as a query count that grows with the data, so
+besides capping the queries one request may run, `QueryBudgetMixin`
+requests the same URL against a small and a larger dataset and fails if
+the larger one costs more queries. Failures list the captured SQL.
+
+    class TodoTests(QueryBudgetMixin, TestCase):
+        def test_list(self):
+            self.assertQueryBudget('/api/todos/', 3, seed=self.create_todos)
+
+    with query_budget(2):
+        ...
+
+    @query_budget(2)
+    def test_something(self):
+        ...
+"""
+from contextlib import ContextDecorator
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+def format_queries(captured):
+    return '\n'.join(f"{i}. {query['sql']}" for i, query in enumerate(captured.captured_queries, start=1))
+
+
+class query_budget(ContextDecorator):
+    """Fail if the block (or decorated function) runs more than `max_queries` queries."""
+
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.using       = using
+
+    def __enter__(self):
+        self.captured = CaptureQueriesContext(connections[self.using])
+        return self.captured.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.captured.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self.captured) > self.max_queries:
+            raise AssertionError(
+                f'{len(self.captured)} queries executed, the budget is {self.max_queries}:\n'
+                f'{format_queries(self.captured)}'
+            )
+        return False
+
+
+class QueryBudgetMixin:
+    """
+    `assertQueryBudget()` for `TestCase`s that keep an authenticated
+    `APIClient` in `self.client`.
+    """
+    query_budget_sizes = (2, 12)
+
+    def assertQueryBudget(self, url, max_queries, seed, method='get', data=None, expected_status=200):
+        """
+        Request `url` with `query_budget_sizes` rows, adding them via `seed(count)`.
+
+        Each request must stay within `max_queries`, and the larger dataset
+        must not take more queries than the smaller one. `data` may be a
+        callable, called (untimed) for each request's payload. The cache is
+        cleared before each request so both are computed from the database.
+        """
+        runs, seeded = [], 0
+        for size in self.query_budget_sizes:
+            seed(size - seeded)
+            seeded  = size
+            payload = data() if callable(data) else data
+            cache.clear()
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as captured:
+                request  = getattr(self.client, method)
+                response = request(url, payload) if method == 'get' else request(url, payload, format='json')
+            self.assertEqual(response.status_code, expected_status, getattr(response, 'data', None))
+            runs.append((size, captured))
+
+        for size, captured in runs:
+            if len(captured) > max_queries:
+                self.fail(
+                    f'{method.upper()} {url} with {size} rows ran {len(captured)} queries, '
+                    f'the budget is {max_queries}:\n{format_queries(captured)}'
+                )
+        (small, fewer), (large, more) = runs[0], runs[-1]
+        if len(more) > len(fewer):
+            self.fail(
+                f'{method.upper()} {url} ran {len(fewer)} queries with {small} rows but {len(more)} with {large}:\n'
+                f'-- {small} rows\n{format_queries(fewer)}\n-- {large} rows\n{format_queries(more)}'
+            )
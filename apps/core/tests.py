@@ -0,0 +1,1263 @@
+import asyncio
+import base64
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+
+from asgiref.sync import SyncToAsync, async_to_sync, iscoroutinefunction, sync_to_async
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import F
+from django.http import QueryDict
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.interviews.models import Interview
+from apps.journal.models import JournalEntry
+from apps.todos.models import Todo
+from apps.todos.serializers import TodoSerializer
+from . import events, export, imports, reminders, replicas, stats, sync
+from .cache import normalize_query_params, list_cache_key, bump_generation
+from .metrics import RequestMetricsMiddleware
+from .models import ImportJob, Notification, ReminderCursor, Tombstone, UserStats
+from .testing import QueryBudgetMixin, query_budget
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lifeos-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ListCacheTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/todos/'
+
+    def test_query_params_are_normalized(self):
+        a = QueryDict('status=done&search=&priority=high')
+        b = QueryDict('priority=high&status=done')
+        self.assertEqual(normalize_query_params(a), normalize_query_params(b))
+
+    def test_generation_bump_changes_key(self):
+        params = QueryDict('status=done')
+        before = list_cache_key('todo', self.user.id, params)
+        bump_generation('todo', self.user.id)
+        self.assertNotEqual(before, list_cache_key('todo', self.user.id, params))
+
+    def test_filtered_requests_are_cached_separately(self):
+        Todo.objects.create(user=self.user, title='Open', status='pending')
+        Todo.objects.create(user=self.user, title='Closed', status='done')
+
+        self.assertEqual(len(self.client.get(self.url).data['results']), 2)
+        response = self.client.get(self.url, {'status': 'done'})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Closed')
+
+    def test_write_invalidates_all_variants(self):
+        self.client.get(self.url)
+        self.client.get(self.url, {'status': 'pending'})
+
+        response = self.client.post(self.url, {'title': 'New'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(len(self.client.get(self.url).data['results']), 1)
+        self.assertEqual(len(self.client.get(self.url, {'status': 'pending'}).data['results']), 1)
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(user=self.user, title='First')
+
+    def settle(self):
+        """Date every write a minute back, so `Last-Modified` (whole seconds) is sent."""
+        for model in (Todo, UserStats):
+            model.objects.update(updated_at=F('updated_at') - timedelta(minutes=1))
+
+    def test_list_returns_validators(self):
+        self.settle()
+        response = self.client.get('/api/todos/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_etag_returns_304_with_single_query(self):
+        etag = self.client.get('/api/todos/summary/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/todos/summary/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_if_modified_since_returns_304(self):
+        self.settle()
+        last_modified = self.client.get('/api/todos/')['Last-Modified']
+        response = self.client.get('/api/todos/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_deleting_older_row_changes_last_modified(self):
+        self.client.post('/api/todos/', {'title': 'Newest'}, format='json')
+        self.settle()
+        last_modified = self.client.get('/api/todos/')['Last-Modified']
+        self.client.delete(f'/api/todos/{self.todo.id}/')
+        response = self.client.get('/api/todos/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_last_modified_waits_for_its_second_to_end(self):
+        # Another write this second would share the header, so only the ETag is sent
+        response = self.client.get('/api/todos/')
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/todos/')['ETag']
+        self.client.patch(f'/api/todos/{self.todo.id}/', {'title': 'Renamed'}, format='json')
+        response = self.client.get('/api/todos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_query_string_changes_etag(self):
+        plain    = self.client.get('/api/todos/')['ETag']
+        filtered = self.client.get('/api/todos/', {'status': 'done'})['ETag']
+        self.assertNotEqual(plain, filtered)
+
+    def test_retrieve_unknown_lookup_is_404(self):
+        response = self.client.get('/api/todos/not-a-number/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, url, params=None):
+        ids, pages = [], 0
+        response = self.client.get(url, dict(params or {}, page_size=3))
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            pages += 1
+            if not response.data['next']:
+                return ids, pages
+            response = self.client.get(response.data['next'])
+
+    def test_nullable_key_pages_cover_every_row_once(self):
+        due_dates = [None, '2099-01-02', None, '2099-01-01', '2099-01-02', None, '2099-01-03']
+        for i, due in enumerate(due_dates):
+            Todo.objects.create(user=self.user, title=f'Todo {i}', due_date=due)
+
+        ids, pages = self.walk('/api/todos/')
+        expected   = list(
+            Todo.objects.order_by(F('due_date').asc(nulls_last=True), 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_descending_keys_with_ties(self):
+        for i in range(7):
+            JournalEntry.objects.create(
+                user=self.user, title=f'Entry {i}', content='Words',
+                date='2026-02-24' if i % 2 else '2026-02-23'
+            )
+
+        ids, _ = self.walk('/api/journal/entries/')
+        expected = list(JournalEntry.objects.order_by('-date', '-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_works_with_filters_and_client_ordering(self):
+        for i in range(5):
+            Todo.objects.create(user=self.user, title=f'Todo {i}', priority='high' if i % 2 else 'low')
+
+        ids, _ = self.walk('/api/todos/', {'priority': 'low', 'ordering': '-created_at'})
+        expected = list(
+            Todo.objects.filter(priority='low').order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/todos/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OwnerQueryCountTests(TestCase):
+    """List endpoints must not issue a user query per serialized row."""
+
+    endpoints = [
+        '/api/journal/entries/',
+        '/api/todos/',
+        '/api/todos/overdue/',
+        '/api/interviews/',
+        '/api/interviews/upcoming/',
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def seed(self, count):
+        soon = timezone.now() + timedelta(days=1)
+        for i in range(count):
+            JournalEntry.objects.create(user=self.user, title=f'Entry {i}', content='Words')
+            Todo.objects.create(user=self.user, title=f'Todo {i}')
+            Todo.objects.filter(pk=Todo.objects.latest('id').pk).update(due_date='2020-01-01')
+            Interview.objects.create(user=self.user, company_name='Acme', role='Dev', scheduled_at=soon)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        return len(ctx.captured_queries), len(rows)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.seed(1)
+        small = {url: self.count_queries(url) for url in self.endpoints}
+        self.seed(4)
+        for url in self.endpoints:
+            queries, rows = self.count_queries(url)
+            self.assertEqual(rows, 5, url)
+            self.assertEqual(queries, small[url][0], url)
+
+    def test_owner_is_rendered(self):
+        self.seed(1)
+        response = self.client.get('/api/todos/')
+        self.assertEqual(response.data['results'][0]['user'], 'test@example.com')
+
+
+class UserStatsTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def assertStatsMatchRebuild(self):
+        live = {name: getattr(UserStats.objects.get(user=self.user), name) for name in stats.counter_fields()}
+        UserStats.objects.filter(user=self.user).delete()
+        rebuilt = stats.rebuild(self.user.pk)
+        self.assertEqual(live, {name: getattr(rebuilt, name) for name in stats.counter_fields()})
+
+    def test_todo_writes_keep_counters_exact(self):
+        todo_id = self.client.post('/api/todos/', {'title': 'A', 'priority': 'high'}, format='json').data['id']
+        self.client.post('/api/todos/', {'title': 'B'}, format='json')
+        self.client.patch(f'/api/todos/{todo_id}/toggle_status/')
+        self.client.patch(f'/api/todos/{todo_id}/', {'priority': 'low'}, format='json')
+        self.assertStatsMatchRebuild()
+
+        self.client.delete(f'/api/todos/{todo_id}/')
+        self.assertEqual(self.client.get('/api/todos/summary/').data, [{'status': 'pending', 'count': 1}])
+        self.assertStatsMatchRebuild()
+
+    def test_interview_summary_is_single_row_read(self):
+        scheduled = (timezone.now() + timedelta(days=1)).isoformat()
+        response = self.client.post('/api/interviews/', {
+            'company_name': 'Acme', 'role': 'Dev', 'scheduled_at': scheduled,
+        }, format='json')
+        self.client.patch(f"/api/interviews/{response.data['id']}/add-feedback/", {
+            'status': 'completed', 'result': 'selected',
+        }, format='json')
+        self.assertStatsMatchRebuild()
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/interviews/summary/')
+        self.assertEqual(response.data, {
+            'total': 1, 'scheduled': 0, 'completed': 1,
+            'selected': 1, 'rejected': 0, 'on_hold': 0,
+        })
+
+    def test_mood_summary(self):
+        for mood in ['good', 'bad', 'good']:
+            self.client.post('/api/journal/entries/', {
+                'title': 'Day', 'content': 'Words', 'mood': mood,
+            }, format='json')
+        response = self.client.get('/api/journal/entries/moods/')
+        self.assertEqual(response.data, [{'mood': 'bad', 'count': 1}, {'mood': 'good', 'count': 2}])
+
+    def test_missing_row_is_rebuilt(self):
+        Todo.objects.create(user=self.user, title='Imported', status='done')
+        self.assertEqual(self.client.get('/api/todos/summary/').data, [{'status': 'done', 'count': 1}])
+
+    def test_rebuild_command(self):
+        Todo.objects.create(user=self.user, title='Imported')
+        out = StringIO()
+        call_command('rebuild_user_stats', stdout=out)
+        self.assertIn('Rebuilt stats for 1 user(s).', out.getvalue())
+        self.assertEqual(UserStats.objects.get(user=self.user).todos_pending, 1)
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        JournalEntry.objects.create(user=self.user, title='Día', content='Unicode ✓ words', tags=['a', 'b'])
+        Todo.objects.create(user=self.user, title='Ship, "quoted"')
+        Interview.objects.create(user=self.user, company_name='Acme', role='Dev', scheduled_at=timezone.now())
+        other = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        Todo.objects.create(user=other, title='Not mine')
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_covers_every_resource(self):
+        response = self.client.get('/api/export/ndjson/')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        records = [json.loads(line) for line in self.read(response).decode().splitlines()]
+        self.assertEqual([record['type'] for record in records], ['profile', 'journal', 'todos', 'interviews'])
+        self.assertEqual(records[0]['data']['email'], 'test@example.com')
+        self.assertEqual(records[1]['data']['title'], 'Día')
+        self.assertEqual(records[1]['data']['tags'], ['a', 'b'])
+        self.assertEqual(records[2]['data']['title'], 'Ship, "quoted"')
+
+    def test_ndjson_resource_filter_and_gzip(self):
+        response = self.client.get('/api/export/ndjson/', {'resource': 'todos', 'compress': 'gzip'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(self.read(response)).decode().splitlines()
+        self.assertEqual([json.loads(line)['data']['title'] for line in lines], ['Ship, "quoted"'])
+
+    def test_csv_export(self):
+        body = self.read(self.client.get('/api/export/csv/journal/')).decode()
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['content'], 'Unicode ✓ words')
+        self.assertEqual(json.loads(rows[0]['tags']), ['a', 'b'])
+
+    def test_csv_export_without_rows_has_header(self):
+        JournalEntry.objects.all().delete()
+        body = self.read(self.client.get('/api/export/csv/journal/')).decode()
+        self.assertTrue(body.startswith('id,title,content'))
+
+    def test_unknown_resource_is_400(self):
+        self.assertEqual(self.client.get('/api/export/csv/nope/').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get('/api/export/ndjson/', {'resource': 'nope'}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get('/api/export/ndjson/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        token    = await sync_to_async(AccessToken.for_user)(self.user)
+        response = await self.async_client.get('/api/export/ndjson/', {'compress': 'gzip'},
+                                               headers={'authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Not a sync iterator, which Django would read whole before sending
+        self.assertTrue(response.is_async)
+        body    = b''.join([chunk async for chunk in response.streaming_content])
+        records = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+        self.assertEqual([record['type'] for record in records], ['profile', 'journal', 'todos', 'interviews'])
+
+    def test_export_stream_is_read_chunk_by_chunk(self):
+        pieces = ['x' * export.BUFFER_SIZE] * 3
+        lines  = iter(pieces)
+        chunks = export.aiterate(export.stream(lines))
+
+        async def first():
+            return await chunks.__anext__()
+
+        self.assertEqual(len(async_to_sync(first)()), export.BUFFER_SIZE)
+        async_to_sync(chunks.aclose)()
+        self.assertEqual(len(list(lines)), 2)
+
+
+class ImportTests(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        media = override_settings(PRIVATE_MEDIA_ROOT=self.media)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, name, content, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/import/', {
+                'file': SimpleUploadedFile(name, content.encode()), **data,
+            }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.data)
+        return self.client.get(f"/api/import/{response.data['id']}/").data
+
+    def test_upload_is_kept_outside_media_root(self):
+        with mock.patch('apps.core.views.run_import.delay'):
+            response = self.client.post('/api/import/', {
+                'file': SimpleUploadedFile('todos.json', b'[]'), 'resource': 'todos',
+            }, format='multipart')
+        job = ImportJob.objects.get(pk=response.data['id'])
+        self.assertTrue(os.path.exists(os.path.join(self.media, job.file.name)))
+        self.assertFalse(job.file.path.startswith(str(settings.MEDIA_ROOT)))
+        with self.assertRaises(ValueError):
+            job.file.url
+
+    def test_json_array_import(self):
+        rows = [{'title': f'Todo {i}', 'due_date': '2001-01-01', 'priority': 'high'} for i in range(5)]
+        rows.append({'title': ''})
+        job  = self.upload('todos.json', json.dumps(rows), resource='todos')
+
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['progress'], 100)
+        self.assertEqual((job['processed_rows'], job['imported_rows'], job['failed_rows']), (6, 5, 1))
+        self.assertEqual(job['errors'][0]['row'], 6)
+        self.assertIn('title', job['errors'][0]['errors'])
+        self.assertEqual(Todo.objects.filter(user=self.user, priority='high').count(), 5)
+        # Counters are rebuilt once the import finishes
+        self.assertEqual(UserStats.objects.get(user=self.user).todos_high, 5)
+
+    def test_reimport_of_ndjson_export(self):
+        JournalEntry.objects.create(user=self.user, title='Kept', content='one two', tags=['x'])
+        Todo.objects.create(user=self.user, title='Ignored')
+        exported = b''.join(self.client.get('/api/export/ndjson/').streaming_content).decode()
+        JournalEntry.objects.all().delete()
+
+        job = self.upload('export.ndjson', exported, resource='journal')
+        self.assertEqual(job['imported_rows'], 1)
+        entry = JournalEntry.objects.get(user=self.user)
+        self.assertEqual((entry.title, entry.tags, entry.word_count), ('Kept', ['x'], 2))
+
+    def test_csv_import(self):
+        scheduled = timezone.now().isoformat()
+        content   = (
+            'company_name,role,scheduled_at,hr_name\r\n'
+            f'Acme,Dev,{scheduled},\r\n'
+            f'"Initech, Inc",SRE,{scheduled},Bill\r\n'
+        )
+        job = self.upload('interviews.csv', content, resource='interviews')
+        self.assertEqual(job['imported_rows'], 2)
+        self.assertEqual(
+            sorted(Interview.objects.values_list('company_name', flat=True)), ['Acme', 'Initech, Inc']
+        )
+
+    def test_malformed_file_fails_job(self):
+        job = self.upload('todos.json', '[{"title": "ok"}, {"title": ', resource='todos')
+        self.assertEqual(job['status'], 'failed')
+        self.assertIn('Invalid JSON', job['message'])
+
+    def test_format_must_be_known(self):
+        response = self.client.post('/api/import/', {
+            'file': SimpleUploadedFile('dump.txt', b'[]'), 'resource': 'todos',
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_json_parser_streams_across_reads(self):
+        records = [{'n': i, 'text': 'ü' * 50} for i in range(50)]
+        payload = json.dumps(records).encode()
+        original, imports.READ_SIZE = imports.READ_SIZE, 7
+        try:
+            self.assertEqual(list(imports.iter_json(BytesIO(payload))), records)
+        finally:
+            imports.READ_SIZE = original
+
+    def test_jobs_are_private(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        job   = ImportJob.objects.create(user=other, resource='todos', file_format='json')
+        self.assertEqual(self.client.get(f'/api/import/{job.id}/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AsyncReadViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        today = timezone.localdate()
+        for i in range(5):
+            JournalEntry.objects.create(user=self.user, title=f'Entry {i}', content='Words', mood='happy')
+            Todo.objects.create(
+                user=self.user, title=f'Todo {i}', priority='high' if i % 2 else 'low',
+                due_date=today - timedelta(days=i - 2),
+            )
+            Interview.objects.create(
+                user=self.user, company_name=f'Company {i}', role='Engineer',
+                scheduled_at=timezone.now() + timedelta(days=i * 2 + 1),
+            )
+
+    def assertSameAsSync(self, async_url, sync_url, params=None):
+        expected = self.client.get(sync_url, params).json()
+        response = self.client.get(async_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        if isinstance(data, dict) and 'next' in data:
+            self.assertEqual(data['next'] is None, expected['next'] is None)
+            data.pop('next')
+            expected.pop('next')
+        self.assertEqual(data, expected)
+
+    def test_responses_match_sync_endpoints(self):
+        self.assertSameAsSync('/api/async/journal/entries/', '/api/journal/entries/')
+        self.assertSameAsSync('/api/async/todos/', '/api/todos/', {'priority': 'low', 'ordering': '-created_at'})
+        self.assertSameAsSync('/api/async/todos/overdue/', '/api/todos/overdue/')
+        self.assertSameAsSync('/api/async/interviews/upcoming/', '/api/interviews/upcoming/')
+        self.assertSameAsSync('/api/async/interviews/summary/', '/api/interviews/summary/')
+
+    def test_pages_follow_async_links(self):
+        ids, url, params = [], '/api/async/todos/', {'page_size': 2}
+        while url:
+            data = self.client.get(url, params).json()
+            ids.extend(row['id'] for row in data['results'])
+            url, params = data['next'], None
+            if url:
+                self.assertIn('/api/async/todos/', url)
+        expected = list(
+            Todo.objects.order_by(F('due_date').asc(nulls_last=True), 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_list_is_cached_and_invalidated(self):
+        self.client.get('/api/async/todos/')
+        with self.assertNumQueries(1):
+            # Only the ETag aggregate; the page comes from the cache
+            self.client.get('/api/async/todos/')
+        self.client.post('/api/todos/', {'title': 'New'}, format='json')
+        titles = [row['title'] for row in self.client.get('/api/async/todos/').json()['results']]
+        self.assertIn('New', titles)
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get('/api/async/todos/')['ETag']
+        response = self.client.get('/api/async/todos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_errors(self):
+        self.assertEqual(self.client.get('/api/async/todos/', {'status': 'bogus'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get('/api/async/todos/', {'cursor': 'bogus'}).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.post('/api/async/todos/').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        self.client.credentials()
+        response = self.client.get('/api/async/todos/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_TOKEN='scrape-token')
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/todos/overdue/')
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries", cache;desc="0 hits, 0 misses"$'
+        )
+
+    def test_requests_recorded_per_route(self):
+        before = self.sample('lifeos_requests_total', route='todos-overdue', method='GET', status='200')
+        self.client.get('/api/todos/overdue/')
+        self.assertEqual(
+            self.sample('lifeos_requests_total', route='todos-overdue', method='GET', status='200'), before + 1
+        )
+        self.assertGreater(self.sample('lifeos_request_db_queries_sum', route='todos-overdue'), 0)
+        self.assertGreater(self.sample('lifeos_response_size_bytes_count', route='todos-overdue'), 0)
+
+    def test_cache_hits_and_misses(self):
+        labels = {'route': 'todos-list', 'cache': 'list'}
+        misses = self.sample('lifeos_cache_lookups_total', result='miss', **labels)
+        hits   = self.sample('lifeos_cache_lookups_total', result='hit', **labels)
+        self.client.get('/api/todos/')
+        response = self.client.get('/api/todos/')
+        self.assertEqual(self.sample('lifeos_cache_lookups_total', result='miss', **labels), misses + 1)
+        self.assertEqual(self.sample('lifeos_cache_lookups_total', result='hit', **labels), hits + 1)
+        self.assertIn('cache;desc="1 hits, 0 misses"', response['Server-Timing'])
+
+    def test_runs_natively_in_both_modes(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(RequestMetricsMiddleware(lambda request: None)))
+
+    async def test_async_view_queries_are_counted(self):
+        token    = await sync_to_async(AccessToken.for_user)(self.user)
+        response = await self.async_client.get('/api/async/todos/overdue/',
+                                               headers={'authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_metrics_endpoint_requires_token(self):
+        self.client.get('/api/todos/overdue/')
+        self.assertEqual(self.client.get('/api/metrics/').status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'lifeos_request_duration_seconds_bucket{', response.content)
+        self.assertIn(b'route="todos-overdue"', response.content)
+        self.assertNotIn(b'route="metrics"', response.content)
+
+        with self.settings(METRICS_TOKEN=''):
+            response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer ')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_todos(self, count):
+        Todo.objects.bulk_create(Todo(user=self.user, title=f'Todo {i}') for i in range(count))
+
+    def test_budget_lists_captured_sql(self):
+        with self.assertRaisesMessage(AssertionError, 'the budget is 0:\n1. SELECT COUNT(*)'):
+            with query_budget(0):
+                User.objects.count()
+
+        @query_budget(1)
+        def within():
+            return User.objects.count()
+        self.assertEqual(within(), 1)
+
+    def test_growth_with_rows_fails(self):
+        original = TodoSerializer.to_representation
+
+        def n_plus_one(serializer, todo):
+            User.objects.get(pk=todo.user_id)
+            return original(serializer, todo)
+
+        self.assertQueryBudget('/api/todos/', 2, seed=self.create_todos)
+        Todo.objects.all().delete()
+        with mock.patch.object(TodoSerializer, 'to_representation', n_plus_one):
+            with self.assertRaisesMessage(AssertionError, 'ran 4 queries with 2 rows but 14 with 12'):
+                self.assertQueryBudget('/api/todos/', 100, seed=self.create_todos)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TestCase):
+    """`replica` is its own database, so it plays a replica that has not caught up."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.todo = Todo.objects.create(user=self.user, title='On the primary only')
+
+    def get(self, url):
+        """GET `url`; return the response and the queries run on the replica."""
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(replica)
+
+    def test_replica_actions_read_from_replica(self):
+        for url in ('/api/todos/', '/api/todos/overdue/', '/api/journal/entries/moods/',
+                    '/api/interviews/upcoming/', '/api/interviews/by-company/', '/api/async/todos/'):
+            with self.subTest(url=url):
+                _, replica_queries = self.get(url)
+                self.assertGreater(replica_queries, 0)
+
+        response, _ = self.get('/api/todos/')
+        self.assertEqual(response.data['results'], [])
+
+    def test_other_reads_use_primary(self):
+        response, replica_queries = self.get(f'/api/todos/{self.todo.pk}/')
+        self.assertEqual(response.data['title'], 'On the primary only')
+        self.assertEqual(replica_queries, 0)
+
+    def test_summary_is_rebuilt_from_primary(self):
+        response, replica_queries = self.get('/api/todos/summary/')
+        self.assertGreater(replica_queries, 0)
+        self.assertEqual(response.data, [{'status': 'pending', 'count': 1}])
+        self.assertEqual(UserStats.objects.get(user=self.user).todos_total, 1)
+
+    def test_write_pins_user_to_primary(self):
+        response = self.client.post('/api/todos/', {'title': 'Fresh'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response, replica_queries = self.get('/api/todos/')
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(len(response.data['results']), 2)
+
+        # Other users are not pinned
+        other = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(other)}')
+        self.assertGreater(self.get('/api/todos/')[1], 0)
+
+    def test_pin_expires(self):
+        with override_settings(REPLICA_STICKY_SECONDS=60):
+            self.client.post('/api/todos/', {'title': 'Fresh'}, format='json')
+        pin = cache._expire_info[cache.make_and_validate_key(f'db_pin_{self.user.pk}')]
+        self.assertAlmostEqual(pin - time.time(), 60, delta=5)
+
+        cache.delete(f'db_pin_{self.user.pk}')
+        self.assertGreater(self.get('/api/todos/')[1], 0)
+
+    def test_failed_write_does_not_pin(self):
+        response = self.client.post('/api/todos/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertGreater(self.get('/api/todos/')[1], 0)
+
+    def test_asgi_requests(self):
+        headers = {'authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = async_to_sync(self.async_client.get)('/api/async/todos/', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(replica), 0)
+
+        response = async_to_sync(self.async_client.post)('/api/todos/', {'title': 'Fresh'},
+                                                         content_type='application/json', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(replicas.is_pinned(self.user.pk))
+
+    def test_middleware_chain_is_not_adapted_under_asgi(self):
+        middleware = ASGIHandler()._middleware_chain
+        while middleware is not None:
+            self.assertNotIsInstance(middleware, SyncToAsync)
+            # Unwrap convert_exception_to_response()
+            middleware = getattr(middleware, '__wrapped__', middleware)
+            middleware = getattr(middleware, 'get_response', None)
+
+    def test_no_replicas_configured(self):
+        with override_settings(DATABASE_REPLICAS=[]):
+            response, replica_queries = self.get('/api/todos/')
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class SyncTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.other  = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        self.client.force_authenticate(user=self.user)
+
+        self.entry     = JournalEntry.objects.create(user=self.user, title='Entry', content='Words')
+        self.todos     = [Todo.objects.create(user=self.user, title=f'Todo {i}') for i in range(3)]
+        self.interview = Interview.objects.create(user=self.user, company_name='Acme', role='SRE',
+                                                  scheduled_at=timezone.now())
+        Todo.objects.create(user=self.other, title='Not mine')
+        self.settle()
+
+    def settle(self):
+        """Age every row past the sync overlap window."""
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (JournalEntry, Todo, Interview):
+            model.objects.update(updated_at=an_hour_ago)
+
+    def fetch(self, token=None):
+        response = self.client.get('/api/sync/', {'since': token} if token else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def ids(self, data):
+        return {name: sorted(row['id'] for row in data[name]) for name in sync.RESOURCE_NAMES}
+
+    def test_full_sync(self):
+        with self.assertNumQueries(4):
+            data = self.fetch()
+        self.assertEqual(self.ids(data), {
+            'journal':    [self.entry.pk],
+            'todos':      sorted(todo.pk for todo in self.todos),
+            'interviews': [self.interview.pk],
+        })
+        self.assertEqual(data['deleted'], {'journal': [], 'todos': [], 'interviews': []})
+        self.assertFalse(data['has_more'])
+
+    def test_only_changes_since_token(self):
+        token = self.fetch()['token']
+        self.assertEqual(self.ids(self.fetch(token)), {'journal': [], 'todos': [], 'interviews': []})
+
+        self.client.patch(f'/api/todos/{self.todos[0].pk}/', {'title': 'Renamed'}, format='json')
+        self.client.delete(f'/api/journal/entries/{self.entry.pk}/')
+        self.client.delete(f'/api/interviews/{self.interview.pk}/')
+        self.client.post('/api/todos/bulk-delete/', {'ids': [self.todos[1].pk]}, format='json')
+        Todo.objects.filter(user=self.other).delete()
+
+        data = self.fetch(token)
+        self.assertEqual(self.ids(data), {'journal': [], 'todos': [self.todos[0].pk], 'interviews': []})
+        self.assertEqual(data['todos'][0]['title'], 'Renamed')
+        self.assertEqual(data['deleted'], {
+            'journal':    [self.entry.pk],
+            'todos':      [self.todos[1].pk],
+            'interviews': [self.interview.pk],
+        })
+
+    def test_recent_changes_repeat_until_settled(self):
+        token = self.fetch()['token']
+        self.client.patch(f'/api/todos/{self.todos[0].pk}/', {'title': 'Renamed'}, format='json')
+
+        # A commit racing the sync could still land inside the overlap window
+        data = self.fetch(token)
+        self.assertEqual(self.ids(data)['todos'], [self.todos[0].pk])
+        self.assertEqual(self.ids(self.fetch(data['token']))['todos'], [self.todos[0].pk])
+
+        later = timezone.now() + sync.OVERLAP + timedelta(seconds=1)
+        with mock.patch('apps.core.sync.timezone.now', return_value=later):
+            data = self.fetch(data['token'])
+            self.assertEqual(self.ids(data)['todos'], [self.todos[0].pk])
+            self.assertEqual(self.ids(self.fetch(data['token']))['todos'], [])
+
+    def test_pages(self):
+        with mock.patch.object(sync, 'PAGE_SIZE', 2):
+            first = self.fetch()
+            self.assertTrue(first['has_more'])
+            self.assertEqual(len(first['todos']), 2)
+
+            second = self.fetch(first['token'])
+            self.assertFalse(second['has_more'])
+            self.assertEqual(len(second['todos']), 1)
+        self.assertEqual(
+            sorted(row['id'] for row in first['todos'] + second['todos']),
+            sorted(todo.pk for todo in self.todos),
+        )
+
+    def test_bad_tokens(self):
+        response = self.client.get('/api/sync/', {'since': 'not-a-token'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        for payload in ({'t': '2026-10-18T10:00:00', 'c': {}},
+                        {'t': now.isoformat(), 'c': {'todos': ['2026-10-18T10:00:00', 1]}}):
+            naive    = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            response = self.client.get('/api/sync/', {'since': naive})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        expired  = sync.encode_token(timezone.now() - timedelta(days=91), {})
+        response = self.client.get('/api/sync/', {'since': expired})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_tombstones(self):
+        self.client.delete(f'/api/todos/{self.todos[0].pk}/')
+        self.client.delete(f'/api/todos/{self.todos[1].pk}/')
+        Tombstone.objects.filter(object_id=self.todos[0].pk).update(deleted_at=timezone.now() - timedelta(days=91))
+
+        self.assertEqual(sync.prune_tombstones(), 1)
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [self.todos[1].pk])
+
+
+class RecordingBroker(events.Broker):
+    """Keeps published events instead of delivering them."""
+
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def publish(self, user_id, message):
+        self.published.append((user_id, message))
+
+
+def parse_events(text):
+    """`[(event, data)]` from server-sent events text."""
+    parsed = []
+    for block in text.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+class EventPublishTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(user=self.user, title='Existing')
+
+    def events_of(self, method, url, data=None):
+        """The events published (after commit) by one request."""
+        broker = RecordingBroker()
+        with mock.patch('apps.core.events.get_broker', return_value=broker), \
+                self.captureOnCommitCallbacks(execute=True):
+            getattr(self.client, method)(url, data, format='json')
+        self.assertTrue(all(user_id == self.user.pk for user_id, _ in broker.published))
+        return [event for _, message in broker.published for event in parse_events(message)]
+
+    def test_todo_writes(self):
+        [(event, data)] = self.events_of('post', '/api/todos/', {'title': 'New'})
+        self.assertEqual(event, 'todos.created')
+        self.assertEqual(data[0]['title'], 'New')
+
+        [(event, data)] = self.events_of('patch', f'/api/todos/{self.todo.pk}/', {'title': 'Renamed'})
+        self.assertEqual((event, data[0]['title']), ('todos.updated', 'Renamed'))
+
+        [(event, data)] = self.events_of('patch', f'/api/todos/{self.todo.pk}/toggle_status/')
+        self.assertEqual((event, data[0]['status']), ('todos.updated', 'in_progress'))
+
+        [(event, data)] = self.events_of('post', '/api/todos/bulk-status/', {'ids': [self.todo.pk], 'status': 'done'})
+        self.assertEqual((event, data[0]['status']), ('todos.updated', 'done'))
+        self.assertEqual(self.events_of('post', '/api/todos/bulk-status/', {'ids': [self.todo.pk], 'status': 'done'}), [])
+
+        [(event, data)] = self.events_of('post', '/api/todos/bulk/', [{'title': 'A'}, {'title': 'B'}])
+        self.assertEqual((event, [row['title'] for row in data]), ('todos.created', ['A', 'B']))
+        ids = [row['id'] for row in data]
+
+        [(event, data)] = self.events_of('patch', '/api/todos/bulk/', [{'id': ids[0], 'priority': 'low'}])
+        self.assertEqual((event, data[0]['priority']), ('todos.updated', 'low'))
+
+        self.assertEqual(self.events_of('post', '/api/todos/bulk-delete/', {'ids': ids}), [('todos.deleted', ids)])
+        self.assertEqual(self.events_of('delete', f'/api/todos/{self.todo.pk}/'), [('todos.deleted', [self.todo.pk])])
+
+    def test_journal_and_interview_writes(self):
+        [(event, data)] = self.events_of('post', '/api/journal/entries/', {'title': 'Day', 'content': 'Words'})
+        self.assertEqual(event, 'journal.created')
+        self.assertEqual(self.events_of('delete', f"/api/journal/entries/{data[0]['id']}/"),
+                         [('journal.deleted', [data[0]['id']])])
+
+        [(event, data)] = self.events_of('post', '/api/interviews/', {
+            'company_name': 'Acme', 'role': 'SRE', 'scheduled_at': '2030-01-01T10:00:00Z',
+        })
+        self.assertEqual(event, 'interviews.created')
+        [(event, data)] = self.events_of('patch', f"/api/interviews/{data[0]['id']}/add-feedback/",
+                                         {'feedback': 'Went well', 'result': 'selected'})
+        self.assertEqual((event, data[0]['result']), ('interviews.updated', 'selected'))
+
+    def test_failed_writes_publish_nothing(self):
+        self.assertEqual(self.events_of('post', '/api/todos/', {}), [])
+        self.assertEqual(self.events_of('post', '/api/todos/bulk-delete/', {'ids': [self.todo.pk, 999999]}), [])
+
+
+class EventStreamTests(TestCase):
+
+    def setUp(self):
+        self.user  = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        self.token = str(AccessToken.for_user(self.user))
+
+    async def open_stream(self, query_string=b'', headers=(), method='GET', path=events.STREAM_PATH):
+        """Start the ASGI app on a request; return the task, its input and its output queues."""
+        async def django_app(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 299, 'headers': []})
+
+        scope   = {'type': 'http', 'method': method, 'path': path,
+                   'query_string': query_string, 'headers': list(headers)}
+        inbox   = asyncio.Queue()
+        outbox  = asyncio.Queue()
+        task    = asyncio.ensure_future(events.EventStreamApp(django_app)(scope, inbox.get, outbox.put))
+        return task, inbox, outbox
+
+    async def next_message(self, outbox):
+        return await asyncio.wait_for(outbox.get(), timeout=5)
+
+    async def next_text(self, outbox):
+        return (await self.next_message(outbox))['body'].decode()
+
+    def publish(self, user, resource, action, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            events.publish(user.pk, resource, action, data)
+
+    async def test_authentication(self):
+        for query_string, headers in ((b'', ()), (b'token=garbage', ()), (b'', [(b'authorization', b'Bearer garbage')])):
+            task, _, outbox = await self.open_stream(query_string, headers)
+            self.assertEqual((await self.next_message(outbox))['status'], 401)
+            await task
+
+        task, _, outbox = await self.open_stream(method='POST')
+        self.assertEqual((await self.next_message(outbox))['status'], 405)
+        await task
+
+    async def test_other_paths_go_to_django(self):
+        task, _, outbox = await self.open_stream(path='/api/todos/')
+        self.assertEqual((await self.next_message(outbox))['status'], 299)
+        await task
+
+    async def test_streams_the_users_events(self):
+        task, inbox, outbox = await self.open_stream(f'token={self.token}'.encode())
+        start = await self.next_message(outbox)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream; charset=utf-8'), start['headers'])
+        self.assertEqual(await self.next_text(outbox), f'retry: {events.RETRY}\n\n')
+        self.assertEqual(REGISTRY.get_sample_value('lifeos_event_streams'), 1)
+
+        await sync_to_async(self.publish)(self.other, 'todos', 'created', [{'id': 1}])
+        await sync_to_async(self.publish)(self.user, 'todos', 'deleted', [2])
+        self.assertEqual(parse_events(await self.next_text(outbox)), [('todos.deleted', [2])])
+
+        await inbox.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(task, timeout=5)
+        self.assertEqual(dict(events.get_broker().subscriptions), {})
+        self.assertEqual(REGISTRY.get_sample_value('lifeos_event_streams'), 0)
+
+    async def test_keep_alive(self):
+        with mock.patch.object(events, 'KEEPALIVE', 0.01):
+            task, inbox, outbox = await self.open_stream(headers=[(b'authorization', f'Bearer {self.token}'.encode())])
+            await self.next_message(outbox)
+            await self.next_text(outbox)
+            self.assertEqual(await self.next_text(outbox), ': keep-alive\n\n')
+            await inbox.put({'type': 'http.disconnect'})
+            await asyncio.wait_for(task, timeout=5)
+
+    async def test_stalled_stream_is_closed(self):
+        subscription = events.Subscription(self.user.pk)
+        for n in range(events.QUEUE_SIZE + 1):
+            subscription._put(f'event {n}')
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertIsNone(subscription.queue.get_nowait())
+
+
+def redis_available():
+    import redis
+    try:
+        return redis.Redis.from_url(os.environ.get('REDIS_URL', 'redis://localhost:6379/0')).ping()
+    except redis.RedisError:
+        return False
+
+
+@skipUnless(redis_available(), 'needs a Redis server (REDIS_URL)')
+class RedisBrokerTests(TestCase):
+
+    async def test_publish_reaches_subscribers(self):
+        broker       = events.RedisBroker(os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+        subscription = await broker.subscribe(42)
+        try:
+            await sync_to_async(broker.publish, thread_sensitive=False)(41, 'not for us')
+            await sync_to_async(broker.publish, thread_sensitive=False)(42, 'hello')
+            self.assertEqual(await asyncio.wait_for(subscription.queue.get(), timeout=5), 'hello')
+        finally:
+            await broker.unsubscribe(subscription)
+            broker.listener.cancel()
+        self.assertEqual(dict(broker.subscriptions), {})
+
+
+class ReminderTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.other  = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        self.client.force_authenticate(user=self.user)
+
+        self.now      = timezone.now()
+        self.today    = timezone.localdate(self.now)
+        self.tomorrow = self.today + timedelta(days=1)
+
+    def todo(self, user=None, title='Todo', **fields):
+        return Todo.objects.create(user=user or self.user, title=title, **fields)
+
+    def interview(self, user=None, in_hours=3, **fields):
+        return Interview.objects.create(user=user or self.user, company_name='Acme', role='SRE',
+                                        scheduled_at=self.now + timedelta(hours=in_hours), **fields)
+
+    def reminded(self):
+        return set(Notification.objects.values_list('kind', 'object_id'))
+
+    def test_first_run_reminds_of_what_falls_due(self):
+        due       = self.todo(due_date=self.tomorrow)
+        upcoming  = self.interview(in_hours=3)
+        follow_up = self.interview(in_hours=-48, status='completed', follow_up_date=self.today)
+        self.todo(due_date=self.tomorrow, status='done')
+        self.todo(due_date=self.today + timedelta(days=3))
+        self.todo()
+        self.interview(in_hours=3, status='cancelled')
+        self.interview(in_hours=48)
+        self.interview(in_hours=-48, follow_up_date=self.today, result='rejected')
+
+        self.assertEqual(reminders.run(self.now), 3)
+        self.assertEqual(self.reminded(), {
+            ('todo_due', due.pk), ('interview', upcoming.pk), ('follow_up', follow_up.pk),
+        })
+        notification = Notification.objects.get(kind='interview')
+        self.assertEqual((notification.user, notification.title), (self.user, 'Acme — SRE'))
+
+    def test_runs_only_process_new_windows(self):
+        self.todo(due_date=self.tomorrow)
+        reminders.run(self.now)
+
+        # Caught up: one locked cursor read per scan, no table scans
+        with self.assertNumQueries(3 * 3):
+            self.assertEqual(reminders.run(self.now), 0)
+
+        later     = self.interview(in_hours=24.5)
+        day_after = self.todo(due_date=self.today + timedelta(days=2))
+        self.assertEqual(reminders.run(self.now + timedelta(hours=1)), 1)
+        self.assertIn(('interview', later.pk), self.reminded())
+
+        reminders.run(self.now + timedelta(days=1))
+        self.assertIn(('todo_due', day_after.pk), self.reminded())
+        self.assertEqual(set(ReminderCursor.objects.values_list('position', flat=True)),
+                         {self.now + timedelta(days=1)})
+
+    def test_rescanning_a_window_does_not_repeat_reminders(self):
+        self.todo(due_date=self.tomorrow)
+        self.interview(in_hours=3)
+        self.assertEqual(reminders.run(self.now), 2)
+
+        ReminderCursor.objects.update(position=F('position') - timedelta(hours=12))
+        self.assertEqual(reminders.run(self.now), 0)
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_catch_up_skips_reminders_older_than_max_lag(self):
+        stale = self.interview(in_hours=-24 * 3)
+        fresh = self.interview(in_hours=3)
+        for scan in reminders.SCANS:
+            ReminderCursor.objects.create(name=scan.kind, position=self.now - timedelta(days=10))
+
+        reminders.run(self.now)
+        self.assertEqual(self.reminded(), {('interview', fresh.pk)})
+        self.assertNotIn(('interview', stale.pk), self.reminded())
+
+    def test_scans_use_partial_indexes(self):
+        plans = {scan.kind: scan.rows(self.now - timedelta(days=1), self.now).explain() for scan in reminders.SCANS}
+        self.assertIn('todo_open_due_idx', plans['todo_due'])
+        self.assertIn('interview_upcoming_idx', plans['interview'])
+        self.assertIn('interview_follow_up_idx', plans['follow_up'])
+
+    @override_settings(REMINDER_EMAILS=True)
+    def test_one_digest_per_user(self):
+        self.todo(title='Pay rent', due_date=self.tomorrow)
+        self.interview(in_hours=3)
+        self.todo(user=self.other, due_date=self.tomorrow)
+
+        reminders.run(self.now)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['other@example.com', 'test@example.com'])
+        digest = next(message for message in mail.outbox if message.to == ['test@example.com'])
+        self.assertIn('Pay rent', digest.body)
+        self.assertIn('Acme — SRE', digest.body)
+
+    def test_emails_are_off_by_default(self):
+        self.todo(due_date=self.tomorrow)
+        reminders.run(self.now)
+        self.assertEqual(mail.outbox, [])
+
+    def test_reminders_are_published(self):
+        self.todo(due_date=self.tomorrow)
+        broker = RecordingBroker()
+        with mock.patch('apps.core.events.get_broker', return_value=broker), \
+                self.captureOnCommitCallbacks(execute=True):
+            reminders.run(self.now)
+        [(user_id, message)] = broker.published
+        [(event, data)]      = parse_events(message)
+        self.assertEqual((user_id, event, data[0]['kind']), (self.user.pk, 'notifications.created', 'todo_due'))
+
+    def test_command(self):
+        self.todo(due_date=self.tomorrow)
+        out = StringIO()
+        call_command('send_reminders', stdout=out)
+        self.assertIn('Created 1 reminder(s).', out.getvalue())
+
+    def test_notifications_api(self):
+        first  = self.todo(due_date=self.tomorrow)
+        second = self.interview(in_hours=3)
+        self.todo(user=self.other, due_date=self.tomorrow)
+        reminders.run(self.now)
+
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({row['object_id'] for row in response.data['results']}, {first.pk, second.pk})
+
+        todo_notification = Notification.objects.get(object_id=first.pk, kind='todo_due')
+        response = self.client.post('/api/notifications/read/', {'ids': [todo_notification.pk]}, format='json')
+        self.assertEqual(response.data, {'read': 1})
+        response = self.client.get('/api/notifications/', {'unread': 'true'})
+        self.assertEqual([row['object_id'] for row in response.data['results']], [second.pk])
+
+        response = self.client.post('/api/notifications/read/', {}, format='json')
+        self.assertEqual(response.data, {'read': 1})
+        self.assertFalse(Notification.objects.filter(user=self.other, read_at__isnull=False).exists())
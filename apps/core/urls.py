@@ -0,0 +1,15 @@
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from .views import ExportView, ImportJobViewSet, NotificationViewSet, SyncView, metrics_view
+
+router = SimpleRouter()
+router.register(r'import', ImportJobViewSet, basename='import')
+router.register(r'notifications', NotificationViewSet, basename='notification')
+
+urlpatterns = [
+    path('export/ndjson/',         ExportView.as_view(), {'file_format': 'ndjson'}, name='export-ndjson'),
+    path('export/csv/<resource>/', ExportView.as_view(), {'file_format': 'csv'},    name='export-csv'),
+    path('sync/',                  SyncView.as_view(),                             name='sync'),
+    path('metrics/',               metrics_view,                                   name='metrics'),
+    path('', include(router.urls)),
+]
@@ -0,0 +1,149 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import export, metrics, sync
+from .models import ImportJob, Notification
+from .pagination import KeysetPagination
+from .serializers import ImportJobSerializer, NotificationReadSerializer, NotificationSerializer
+from .tasks import run_import
+
+
+class ExportView(APIView):
+    """
+    Stream the user's data as NDJSON (all resources) or CSV (one resource).
+
+    `?resource=` (repeatable) limits an NDJSON export; `?compress=gzip`
+    gzips the stream.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is a file download, not a rendered response
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, file_format, resource=None):
+        compress = request.query_params.get('compress') == 'gzip'
+
+        if file_format == 'csv':
+            if resource not in export.RESOURCE_NAMES:
+                return Response({'resource': [f"Choose one of: {', '.join(export.RESOURCE_NAMES)}."]},
+                                status=status.HTTP_400_BAD_REQUEST)
+            lines        = export.csv_lines(request.user, resource)
+            content_type = 'text/csv; charset=utf-8'
+            filename     = f'lifeos-{resource}-{date.today()}.csv'
+        else:
+            names   = request.query_params.getlist('resource') or export.RESOURCE_NAMES
+            unknown = [name for name in names if name not in export.RESOURCE_NAMES]
+            if unknown:
+                return Response({'resource': [f"Unknown resource: {', '.join(unknown)}."]},
+                                status=status.HTTP_400_BAD_REQUEST)
+            lines        = export.ndjson_lines(request.user, names)
+            content_type = 'application/x-ndjson; charset=utf-8'
+            filename     = f'lifeos-export-{date.today()}.ndjson'
+
+        if compress:
+            content_type = 'application/gzip'
+            filename    += '.gz'
+
+        content = export.stream(lines, compress=compress)
+        if isinstance(request._request, ASGIRequest):
+            content = export.aiterate(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control']       = 'private, no-store'
+        return response
+
+
+class SyncView(APIView):
+    """
+    Incremental sync: journal entries, todos and interviews changed (and ids
+    deleted) since `?since=<token>`.
+
+    Omit `since` for a full sync. Store the returned `token` and pass it
+    next time; while `has_more` is true, sync again straight away. Changes
+    from the last moments before a sync may be sent twice.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(sync.changes(request, request.query_params.get('since')))
+
+
+class ImportJobViewSet(mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Upload a JSON / NDJSON / CSV dump (`file` + `resource`) to import it in
+    the background, then poll the job for progress.
+    """
+    serializer_class   = ImportJobSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes     = [MultiPartParser, FormParser]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+    def perform_create(self, serializer):
+        job = serializer.save(user=self.request.user)
+        # The worker must see the committed job row
+        transaction.on_commit(lambda: run_import.delay(job.pk))
+
+
+class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    The user's reminders (see `apps.core.reminders`), newest first;
+    `?unread=true` lists only the unread ones.
+    """
+    serializer_class   = NotificationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class   = KeysetPagination
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(user=self.request.user)
+        if self.request.query_params.get('unread') == 'true':
+            queryset = queryset.filter(read_at__isnull=True)
+        return queryset
+
+    @action(detail=False, methods=['post'], serializer_class=NotificationReadSerializer)
+    def read(self, request):
+        """Mark the notifications in `ids` read, or all of them without `ids`."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        unread = Notification.objects.filter(user=request.user, read_at__isnull=True)
+        if 'ids' in serializer.validated_data:
+            unread = unread.filter(pk__in=serializer.validated_data['ids'])
+        return Response({'read': unread.update(read_at=timezone.now())})
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint, protected by `Authorization: Bearer <METRICS_TOKEN>`.
+
+    Hidden (404) unless `METRICS_TOKEN` is configured.
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    if not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {settings.METRICS_TOKEN}'):
+        response = HttpResponse(status=401)
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(metrics.render(), content_type=CONTENT_TYPE_LATEST)
@@ -3,9 +3,10 @@ from .models import Interview
 
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
-    list_display  = [
+    list_display        = [
         'company_name', 'role', 'round_number',
         'round_type', 'scheduled_at', 'status', 'result', 'user'
     ]
-    list_filter   = ['status', 'result', 'round_type', 'mode']
-    search_fields = ['company_name', 'role', 'hr_name', 'user__email']
\ No newline at end of file
+    list_filter         = ['status', 'result', 'round_type', 'mode']
+    search_fields       = ['company_name', 'role', 'hr_name', 'user__email']
+    list_select_related = ['user']
\ No newline at end of file
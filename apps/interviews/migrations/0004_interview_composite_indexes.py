@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_alter_interview_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['user', 'scheduled_at', 'id'], name='interview_user_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['user', 'status', 'scheduled_at'], name='interview_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['user', 'scheduled_at'], name='interview_user_upcoming_idx'),
+        ),
+    ]
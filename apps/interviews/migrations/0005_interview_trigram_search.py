@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.contrib.postgres.operations import BtreeGinExtension, TrigramExtension
+from django.db import migrations, models
+
+from apps.interviews import search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_interview_composite_indexes'),
+    ]
+
+    operations = [
+        # Both are no-ops outside PostgreSQL
+        TrigramExtension(),
+        BtreeGinExtension(),
+        migrations.RunPython(search.install_indexes, search.drop_indexes),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['user', 'company_name'], name='interview_user_company_idx'),
+        ),
+    ]
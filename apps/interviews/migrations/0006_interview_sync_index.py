@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0005_interview_trigram_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='interview_user_updated_idx'),
+        ),
+    ]
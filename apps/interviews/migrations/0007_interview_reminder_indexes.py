@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0006_interview_sync_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['scheduled_at'], name='interview_upcoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(condition=models.Q(('follow_up_date__isnull', False)), fields=['follow_up_date'], name='interview_follow_up_idx'),
+        ),
+    ]
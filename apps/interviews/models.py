@@ -83,6 +83,33 @@ class Interview(models.Model):
         ordering            = ['scheduled_at']
         verbose_name        = 'Interview'
         verbose_name_plural = 'Interviews'
+        indexes             = [
+            # Per-user list by schedule (matches ordering + id tiebreaker)
+            models.Index(fields=['user', 'scheduled_at', 'id'], name='interview_user_sched_idx'),
+            # Status-filtered lists and summaries
+            models.Index(fields=['user', 'status', 'scheduled_at'], name='interview_user_status_idx'),
+            # `upcoming`: only scheduled interviews are looked up by date
+            models.Index(
+                fields=['user', 'scheduled_at'],
+                condition=models.Q(status='scheduled'),
+                name='interview_user_upcoming_idx',
+            ),
+            # Company autocomplete groups a user's rows by company name
+            models.Index(fields=['user', 'company_name'], name='interview_user_company_idx'),
+            # Incremental sync (/api/sync/): rows changed after an (updated_at, id) cursor
+            models.Index(fields=['user', 'updated_at', 'id'], name='interview_user_updated_idx'),
+            # Reminders: interviews coming up, and follow-ups falling due, in a window across all users
+            models.Index(
+                fields=['scheduled_at'],
+                condition=models.Q(status='scheduled'),
+                name='interview_upcoming_idx',
+            ),
+            models.Index(
+                fields=['follow_up_date'],
+                condition=models.Q(follow_up_date__isnull=False),
+                name='interview_follow_up_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} — {self.company_name} ({self.role}) Round {self.round_number}"
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Typo-tolerant search over interviews.
+
+PostgreSQL answers with pg_trgm: GIN trigram indexes on company_name, role
+and hr_name (prefixed with user_id through btree_gin) serve the `%`
+similarity operator, and rows are ranked by the best field similarity.
+SQLite (dev) has no trigram index, so the same measure is computed in
+Python over the user's rows.
+"""
+import re
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Q
+from django.db.models.functions import Greatest
+
+from apps.core.cache import LIST_CACHE_TIMEOUT, get_generation
+from apps.core.metrics import record_cache
+
+SEARCH_FIELDS        = ('company_name', 'role', 'hr_name')
+SIMILARITY_THRESHOLD = 0.3  # pg_trgm's default for `%`
+
+POSTGRES_INDEXES = [
+    (f'interview_{field}_trgm_idx', field) for field in SEARCH_FIELDS
+]
+
+
+def install_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, field in POSTGRES_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON interviews_interview "
+            f"USING gin (user_id, {field} gin_trgm_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in POSTGRES_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _trigrams(value):
+    """Trigrams as pg_trgm extracts them: per lowercased word, padded '  w '."""
+    grams = set()
+    for word in re.findall(r'[^\W_]+', value.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    """Python equivalent of pg_trgm's similarity()."""
+    left, right = _trigrams(a), _trigrams(b)
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def fuzzy_search(queryset, query):
+    """Rows whose company, role or HR name resemble `query`, best first."""
+    if connections[queryset.db].vendor == 'postgresql':
+        matches = Q()
+        for field in SEARCH_FIELDS:
+            matches |= Q(**{f'{field}__trigram_similar': query})
+        return (
+            queryset
+            .filter(matches)
+            .annotate(similarity=Greatest(*(TrigramSimilarity(field, query) for field in SEARCH_FIELDS)))
+            .order_by('-similarity', 'scheduled_at', 'id')
+        )
+
+    # SQLite (dev): score the user's rows in Python
+    results = []
+    for interview in queryset.iterator():
+        interview.similarity = max(similarity(getattr(interview, field), query) for field in SEARCH_FIELDS)
+        if interview.similarity >= SIMILARITY_THRESHOLD:
+            results.append(interview)
+    results.sort(key=lambda interview: (-interview.similarity, interview.scheduled_at, interview.id))
+    return results
+
+
+def company_counts(queryset, user_id):
+    """
+    Deduplicated `[(company_name, interviews)]` for a user, cached.
+
+    The key lives under the user's 'interview' list generation, so any
+    interview write retires it along with the cached list pages.
+    """
+    key       = f"interview_companies_{user_id}_{get_generation('interview', user_id)}"
+    companies = cache.get(key)
+    record_cache('companies', companies is not None)
+    if companies is None:
+        rows      = queryset.order_by().values_list('company_name').annotate(total=Count('id'))
+        companies = [(name, total) for name, total in rows]
+        cache.set(key, companies, timeout=LIST_CACHE_TIMEOUT)
+    return companies
+
+
+def complete_company(companies, prefix, limit=10):
+    """
+    Autocomplete from a `company_counts()` list.
+
+    Prefix matches come first (most interviewed first); if there are fewer
+    than `limit`, typo-tolerant trigram matches fill the rest.
+    """
+    prefix = prefix.strip().lower()
+    if not prefix:
+        return sorted(companies, key=lambda item: (-item[1], item[0].lower()))[:limit]
+
+    prefixed = sorted(
+        (item for item in companies if item[0].lower().startswith(prefix)),
+        key=lambda item: (-item[1], item[0].lower()),
+    )
+    if len(prefixed) >= limit:
+        return prefixed[:limit]
+
+    seen  = {name for name, _ in prefixed}
+    fuzzy = sorted(
+        (
+            (similarity(name, prefix), name, total) for name, total in companies
+            if name not in seen
+        ),
+        key=lambda item: (-item[0], -item[2], item[1].lower()),
+    )
+    fuzzy = [(name, total) for score, name, total in fuzzy if score >= SIMILARITY_THRESHOLD]
+    return (prefixed + fuzzy)[:limit]
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from django.utils import timezone
+
+from apps.core.serializers import OwnerField
 from .models import Interview
 
 
 class InterviewSerializer(serializers.ModelSerializer):
-    user = serializers.StringRelatedField(read_only=True)
+    user = OwnerField()
 
     class Meta:
         model  = Interview
@@ -39,4 +41,12 @@ class InterviewFeedbackSerializer(serializers.ModelSerializer):
     """Lightweight serializer just for adding feedback after interview."""
     class Meta:
         model  = Interview
-        fields = ['id', 'feedback', 'result', 'status']
\ No newline at end of file
+        fields = ['id', 'feedback', 'result', 'status']
+
+
+class InterviewSearchResultSerializer(InterviewSerializer):
+    """Interview plus its trigram `similarity` to the search query."""
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta(InterviewSerializer.Meta):
+        fields = InterviewSerializer.Meta.fields + ['similarity']
@@ -1,3 +1,132 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.core import stats
+from apps.core.testing import QueryBudgetMixin
+from .models import Interview
+from .search import similarity
+
+User = get_user_model()
+
+
+class InterviewSearchTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/interviews/'
+
+    def create(self, company, role='Backend Engineer', hr_name='', user=None, days=1):
+        return Interview.objects.create(
+            user=user or self.user, company_name=company, role=role, hr_name=hr_name,
+            scheduled_at=timezone.now() + timedelta(days=days),
+        )
+
+    def test_similarity_matches_pg_trgm(self):
+        self.assertEqual(similarity('word', 'word'), 1.0)
+        self.assertEqual(similarity('', 'word'), 0.0)
+        # pg_trgm: similarity('Google', 'Gogle') = 0.625
+        self.assertAlmostEqual(similarity('Google', 'Gogle'), 0.625)
+
+    def test_search_tolerates_typos(self):
+        google = self.create('Google')
+        self.create('Microsoft')
+        self.create('Goldman Sachs')
+        response = self.client.get(self.url + 'search/', {'q': 'Gogle'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [google.id])
+        self.assertGreater(response.data['results'][0]['similarity'], 0.3)
+
+    def test_search_ranks_across_fields_and_owner(self):
+        by_role = self.create('Acme', role='Data Scientist')
+        by_hr   = self.create('Initech', hr_name='Dana Scully')
+        self.create('Globex', role='Data Scientist', user=User.objects.create_user(
+            username='other', email='other@example.com', password='Test@1234'
+        ))
+        response = self.client.get(self.url + 'search/', {'q': 'data scientst'})
+        self.assertEqual([row['id'] for row in response.data['results']], [by_role.id])
+
+        response = self.client.get(self.url + 'search/', {'q': 'Scully'})
+        self.assertEqual([row['id'] for row in response.data['results']], [by_hr.id])
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.url + 'search/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_company_autocomplete_prefix_then_fuzzy(self):
+        for company in ['Google', 'Google', 'Goldman Sachs', 'Gojek', 'Microsoft']:
+            self.create(company)
+        response = self.client.get(self.url + 'companies/', {'q': 'go'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'company_name': 'Google',        'total_rounds': 2},
+            {'company_name': 'Gojek',         'total_rounds': 1},
+            {'company_name': 'Goldman Sachs', 'total_rounds': 1},
+        ])
+
+        response = self.client.get(self.url + 'companies/', {'q': 'Gogle'})
+        self.assertEqual([row['company_name'] for row in response.data], ['Google'])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_company_list_is_cached_until_a_write(self):
+        self.create('Google')
+        self.client.get(self.url + 'companies/')
+        with self.assertNumQueries(0):
+            self.client.get(self.url + 'companies/', {'q': 'goo'})
+
+        self.client.post(self.url, {
+            'company_name': 'Goodyear', 'role': 'Dev',
+            'scheduled_at': (timezone.now() + timedelta(days=2)).isoformat(),
+        }, format='json')
+        response = self.client.get(self.url + 'companies/', {'q': 'goo'})
+        self.assertEqual([row['company_name'] for row in response.data], ['Goodyear', 'Google'])
+
+
+class InterviewQueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/interviews/'
+
+    def create_interviews(self, count):
+        companies = ['Google', 'Acme', 'Initech', 'Globex']
+        for i in range(count):
+            Interview.objects.create(
+                user=self.user, company_name=companies[i % len(companies)], role='Backend Engineer',
+                scheduled_at=timezone.now() + timedelta(days=i + 1),
+            )
+        stats.rebuild(self.user.pk)  # the API keeps stats current; ORM writes do not
+
+    def test_list(self):
+        self.assertQueryBudget(self.url, 2, seed=self.create_interviews)
+
+    def test_upcoming(self):
+        self.assertQueryBudget(self.url + 'upcoming/', 1, seed=self.create_interviews)
+
+    def test_by_company(self):
+        self.assertQueryBudget(self.url + 'by-company/', 2, seed=self.create_interviews)
+
+    def test_companies(self):
+        self.assertQueryBudget(self.url + 'companies/?q=go', 1, seed=self.create_interviews)
+
+    def test_search(self):
+        self.assertQueryBudget(self.url + 'search/?q=google', 1, seed=self.create_interviews)
+
+    def test_summary(self):
+        self.assertQueryBudget(self.url + 'summary/', 2, seed=self.create_interviews)
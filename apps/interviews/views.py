@@ -1,41 +1,77 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db import transaction
 
+from apps.core import events, stats, sync
+from apps.core.cache import CachedListMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
 from .models import Interview
-from .serializers import InterviewSerializer, InterviewFeedbackSerializer
+from .search import company_counts, complete_company, fuzzy_search
+from .serializers import InterviewSerializer, InterviewFeedbackSerializer, InterviewSearchResultSerializer
 
 
-class InterviewViewSet(viewsets.ModelViewSet):
-    serializer_class   = InterviewSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields   = ['status', 'result', 'round_type', 'mode']
-    search_fields      = ['company_name', 'role', 'hr_name']
-    ordering_fields    = ['scheduled_at', 'created_at', 'round_number']
+class InterviewPagination(KeysetPagination):
+    ordering = ('scheduled_at',)
+
+
+class InterviewViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
+    serializer_class     = InterviewSerializer
+    permission_classes   = [IsAuthenticated]
+    pagination_class     = InterviewPagination
+    filter_backends      = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields     = ['status', 'result', 'round_type', 'mode']
+    search_fields        = ['company_name', 'role', 'hr_name']
+    ordering_fields      = ['scheduled_at', 'created_at', 'round_number']
+    list_cache_namespace = 'interview'
+    conditional_actions  = ('list', 'retrieve', 'summary', 'by_company')
+    stats_actions        = ('summary',)
+    replica_actions      = ('list', 'summary', 'upcoming', 'by_company')
 
     def get_queryset(self):
         return Interview.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            interview = serializer.save(user=self.request.user)
+            stats.record_created(interview)
+            events.publish(self.request.user.pk, 'interviews', 'created', [serializer.data])
+        self.invalidate_list_cache()
 
-    @action(detail=False, methods=['get'], url_path='upcoming')
-    def upcoming(self, request):
-        """Return interviews scheduled in the next 7 days."""
+    def perform_update(self, serializer):
+        with transaction.atomic(), stats.track_update(serializer.instance):
+            serializer.save()
+            events.publish(self.request.user.pk, 'interviews', 'updated', [serializer.data])
+        self.invalidate_list_cache()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            pk = instance.pk
+            sync.record_deleted(Interview, instance.user_id, [pk])
+            instance.delete()
+            stats.record_deleted(instance)
+            events.publish(self.request.user.pk, 'interviews', 'deleted', [pk])
+        self.invalidate_list_cache()
+
+    def get_upcoming_queryset(self):
         from datetime import timedelta
-        now      = timezone.now()
+        now       = timezone.now()
         next_week = now + timedelta(days=7)
-        upcoming  = Interview.objects.filter(
-            user=request.user,
+        return Interview.objects.filter(
+            user=self.request.user,
             scheduled_at__gte=now,
             scheduled_at__lte=next_week,
             status='scheduled'
         ).order_by('scheduled_at')
-        serializer = self.get_serializer(upcoming, many=True)
+
+    @action(detail=False, methods=['get'], url_path='upcoming')
+    def upcoming(self, request):
+        """Return interviews scheduled in the next 7 days."""
+        serializer = self.get_serializer(self.get_upcoming_queryset(), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='by-company')
@@ -51,6 +87,31 @@ class InterviewViewSet(viewsets.ModelViewSet):
         )
         return Response(data)
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """Typo-tolerant search (`?q=`) over company, role and HR name."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'q': ['This query parameter is required.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            limit = 20
+
+        # Field filters (status, result, ...) still apply; similarity replaces ordering
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        results  = fuzzy_search(queryset, query)[:limit]
+        serializer = InterviewSearchResultSerializer(results, many=True, context=self.get_serializer_context())
+        return Response({'query': query, 'results': serializer.data})
+
+    @action(detail=False, methods=['get'], url_path='companies')
+    def companies(self, request):
+        """Company autocomplete (`?q=`): prefix matches first, then close spellings."""
+        companies = company_counts(self.get_queryset(), request.user.id)
+        matches   = complete_company(companies, request.query_params.get('q', ''))
+        return Response([{'company_name': name, 'total_rounds': total} for name, total in matches])
+
     @action(detail=True, methods=['patch'], url_path='add-feedback')
     def add_feedback(self, request, pk=None):
         """Add feedback and result after interview is done."""
@@ -61,20 +122,25 @@ class InterviewViewSet(viewsets.ModelViewSet):
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(InterviewSerializer(interview).data)
+        with transaction.atomic(), stats.track_update(interview):
+            serializer.save()
+            data = self.get_serializer(interview).data
+            events.publish(request.user.pk, 'interviews', 'updated', [data])
+        self.invalidate_list_cache()
+        return Response(data)
 
     @action(detail=False, methods=['get'], url_path='summary')
     def summary(self, request):
         """Return summary stats for the current user."""
-        from django.db.models import Count
-        qs = Interview.objects.filter(user=request.user)
-        data = {
-            'total':     qs.count(),
-            'scheduled': qs.filter(status='scheduled').count(),
-            'completed': qs.filter(status='completed').count(),
-            'selected':  qs.filter(result='selected').count(),
-            'rejected':  qs.filter(result='rejected').count(),
-            'on_hold':   qs.filter(result='on_hold').count(),
-        }
-        return Response(data)
\ No newline at end of file
+        return Response(self.summarize(stats.get_user_stats(request.user)))
+
+    @staticmethod
+    def summarize(user_stats):
+        return {
+            'total':     user_stats.interviews_total,
+            'scheduled': user_stats.interviews_scheduled,
+            'completed': user_stats.interviews_completed,
+            'selected':  user_stats.result_selected,
+            'rejected':  user_stats.result_rejected,
+            'on_hold':   user_stats.result_on_hold,
+        }
\ No newline at end of file
@@ -4,6 +4,7 @@ from .models import JournalEntry
 
 @admin.register(JournalEntry)
 class JournalEntryAdmin(admin.ModelAdmin):
-    list_display  = ['title', 'user', 'mood', 'date', 'word_count']
-    list_filter   = ['mood', 'date']
-    search_fields = ['title', 'content', 'user__email']
\ No newline at end of file
+    list_display        = ['title', 'user', 'mood', 'date', 'word_count']
+    list_filter         = ['mood', 'date']
+    search_fields       = ['title', 'content', 'user__email']
+    list_select_related = ['user']
\ No newline at end of file
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from apps.journal import search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0002_journal_user_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # tsvector trigger + GIN index on PostgreSQL, FTS5 table + triggers on SQLite
+        migrations.RunPython(search.install, search.uninstall),
+    ]
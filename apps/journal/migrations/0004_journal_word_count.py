@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+from apps.journal import search
+
+
+def backfill_word_count(apps, schema_editor):
+    JournalEntry = apps.get_model('journal', 'JournalEntry')
+    batch = []
+    for entry in JournalEntry.objects.only('id', 'content').iterator(chunk_size=2000):
+        entry.word_count = len(entry.content.split())
+        batch.append(entry)
+        if len(batch) == 2000:
+            JournalEntry.objects.bulk_update(batch, ['word_count'])
+            batch = []
+    if batch:
+        JournalEntry.objects.bulk_update(batch, ['word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0003_journal_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_word_count, migrations.RunPython.noop),
+        # SQLite rebuilt the table for AddField, dropping the FTS triggers
+        migrations.RunPython(search.reinstall_sqlite_triggers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['user', '-word_count', '-id'], name='journal_user_words_idx'),
+        ),
+    ]
@@ -1,8 +1,40 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from datetime import date
 
 
+def count_words(text):
+    return len(text.split())
+
+
+class JournalEntryQuerySet(models.QuerySet):
+    """Keeps `word_count` in step with `content` for bulk writes too."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for entry in objs:
+            entry.word_count = count_words(entry.content)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if 'content' in fields:
+            objs = list(objs)
+            for entry in objs:
+                entry.word_count = count_words(entry.content)
+            if 'word_count' not in fields:
+                fields.append('word_count')
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class JournalEntryManager(models.Manager.from_queryset(JournalEntryQuerySet)):
+    """Leaves out `search_vector`: only search reads it, and only in SQL."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
 class JournalEntry(models.Model):
 
     MOOD_CHOICES = [
@@ -23,17 +55,34 @@ class JournalEntry(models.Model):
     mood       = models.CharField(max_length=20, choices=MOOD_CHOICES, default='neutral')
     tags       = models.JSONField(default=list, blank=True)
     date       = models.DateField(default=date.today)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by a database trigger on PostgreSQL (see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = JournalEntryManager()
+
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name        = 'Journal Entry'
         verbose_name_plural = 'Journal Entries'
+        indexes = [
+            # Per-user list, newest first (matches ordering + id tiebreaker)
+            models.Index(fields=['user', '-date', '-created_at', '-id'], name='journal_user_date_idx'),
+            # Longest entries / ?ordering=-word_count
+            models.Index(fields=['user', '-word_count', '-id'], name='journal_user_words_idx'),
+            # Incremental sync (/api/sync/): rows changed after an (updated_at, id) cursor
+            models.Index(fields=['user', 'updated_at', 'id'], name='journal_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} — {self.title} ({self.date})"
 
-    @property
-    def word_count(self):
-        return len(self.content.split())
\ No newline at end of file
+    def save(self, *args, **kwargs):
+        self.word_count = count_words(self.content)
+        update_fields   = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'word_count'}
+        super().save(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Full-text search over journal entries.
+
+PostgreSQL keeps a weighted `search_vector` (title A, tags B, content C) up
+to date with a trigger and serves queries from a GIN index. SQLite (dev)
+uses an FTS5 table kept in sync by triggers. `search_entries()` hides the
+difference: both return the queryset annotated with `rank` (higher is
+better) and a `snippet` of the content with matches wrapped in <mark>.
+"""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, TextField
+from django.db.models.expressions import RawSQL
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP  = '</mark>'
+
+POSTGRES_INSTALL = [
+    """
+    CREATE OR REPLACE FUNCTION journal_entry_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+            setweight(jsonb_to_tsvector('pg_catalog.english', coalesce(NEW.tags, '[]'::jsonb), '["string"]'), 'B') ||
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.content, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER journal_entry_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, content, tags, search_vector ON journal_journalentry
+    FOR EACH ROW EXECUTE FUNCTION journal_entry_search_vector()
+    """,
+    # Backfill: touching a watched column fires the trigger for existing rows
+    "UPDATE journal_journalentry SET title = title",
+    "CREATE INDEX IF NOT EXISTS journal_search_vector_idx ON journal_journalentry USING gin (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS journal_search_vector_idx",
+    "DROP TRIGGER IF EXISTS journal_entry_search_vector_update ON journal_journalentry",
+    "DROP FUNCTION IF EXISTS journal_entry_search_vector()",
+]
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_journalentry_fts_insert AFTER INSERT ON journal_journalentry BEGIN
+        INSERT INTO journal_journalentry_fts (rowid, title, content, tags)
+        VALUES (new.id, new.title, new.content, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_journalentry_fts_delete AFTER DELETE ON journal_journalentry BEGIN
+        INSERT INTO journal_journalentry_fts (journal_journalentry_fts, rowid, title, content, tags)
+        VALUES ('delete', old.id, old.title, old.content, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_journalentry_fts_update AFTER UPDATE ON journal_journalentry BEGIN
+        INSERT INTO journal_journalentry_fts (journal_journalentry_fts, rowid, title, content, tags)
+        VALUES ('delete', old.id, old.title, old.content, old.tags);
+        INSERT INTO journal_journalentry_fts (rowid, title, content, tags)
+        VALUES (new.id, new.title, new.content, new.tags);
+    END
+    """,
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS journal_journalentry_fts USING fts5 (
+        title, content, tags,
+        content='journal_journalentry', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    *SQLITE_TRIGGERS,
+    "INSERT INTO journal_journalentry_fts (journal_journalentry_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS journal_journalentry_fts_insert",
+    "DROP TRIGGER IF EXISTS journal_journalentry_fts_delete",
+    "DROP TRIGGER IF EXISTS journal_journalentry_fts_update",
+    "DROP TABLE IF EXISTS journal_journalentry_fts",
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def install(apps, schema_editor):
+    """Migration hook: create the vendor's search structures."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_INSTALL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_INSTALL)
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_UNINSTALL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_UNINSTALL)
+
+
+def reinstall_sqlite_triggers(apps, schema_editor):
+    """
+    Migration hook for later schema changes to `journal_journalentry`.
+
+    SQLite rebuilds the table for many ALTERs, which drops its triggers.
+    """
+    if schema_editor.connection.vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_TRIGGERS)
+
+
+def _fts5_query(query):
+    # Quote every term so user input can never be parsed as FTS5 syntax
+    return ' '.join('"%s"' % term.replace('"', '""') for term in query.split())
+
+
+def search_entries(queryset, query):
+    """Filter `queryset` to entries matching `query`, best matches first."""
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        search_query = SearchQuery(query, config='english', search_type='websearch')
+        return (
+            queryset
+            .filter(search_vector=search_query)
+            .annotate(
+                rank=SearchRank(F('search_vector'), search_query),
+                snippet=SearchHeadline(
+                    'content', search_query, config='english',
+                    start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+                    max_words=35, min_words=15, max_fragments=2,
+                ),
+            )
+            .order_by('-rank', '-date', '-id')
+        )
+
+    # SQLite (dev): FTS5
+    fts_query = _fts5_query(query)
+    if not fts_query:
+        return queryset.none()
+    match = (
+        "FROM journal_journalentry_fts WHERE journal_journalentry_fts MATCH %s "
+        "AND journal_journalentry_fts.rowid = journal_journalentry.id"
+    )
+    return (
+        queryset
+        .filter(pk__in=RawSQL(
+            "SELECT rowid FROM journal_journalentry_fts WHERE journal_journalentry_fts MATCH %s",
+            (fts_query,),
+        ))
+        .annotate(
+            # bm25() is lower-is-better; negate it so both backends sort by -rank
+            rank=RawSQL(f"SELECT -bm25(journal_journalentry_fts, 10.0, 1.0, 5.0) {match}",
+                        (fts_query,), output_field=FloatField()),
+            snippet=RawSQL(f"SELECT snippet(journal_journalentry_fts, 1, %s, %s, '…', 24) {match}",
+                           (HIGHLIGHT_START, HIGHLIGHT_STOP, fts_query), output_field=TextField()),
+        )
+        .order_by('-rank', '-date', '-id')
+    )
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+
+from apps.core.serializers import OwnerField
 from .models import JournalEntry
 
 
 class JournalEntrySerializer(serializers.ModelSerializer):
-    word_count = serializers.ReadOnlyField()
-    user       = serializers.StringRelatedField(read_only=True)
+    user = OwnerField()
 
     class Meta:
         model  = JournalEntry
@@ -26,4 +27,13 @@ class JournalEntrySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Tags must be a list.")
         if len(value) > 10:
             raise serializers.ValidationError("Maximum 10 tags allowed.")
-        return value
\ No newline at end of file
+        return value
+
+
+class JournalSearchResultSerializer(JournalEntrySerializer):
+    """Entry plus its relevance `rank` and a highlighted content `snippet`."""
+    rank    = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(JournalEntrySerializer.Meta):
+        fields = JournalEntrySerializer.Meta.fields + ['rank', 'snippet']
@@ -1,7 +1,12 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.db import connection
 from rest_framework.test import APIClient
 from rest_framework import status
+
+from apps.core import stats
+from apps.core.testing import QueryBudgetMixin
 from .models import JournalEntry
 
 User = get_user_model()
@@ -38,7 +43,7 @@ class JournalTests(TestCase):
         )
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_user_cannot_see_others_entries(self):
         other_user = User.objects.create_user(
@@ -49,7 +54,7 @@ class JournalTests(TestCase):
             content='Private content', mood='good', date='2026-02-24'
         )
         response = self.client.get(self.url)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
 
     def test_future_date_rejected(self):
         response = self.client.post(self.url, {
@@ -58,4 +63,129 @@ class JournalTests(TestCase):
             'mood':    'good',
             'date':    '2099-01-01',
         }, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_full_text_search_ranks_and_highlights(self):
+        JournalEntry.objects.create(
+            user=self.user, title='Banana bread',
+            content='Baked bread with two ripe bananas today.', date='2026-02-20'
+        )
+        JournalEntry.objects.create(
+            user=self.user, title='Groceries',
+            content='Bought milk, eggs and a banana.', date='2026-02-21'
+        )
+        JournalEntry.objects.create(
+            user=self.user, title='Walk',
+            content='Long walk in the park.', date='2026-02-22'
+        )
+        response = self.client.get(self.url + 'search/', {'q': 'banana'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [row['title'] for row in response.data['results']]
+        self.assertEqual(titles, ['Banana bread', 'Groceries'])
+        self.assertIn('<mark>', response.data['results'][1]['snippet'])
+
+    def test_full_text_search_tracks_updates_and_owner(self):
+        entry = JournalEntry.objects.create(
+            user=self.user, title='Draft', content='Nothing yet', date='2026-02-24'
+        )
+        other_user = User.objects.create_user(
+            username='other', email='other@example.com', password='Test@1234'
+        )
+        JournalEntry.objects.create(
+            user=other_user, title='Private', content='Secret kayak trip', date='2026-02-24'
+        )
+        self.client.patch(f'{self.url}{entry.id}/', {'content': 'Planned a kayak trip'}, format='json')
+
+        response = self.client.get(self.url + 'search/', {'q': 'kayak'})
+        self.assertEqual([row['id'] for row in response.data['results']], [entry.id])
+
+    def test_full_text_search_requires_query(self):
+        response = self.client.get(self.url + 'search/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_word_count_is_stored_and_tracks_writes(self):
+        entry = JournalEntry.objects.create(user=self.user, title='Day', content='one two three')
+        self.assertEqual(JournalEntry.objects.filter(word_count=3).get().pk, entry.pk)
+
+        entry.content = 'one two'
+        entry.save(update_fields=['content'])
+        entry.refresh_from_db()
+        self.assertEqual(entry.word_count, 2)
+
+        JournalEntry.objects.bulk_create([
+            JournalEntry(user=self.user, title='Bulk', content='a b c d'),
+        ])
+        self.assertTrue(JournalEntry.objects.filter(title='Bulk', word_count=4).exists())
+
+        entry.content = 'just one more time'
+        JournalEntry.objects.bulk_update([entry], ['content'])
+        entry.refresh_from_db()
+        self.assertEqual(entry.word_count, 4)
+
+    def test_reads_do_not_select_search_vector(self):
+        entry = JournalEntry.objects.create(user=self.user, title='Day', content='one two three')
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(f'{self.url}{entry.pk}/').status_code, status.HTTP_200_OK)
+        selects = [query['sql'] for query in captured.captured_queries if 'journal_journalentry' in query['sql']]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertNotIn('search_vector', sql)
+
+    def test_writing_stats(self):
+        for day, content in [('2026-02-02', 'a b c'), ('2026-02-02', 'a'), ('2026-02-10', 'a b'), ('2026-03-01', 'a b c d e')]:
+            JournalEntry.objects.create(user=self.user, title=f'Entry {content}', content=content, date=day)
+
+        response = self.client.get(self.url + 'writing-stats/', {'period': 'month'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totals'], {'entries': 4, 'words': 11, 'average': 2.8, 'longest': 5})
+        self.assertEqual(
+            [(str(row['period']), row['entries'], row['words']) for row in response.data['series']],
+            [('2026-02-01', 3, 6), ('2026-03-01', 1, 5)],
+        )
+        self.assertEqual(
+            [row['word_count'] for row in response.data['longest_entries']], [5, 3, 2, 1]
+        )
+
+        response = self.client.get(self.url + 'writing-stats/', {'period': 'day', 'end': '2026-02-28'})
+        self.assertEqual(
+            [(str(row['period']), row['words']) for row in response.data['series']],
+            [('2026-02-02', 4), ('2026-02-10', 2)],
+        )
+
+        response = self.client.get(self.url + 'writing-stats/', {'period': 'year'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JournalQueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/journal/entries/'
+
+    def create_entries(self, count):
+        moods = [mood for mood, _ in JournalEntry.MOOD_CHOICES]
+        for i in range(count):
+            JournalEntry.objects.create(
+                user=self.user, title=f'Entry {i}', content=f'Walked and wrote {i} words',
+                mood=moods[i % len(moods)], tags=['walk', f'tag{i}'], date=f'2026-02-{i % 28 + 1:02d}',
+            )
+        stats.rebuild(self.user.pk)  # the API keeps stats current; ORM writes do not
+
+    def test_list(self):
+        self.assertQueryBudget(self.url, 2, seed=self.create_entries)
+
+    def test_mood_summary(self):
+        self.assertQueryBudget(self.url + 'moods/', 2, seed=self.create_entries)
+
+    def test_search(self):
+        self.assertQueryBudget(self.url + 'search/?q=walked', 1, seed=self.create_entries)
+
+    def test_writing_stats(self):
+        self.assertQueryBudget(self.url + 'writing-stats/', 4, seed=self.create_entries)
@@ -1,67 +1,150 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, DateField, Max, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils.dateparse import parse_date
 
+from apps.core import events, stats, sync
+from apps.core.cache import CachedListMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
 from .models import JournalEntry
-from .serializers import JournalEntrySerializer
+from .search import search_entries
+from .serializers import JournalEntrySerializer, JournalSearchResultSerializer
 
 
-class JournalEntryViewSet(viewsets.ModelViewSet):
-    serializer_class   = JournalEntrySerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields   = ['mood', 'date']
-    search_fields      = ['title', 'content', 'tags']
-    ordering_fields    = ['date', 'created_at']
+WRITING_PERIODS = {
+    'day':   TruncDay,
+    'week':  TruncWeek,
+    'month': TruncMonth,
+}
+
+
+class JournalEntryPagination(KeysetPagination):
+    ordering = ('-date', '-created_at')
+
+
+class JournalEntryViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
+    serializer_class     = JournalEntrySerializer
+    permission_classes   = [IsAuthenticated]
+    pagination_class     = JournalEntryPagination
+    filter_backends      = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields     = ['mood', 'date']
+    search_fields        = ['title', 'content', 'tags']
+    ordering_fields      = ['date', 'created_at', 'word_count']
+    list_cache_namespace = 'journal'
+    conditional_actions  = ('list', 'retrieve', 'mood_summary', 'writing_stats')
+    stats_actions        = ('mood_summary',)
+    replica_actions      = ('list', 'mood_summary')
 
     def get_queryset(self):
         # Users can only see their own entries
         return JournalEntry.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            entry = serializer.save(user=self.request.user)
+            stats.record_created(entry)
+            events.publish(self.request.user.pk, 'journal', 'created', [serializer.data])
         # Invalidate cache when new entry is created
-        cache_key = f"journal_list_{self.request.user.id}"
-        cache.delete(cache_key)
+        self.invalidate_list_cache()
 
     def perform_update(self, serializer):
-        serializer.save()
+        with transaction.atomic(), stats.track_update(serializer.instance):
+            serializer.save()
+            events.publish(self.request.user.pk, 'journal', 'updated', [serializer.data])
         # Invalidate cache on update
-        cache_key = f"journal_list_{self.request.user.id}"
-        cache.delete(cache_key)
+        self.invalidate_list_cache()
 
     def perform_destroy(self, instance):
-        instance.delete()
+        with transaction.atomic():
+            pk = instance.pk
+            sync.record_deleted(JournalEntry, instance.user_id, [pk])
+            instance.delete()
+            stats.record_deleted(instance)
+            events.publish(self.request.user.pk, 'journal', 'deleted', [pk])
         # Invalidate cache on delete
-        cache_key = f"journal_list_{self.request.user.id}"
-        cache.delete(cache_key)
+        self.invalidate_list_cache()
+
+    @action(detail=False, methods=['get'], url_path='moods')
+    def mood_summary(self, request):
+        """Return count of entries per mood for the current user."""
+        user_stats = stats.get_user_stats(request.user)
+        summary = [
+            {'mood': mood, 'count': getattr(user_stats, f'mood_{mood}')}
+            for mood in sorted(choice for choice, _ in JournalEntry.MOOD_CHOICES)
+            if getattr(user_stats, f'mood_{mood}')
+        ]
+        return Response(summary)
 
-    def list(self, request, *args, **kwargs):
-        # Try to get from cache first
-        cache_key = f"journal_list_{request.user.id}"
-        cached    = cache.get(cache_key)
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """Ranked full-text search (`?q=`) with highlighted snippets."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'q': ['This query parameter is required.']}, status=status.HTTP_400_BAD_REQUEST)
 
-        if cached:
-            return Response(cached)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            limit = 20
 
-        response = super().list(request, *args, **kwargs)
+        # Field filters (mood, date) still apply; ranking replaces ordering
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        results  = search_entries(queryset, query)[:limit]
+        serializer = JournalSearchResultSerializer(results, many=True, context=self.get_serializer_context())
+        return Response({'query': query, 'results': serializer.data})
 
-        # Cache for 5 minutes
-        cache.set(cache_key, response.data, timeout=300)
-        return response
+    @action(detail=False, methods=['get'], url_path='writing-stats')
+    def writing_stats(self, request):
+        """Words and entries per `?period=` (day/week/month), plus the longest entries."""
+        period = request.query_params.get('period', 'day')
+        if period not in WRITING_PERIODS:
+            return Response({'period': [f"Choose one of: {', '.join(WRITING_PERIODS)}."]},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-    @action(detail=False, methods=['get'], url_path='moods')
-    def mood_summary(self, request):
-        """Return count of entries per mood for the current user."""
-        from django.db.models import Count
-        summary = (
-            JournalEntry.objects
-            .filter(user=request.user)
-            .values('mood')
-            .annotate(count=Count('id'))
-            .order_by('mood')
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        for param, lookup in (('start', 'date__gte'), ('end', 'date__lte')):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    parsed = parse_date(value)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    return Response({param: ['Enter a valid date (YYYY-MM-DD).']},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                queryset = queryset.filter(**{lookup: parsed})
+
+        queryset = queryset.order_by()
+        series   = (
+            queryset
+            .annotate(bucket=WRITING_PERIODS[period]('date', output_field=DateField()))
+            .values('bucket')
+            .annotate(entries=Count('id'), words=Sum('word_count'))
+            .order_by('bucket')
+        )
+        totals  = queryset.aggregate(
+            entries=Count('id'), words=Sum('word_count'),
+            average=Avg('word_count'), longest=Max('word_count'),
         )
-        return Response(summary)
\ No newline at end of file
+        longest = queryset.order_by('-word_count', '-id').values('id', 'title', 'date', 'word_count')[:5]
+
+        return Response({
+            'period': period,
+            'totals': {
+                'entries': totals['entries'],
+                'words':   totals['words'] or 0,
+                'average': round(totals['average'] or 0, 1),
+                'longest': totals['longest'] or 0,
+            },
+            'series':  [
+                {'period': row['bucket'], 'entries': row['entries'], 'words': row['words']}
+                for row in series
+            ],
+            'longest_entries': list(longest),
+        })
@@ -3,6 +3,7 @@ from .models import Todo
 
 @admin.register(Todo)
 class TodoAdmin(admin.ModelAdmin):
-    list_display  = ['title', 'user', 'priority', 'status', 'due_date', 'is_overdue']
-    list_filter   = ['status', 'priority']
-    search_fields = ['title', 'description', 'user__email']
\ No newline at end of file
+    list_display        = ['title', 'user', 'priority', 'status', 'due_date', 'is_overdue']
+    list_filter         = ['status', 'priority']
+    search_fields       = ['title', 'description', 'user__email']
+    list_select_related = ['user']
\ No newline at end of file
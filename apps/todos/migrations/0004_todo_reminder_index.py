@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0003_todo_sync_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('status', 'done'), _negated=True), fields=['due_date'], name='todo_open_due_idx'),
+        ),
+    ]
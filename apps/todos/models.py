@@ -35,6 +35,26 @@ class Todo(models.Model):
         ordering = ['due_date', '-priority']
         verbose_name        = 'Todo'
         verbose_name_plural = 'Todos'
+        indexes = [
+            # Per-user list by due date (matches ordering + id tiebreaker)
+            models.Index(fields=['user', 'due_date', 'id'], name='todo_user_due_idx'),
+            # Status-filtered lists and summaries
+            models.Index(fields=['user', 'status', 'due_date'], name='todo_user_status_due_idx'),
+            # `overdue`: only open todos are ever looked up by due date
+            models.Index(
+                fields=['user', 'due_date'],
+                condition=~models.Q(status='done'),
+                name='todo_user_open_due_idx',
+            ),
+            # Incremental sync (/api/sync/): rows changed after an (updated_at, id) cursor
+            models.Index(fields=['user', 'updated_at', 'id'], name='todo_user_updated_idx'),
+            # Reminders: open todos falling due in a window, across all users
+            models.Index(
+                fields=['due_date'],
+                condition=~models.Q(status='done'),
+                name='todo_open_due_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} — {self.title} [{self.priority}]"
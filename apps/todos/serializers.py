@@ -1,11 +1,38 @@
 from rest_framework import serializers
 from datetime import date
+from django.utils import timezone
+
+from apps.core.serializers import OwnerField
 from .models import Todo
 
 
+BULK_MAX_ITEMS = 500
+
+
+class TodoListSerializer(serializers.ListSerializer):
+    """Writes a validated batch with one INSERT / UPDATE per batch."""
+
+    def create(self, validated_data):
+        todos = [Todo(**attrs) for attrs in validated_data]
+        return Todo.objects.bulk_create(todos)
+
+    def update(self, instances, validated_data):
+        # `instances` is ordered like the payload
+        fields = set()
+        now    = timezone.now()
+        for todo, attrs in zip(instances, validated_data):
+            for name, value in attrs.items():
+                setattr(todo, name, value)
+            fields.update(attrs)
+            # bulk_update() skips auto_now
+            todo.updated_at = now
+        Todo.objects.bulk_update(instances, sorted(fields) + ['updated_at'])
+        return instances
+
+
 class TodoSerializer(serializers.ModelSerializer):
     is_overdue = serializers.ReadOnlyField()
-    user       = serializers.StringRelatedField(read_only=True)
+    user       = OwnerField()
 
     class Meta:
         model  = Todo
@@ -16,9 +43,11 @@ class TodoSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        list_serializer_class = TodoListSerializer
 
     def validate_due_date(self, value):
-        if value and value < date.today():
+        # Imported history may legitimately have past due dates
+        if value and value < date.today() and not self.context.get('importing'):
             raise serializers.ValidationError("Due date cannot be in the past.")
         return value
 
@@ -27,4 +56,17 @@ class TodoStatusSerializer(serializers.ModelSerializer):
     """Lightweight serializer just for status toggle."""
     class Meta:
         model  = Todo
-        fields = ['id', 'status']
\ No newline at end of file
+        fields = ['id', 'status']
+
+
+class TodoBulkIdsSerializer(serializers.Serializer):
+    """Payload for batch operations addressed by id."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+
+class TodoBulkStatusSerializer(TodoBulkIdsSerializer):
+    status = serializers.ChoiceField(choices=Todo.STATUS_CHOICES)
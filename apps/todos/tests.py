@@ -1,3 +1,143 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
 
-# Create your tests here.
+from apps.core import stats
+from apps.core.models import UserStats
+from apps.core.testing import QueryBudgetMixin
+from .models import Todo
+from .serializers import BULK_MAX_ITEMS
+
+User = get_user_model()
+
+
+class TodoBulkTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/todos/'
+
+    def create_todos(self, count, **fields):
+        return [Todo.objects.create(user=self.user, title=f'Todo {i}', **fields) for i in range(count)]
+
+    def assertStatsMatchRebuild(self):
+        live = {name: getattr(stats.get_user_stats(self.user), name) for name in stats.counter_fields()}
+        UserStats.objects.filter(user=self.user).delete()
+        rebuilt = stats.rebuild(self.user.pk)
+        self.assertEqual(live, {name: getattr(rebuilt, name) for name in stats.counter_fields()})
+
+    def test_bulk_create(self):
+        response = self.client.post(self.url + 'bulk/', [
+            {'title': 'One', 'priority': 'high'},
+            {'title': 'Two'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([row['title'] for row in response.data], ['One', 'Two'])
+        self.assertTrue(all(row['id'] for row in response.data))
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 2)
+        self.assertStatsMatchRebuild()
+
+    def test_bulk_create_is_all_or_nothing(self):
+        response = self.client.post(self.url + 'bulk/', [
+            {'title': 'Fine'},
+            {'title': 'Late', 'due_date': '2000-01-01'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('due_date', response.data[1])
+        self.assertFalse(Todo.objects.exists())
+
+    def test_bulk_create_rejects_oversized_batch(self):
+        payload  = [{'title': 'x'}] * (BULK_MAX_ITEMS + 1)
+        response = self.client.post(self.url + 'bulk/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        first, second = self.create_todos(2)
+        response = self.client.patch(self.url + 'bulk/', [
+            {'id': second.id, 'status': 'done'},
+            {'id': first.id, 'title': 'Renamed', 'priority': 'low'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data], [second.id, first.id])
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.title, first.priority, first.status), ('Renamed', 'low', 'pending'))
+        self.assertEqual(second.status, 'done')
+        self.assertGreater(second.updated_at, second.created_at)
+        self.assertStatsMatchRebuild()
+
+    def test_bulk_update_rejects_other_users_rows(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='Test@1234')
+        theirs = Todo.objects.create(user=other, title='Theirs')
+        response = self.client.patch(self.url + 'bulk/', [{'id': theirs.id, 'title': 'Mine'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.title, 'Theirs')
+
+    def test_bulk_delete(self):
+        todos = self.create_todos(3)
+        response = self.client.post(self.url + 'bulk-delete/', {'ids': [todos[0].id, todos[2].id]}, format='json')
+        self.assertEqual(response.data, {'deleted': 2})
+        self.assertEqual(list(Todo.objects.values_list('id', flat=True)), [todos[1].id])
+        self.assertStatsMatchRebuild()
+
+    def test_bulk_status_is_one_update(self):
+        todos = self.create_todos(50)
+        Todo.objects.filter(pk=todos[0].pk).update(status='done')
+        ids = [todo.id for todo in todos]
+        stats.rebuild(self.user.pk)
+
+        # Lock read, one UPDATE and one stats delta (plus the savepoint pair)
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url + 'bulk-status/', {'ids': ids, 'status': 'done'}, format='json')
+        self.assertEqual(response.data, {'updated': 49})
+        self.assertEqual(Todo.objects.filter(status='done').count(), 50)
+        self.assertStatsMatchRebuild()
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_bulk_status_invalidates_list(self):
+        todos = self.create_todos(2)
+        self.client.get(self.url)
+        self.client.post(self.url + 'bulk-status/', {'ids': [todos[0].id], 'status': 'in_progress'}, format='json')
+        response = self.client.get(self.url, {'status': 'in_progress'})
+        self.assertEqual([row['id'] for row in response.data['results']], [todos[0].id])
+
+
+class TodoQueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user   = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='Test@1234'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/todos/'
+
+    def create_todos(self, count):
+        statuses   = [choice for choice, _ in Todo.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Todo.PRIORITY_CHOICES]
+        for i in range(count):
+            Todo.objects.create(
+                user=self.user, title=f'Todo {i}', status=statuses[i % len(statuses)],
+                priority=priorities[i % len(priorities)], due_date=f'2020-01-{i % 28 + 1:02d}',
+            )
+        stats.rebuild(self.user.pk)  # the API keeps stats current; ORM writes do not
+
+    def test_list(self):
+        self.assertQueryBudget(self.url, 2, seed=self.create_todos)
+
+    def test_overdue(self):
+        self.assertQueryBudget(self.url + 'overdue/', 2, seed=self.create_todos)
+
+    def test_summary(self):
+        self.assertQueryBudget(self.url + 'summary/', 2, seed=self.create_todos)
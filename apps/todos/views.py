@@ -3,50 +3,63 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
 
+from apps.core import events, stats, sync
+from apps.core.cache import CachedListMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
 from .models import Todo
-from .serializers import TodoSerializer, TodoStatusSerializer
+from .serializers import (
+    BULK_MAX_ITEMS, TodoSerializer, TodoStatusSerializer,
+    TodoBulkIdsSerializer, TodoBulkStatusSerializer,
+)
 
 
-class TodoViewSet(viewsets.ModelViewSet):
-    serializer_class   = TodoSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields   = ['status', 'priority', 'category']
-    search_fields      = ['title', 'description']
-    ordering_fields    = ['due_date', 'priority', 'created_at']
+class TodoPagination(KeysetPagination):
+    ordering = ('due_date',)
+
+
+class TodoViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
+    serializer_class     = TodoSerializer
+    permission_classes   = [IsAuthenticated]
+    pagination_class     = TodoPagination
+    filter_backends      = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields     = ['status', 'priority', 'category']
+    search_fields        = ['title', 'description']
+    ordering_fields      = ['due_date', 'priority', 'created_at']
+    list_cache_namespace = 'todo'
+    conditional_actions  = ('list', 'retrieve', 'summary', 'overdue')
+    stats_actions        = ('summary',)
+    replica_actions      = ('list', 'summary', 'overdue')
 
     def get_queryset(self):
         return Todo.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
-        self._invalidate_cache()
+        with transaction.atomic():
+            todo = serializer.save(user=self.request.user)
+            stats.record_created(todo)
+            events.publish(self.request.user.pk, 'todos', 'created', [serializer.data])
+        self.invalidate_list_cache()
 
     def perform_update(self, serializer):
-        serializer.save()
-        self._invalidate_cache()
+        with transaction.atomic(), stats.track_update(serializer.instance):
+            serializer.save()
+            events.publish(self.request.user.pk, 'todos', 'updated', [serializer.data])
+        self.invalidate_list_cache()
 
     def perform_destroy(self, instance):
-        instance.delete()
-        self._invalidate_cache()
-
-    def _invalidate_cache(self):
-        cache_key = f"todo_list_{self.request.user.id}"
-        cache.delete(cache_key)
-
-    def list(self, request, *args, **kwargs):
-        cache_key = f"todo_list_{request.user.id}"
-        cached    = cache.get(cache_key)
-
-        if cached:
-            return Response(cached)
-
-        response = super().list(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=300)
-        return response
+        with transaction.atomic():
+            pk = instance.pk
+            sync.record_deleted(Todo, instance.user_id, [pk])
+            instance.delete()
+            stats.record_deleted(instance)
+            events.publish(self.request.user.pk, 'todos', 'deleted', [pk])
+        self.invalidate_list_cache()
 
     @action(detail=True, methods=['patch'], url_path='toggle_status')
     def toggle_status(self, request, pk=None):
@@ -57,30 +70,132 @@ class TodoViewSet(viewsets.ModelViewSet):
             'in_progress': 'done',
             'done':        'pending',
         }
-        todo.status = cycle[todo.status]
-        todo.save()
-        self._invalidate_cache()
+        with transaction.atomic(), stats.track_update(todo):
+            todo.status = cycle[todo.status]
+            todo.save()
+            events.publish(request.user.pk, 'todos', 'updated', [self.get_serializer(todo).data])
+        self.invalidate_list_cache()
         return Response(TodoStatusSerializer(todo).data)
 
-    @action(detail=False, methods=['get'], url_path='overdue')
-    def overdue(self, request):
-        """Return all overdue todos for the current user."""
+    def get_bulk_payload(self, request):
+        """Return the request's list payload, or raise a 400."""
+        if not isinstance(request.data, list) or not request.data:
+            raise ValidationError({'non_field_errors': ['Expected a non-empty list of items.']})
+        if len(request.data) > BULK_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [f'At most {BULK_MAX_ITEMS} items per request.']})
+        return request.data
+
+    def get_locked_todos(self, ids):
+        """Lock the user's todos with `ids`; every id must exist."""
+        todos   = {todo.pk: todo for todo in self.get_queryset().select_for_update().filter(pk__in=ids)}
+        missing = sorted(set(ids) - set(todos))
+        if missing:
+            raise NotFound({'ids': missing})
+        return todos
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        """Create (POST) or partially update (PATCH, items carry `id`) many todos at once."""
+        payload = self.get_bulk_payload(request)
+
+        if request.method == 'POST':
+            serializer = self.get_serializer(data=payload, many=True)
+            serializer.is_valid(raise_exception=True)
+            with transaction.atomic():
+                todos = serializer.save(user=request.user)
+                stats.apply_deltas(request.user.pk, stats.tally(todos))
+                events.publish(request.user.pk, 'todos', 'created', serializer.data)
+            self.invalidate_list_cache()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        ids = [item.get('id') if isinstance(item, dict) else None for item in payload]
+        if not all(isinstance(pk, int) for pk in ids) or len(set(ids)) != len(ids):
+            raise ValidationError({'id': ['Every item needs a distinct integer id.']})
+
+        with transaction.atomic():
+            todos      = self.get_locked_todos(ids)
+            instances  = [todos[pk] for pk in ids]
+            before     = stats.tally(instances)
+            serializer = self.get_serializer(instances, data=payload, many=True, partial=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            deltas = stats.tally(instances)
+            deltas.subtract(before)
+            stats.apply_deltas(request.user.pk, deltas)
+            events.publish(request.user.pk, 'todos', 'updated', serializer.data)
+        self.invalidate_list_cache()
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """Delete the todos listed in `ids`."""
+        serializer = TodoBulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        with transaction.atomic():
+            todos      = self.get_locked_todos(ids)
+            sync.record_deleted(Todo, request.user.pk, list(todos))
+            deleted, _ = self.get_queryset().filter(pk__in=ids).delete()
+            stats.apply_deltas(request.user.pk, {
+                name: -n for name, n in stats.tally(todos.values()).items()
+            })
+            events.publish(request.user.pk, 'todos', 'deleted', ids)
+        self.invalidate_list_cache()
+        return Response({'deleted': deleted})
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Move the todos listed in `ids` to `status` with a single UPDATE."""
+        serializer = TodoBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids        = serializer.validated_data['ids']
+        new_status = serializer.validated_data['status']
+
+        with transaction.atomic():
+            todos    = self.get_locked_todos(ids)
+            changing = [todo for todo in todos.values() if todo.status != new_status]
+            before   = stats.tally(changing)
+            now      = timezone.now()
+            # One conditional UPDATE; rows already in `new_status` are left untouched
+            updated  = (
+                self.get_queryset()
+                .filter(pk__in=ids)
+                .exclude(status=new_status)
+                .update(status=new_status, updated_at=now)
+            )
+            for todo in changing:
+                todo.status     = new_status
+                todo.updated_at = now
+            deltas = stats.tally(changing)
+            deltas.subtract(before)
+            stats.apply_deltas(request.user.pk, deltas)
+            if changing:
+                events.publish(request.user.pk, 'todos', 'updated', self.get_serializer(changing, many=True).data)
+        if updated:
+            self.invalidate_list_cache()
+        return Response({'updated': updated})
+
+    def get_overdue_queryset(self):
         from datetime import date
-        overdue_todos = Todo.objects.filter(
-            user=request.user,
+        return Todo.objects.filter(
+            user=self.request.user,
             due_date__lt=date.today()
         ).exclude(status='done')
-        serializer = self.get_serializer(overdue_todos, many=True)
+
+    @action(detail=False, methods=['get'], url_path='overdue')
+    def overdue(self, request):
+        """Return all overdue todos for the current user."""
+        serializer = self.get_serializer(self.get_overdue_queryset(), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='summary')
     def summary(self, request):
         """Return count of todos grouped by status."""
-        from django.db.models import Count
-        data = (
-            Todo.objects
-            .filter(user=request.user)
-            .values('status')
-            .annotate(count=Count('id'))
-        )
+        user_stats = stats.get_user_stats(request.user)
+        data = [
+            {'status': choice, 'count': getattr(user_stats, f'todos_{choice}')}
+            for choice, _ in Todo.STATUS_CHOICES
+            if getattr(user_stats, f'todos_{choice}')
+        ]
         return Response(data)
\ No newline at end of file
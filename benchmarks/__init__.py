@@ -0,0 +1,30 @@
+"""
+Benchmarks for the LifeOS API.
+
+Each module is a script run from the project root, e.g.
+`python -m benchmarks.explain_indexes`. Benchmarks run against a throwaway
+test database created from the active settings (`DJANGO_SETTINGS_MODULE`,
+dev by default), so they never touch real data.
+"""
+import os
+from contextlib import contextmanager
+
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lifeos.settings.dev')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """Create the test databases for the duration of the block."""
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity)
+        teardown_test_environment()
@@ -0,0 +1,149 @@
+"""
+Concurrency of the async read path vs the WSGI path under a slow database.
+
+    python -m benchmarks.async_reads --db-latency 100 --concurrency 1,8,32
+
+Serves the app twice in-process: the WSGI application on a server with a
+fixed pool of `--wsgi-threads` threads (like a gunicorn gthread worker),
+and the ASGI application on one uvicorn worker. Every SQL query is delayed
+by `--db-latency` ms. Each of `--concurrency` clients then fetches a
+10-entry page of the journal list (`/api/journal/entries/` over WSGI,
+`/api/async/journal/entries/` over ASGI) `--requests` times; requests/s and
+latency percentiles are printed for each server.
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from benchmarks import setup, test_database
+
+
+class PooledWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server handling connections on a fixed-size thread pool."""
+    threads = 4
+
+    def process_request(self, request, client_address):
+        if not hasattr(self, 'pool'):
+            self.pool = ThreadPoolExecutor(max_workers=self.threads)
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+
+class QuietHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_wsgi(threads):
+    from django.core.wsgi import get_wsgi_application
+
+    PooledWSGIServer.threads = threads
+    server = make_server('127.0.0.1', 0, get_wsgi_application(), PooledWSGIServer, QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def serve_asgi():
+    import uvicorn
+    from lifeos.asgi import application
+
+    config = uvicorn.Config(application, host='127.0.0.1', port=0, workers=1,
+                            lifespan='off', log_level='warning', access_log=False)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    def shutdown():
+        server.should_exit = True
+    return port, shutdown
+
+
+def load(port, path, token, clients, per_client):
+    """Run `clients` keep-alive clients; return (elapsed, latencies in ms)."""
+    headers   = {'Authorization': f'Bearer {token}'}
+    latencies = []
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        timings    = []
+        for _ in range(per_client):
+            start = time.perf_counter()
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        return timings
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for timings in executor.map(lambda _: client(), range(clients)):
+            latencies.extend(timings)
+    return time.perf_counter() - start, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db-latency',   type=float, default=100, help='ms added to every SQL query')
+    parser.add_argument('--concurrency',  default='1,8,32',        help='comma-separated client counts')
+    parser.add_argument('--requests',     type=int, default=10,    help='requests per client')
+    parser.add_argument('--wsgi-threads', type=int, default=4,     help='threads of the WSGI worker')
+    parser.add_argument('--entries',      type=int, default=200,   help='journal entries to seed')
+    args = parser.parse_args(argv)
+
+    setup()
+    import random
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from rest_framework_simplejwt.tokens import AccessToken
+    from benchmarks.seed import seed_journal, seed_users
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(args.db_latency / 1000)
+        return execute(sql, params, many, context)
+
+    def slow_connection(sender, connection, **kwargs):
+        connection.execute_wrappers.append(slow_query)
+
+    with test_database():
+        user = seed_users(1)[0]
+        seed_journal([user], args.entries, random.Random(0))
+        token = str(AccessToken.for_user(user))
+
+        connection_created.connect(slow_connection)
+        for connection in connections.all():
+            slow_connection(None, connection)
+
+        wsgi_port, wsgi_stop = serve_wsgi(args.wsgi_threads)
+        asgi_port, asgi_stop = serve_asgi()
+        servers = (
+            (f'WSGI ({args.wsgi_threads} threads)', wsgi_port, '/api/journal/entries/?page_size=10'),
+            ('ASGI (uvicorn, async)',               asgi_port, '/api/async/journal/entries/?page_size=10'),
+        )
+
+        print(f'{args.db_latency:g} ms per query, {args.requests} requests per client')
+        print(f"{'server':<24}  {'clients':>7}  {'req/s':>7}  {'p50 ms':>7}  {'p95 ms':>7}")
+        try:
+            for clients in (int(value) for value in args.concurrency.split(',')):
+                for name, port, path in servers:
+                    elapsed, latencies = load(port, path, token, clients, args.requests)
+                    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+                    print(f'{name:<24}  {clients:>7}  {len(latencies) / elapsed:>7.1f}  '
+                          f'{statistics.median(latencies):>7.1f}  {p95:>7.1f}')
+        finally:
+            wsgi_stop()
+            asgi_stop()
+            connection_created.disconnect(slow_connection)
+
+
+if __name__ == '__main__':
+    main()
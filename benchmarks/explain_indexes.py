@@ -0,0 +1,117 @@
+"""
+Show the query plans of the per-user query shapes with and without the
+composite indexes.
+
+    python -m benchmarks.explain_indexes --users 20 --rows 20000
+
+Seeds a throwaway test database, then EXPLAINs and times the journal list,
+todo list/overdue and interview list/upcoming queries, and the reminder
+scans across all users, twice: once with only the foreign-key indexes and
+once with the composite and partial indexes in place.
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import setup, test_database
+
+
+def query_shapes(user):
+    from datetime import date, timedelta
+    from django.db.models import F
+    from django.utils import timezone
+    from apps.core import reminders
+    from apps.interviews.models import Interview
+    from apps.journal.models import JournalEntry
+    from apps.todos.models import Todo
+
+    now    = timezone.now()
+    shapes = {
+        'journal list': (
+            JournalEntry.objects.filter(user=user)
+            .order_by('-date', '-created_at', '-id')[:51]
+        ),
+        'todos list (status=pending)': (
+            Todo.objects.filter(user=user, status='pending')
+            .order_by(F('due_date').asc(nulls_last=True), 'id')[:51]
+        ),
+        'todos overdue': (
+            Todo.objects.filter(user=user, due_date__lt=date.today()).exclude(status='done')
+        ),
+        'interviews list': (
+            Interview.objects.filter(user=user).order_by('scheduled_at', 'id')[:51]
+        ),
+        'interviews upcoming': (
+            Interview.objects.filter(
+                user=user, status='scheduled',
+                scheduled_at__gte=now, scheduled_at__lte=now + timedelta(days=7),
+            ).order_by('scheduled_at')
+        ),
+    }
+    # A day's worth of reminders, for every user
+    for scan in reminders.SCANS:
+        shapes[f'reminders {scan.kind}'] = scan.rows(now - timedelta(days=1), now)
+    return shapes
+
+
+def time_query(queryset, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(title, shapes, repeat):
+    print(f'\n=== {title} ===')
+    for name, queryset in shapes.items():
+        print(f'\n-- {name}: {time_query(queryset, repeat):.2f} ms (median of {repeat})')
+        print(queryset.explain())
+
+
+def analyze():
+    from django.db import connection
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def composite_indexes():
+    from apps.interviews.models import Interview
+    from apps.journal.models import JournalEntry
+    from apps.todos.models import Todo
+    return [(model, index) for model in (JournalEntry, Todo, Interview) for index in model._meta.indexes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users',  type=int, default=20,   help='number of users to seed')
+    parser.add_argument('--rows',   type=int, default=5000, help='rows per user in each table')
+    parser.add_argument('--repeat', type=int, default=20,   help='timed runs per query')
+    args = parser.parse_args(argv)
+
+    setup()
+    from django.db import connection
+    from benchmarks.seed import seed
+
+    with test_database():
+        print(f'Seeding {args.users} users x {args.rows} rows per table on {connection.vendor}...')
+        users = seed(users=args.users, entries=args.rows, todos=args.rows, interviews=args.rows)
+        shapes = query_shapes(users[len(users) // 2])
+
+        indexes = composite_indexes()
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.remove_index(model, index)
+        analyze()
+        report('foreign-key indexes only', shapes, args.repeat)
+
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+        analyze()
+        report('with composite indexes', shapes, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Show that the data export streams in constant memory.
+
+    python -m benchmarks.export_memory --entries 1000000
+
+Seeds one user with `--entries` journal entries in a throwaway test
+database, then consumes `/api/export/ndjson/` (and the gzipped variant)
+chunk by chunk, sampling the process RSS as it goes. A flat RSS column
+means memory does not grow with the number of rows exported.
+"""
+import argparse
+import gc
+import os
+import time
+import zlib
+
+from benchmarks import setup, test_database
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc, falling back to peak RSS)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def consume(client, url, params, total, samples):
+    response = client.get(url, params)
+    assert response.status_code == 200, response.status_code
+    inflate  = zlib.decompressobj(zlib.MAX_WBITS | 16) if params.get('compress') else None
+    every    = max(total // samples, 1)
+    lines    = 0
+    size     = 0
+    next_at  = every
+    start    = time.perf_counter()
+    readings = []
+    for chunk in response.streaming_content:
+        size  += len(chunk)
+        lines += (inflate.decompress(chunk) if inflate else chunk).count(b'\n')
+        if lines >= next_at:
+            readings.append((lines, rss_mb()))
+            next_at += every
+    if not readings or readings[-1][0] != lines:
+        readings.append((lines, rss_mb()))
+    return readings, size, time.perf_counter() - start
+
+
+def report(title, readings, size, elapsed, baseline):
+    print(f'\n=== {title}: {size / 2 ** 20:.1f} MB in {elapsed:.1f}s ===')
+    print(f"{'lines read':>12}  {'RSS MB':>8}  {'vs start':>8}")
+    for lines, rss in readings:
+        print(f'{lines:>12}  {rss:>8.1f}  {rss - baseline:>+8.1f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=100000, help='journal entries to export')
+    parser.add_argument('--samples', type=int, default=10,     help='RSS samples per export')
+    args = parser.parse_args(argv)
+
+    setup()
+    import random
+    from django.db import connection, reset_queries
+    from rest_framework.test import APIClient
+    from benchmarks.seed import seed_journal, seed_users
+
+    with test_database():
+        print(f'Seeding 1 user x {args.entries} journal entries on {connection.vendor}...')
+        user = seed_users(1)[0]
+        seed_journal([user], args.entries, random.Random(0))
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        for title, params in (
+            ('ndjson',      {'resource': 'journal'}),
+            ('ndjson+gzip', {'resource': 'journal', 'compress': 'gzip'}),
+        ):
+            reset_queries()
+            gc.collect()
+            baseline = rss_mb()
+            readings, size, elapsed = consume(client, '/api/export/ndjson/', params, args.entries, args.samples)
+            report(title, readings, size, elapsed, baseline)
+
+
+if __name__ == '__main__':
+    main()
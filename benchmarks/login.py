@@ -0,0 +1,104 @@
+"""
+Login throughput before and after the single-hash login path.
+
+    python -m benchmarks.login --logins 50 --threads 1,4
+
+"before" replays the old pipeline (the serializer and the view each called
+`authenticate()`, so PBKDF2 ran twice); "after" is the current
+`LoginView`. Both are driven through `APIRequestFactory` from `--threads`
+client threads and reported as logins/s and logins/s per busy core.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup, test_database
+
+PASSWORD = 'Bench@1234'
+
+
+def legacy_view():
+    from django.contrib.auth import authenticate
+    from rest_framework import serializers, status
+    from rest_framework.permissions import AllowAny
+    from rest_framework.response import Response
+    from rest_framework.views import APIView
+    from apps.accounts.serializers import UserProfileSerializer
+    from apps.accounts.views import get_tokens_for_user
+
+    class LegacyLoginSerializer(serializers.Serializer):
+        email    = serializers.EmailField()
+        password = serializers.CharField(write_only=True)
+
+        def validate(self, attrs):
+            user = authenticate(username=attrs['email'], password=attrs['password'])
+            if not user:
+                raise serializers.ValidationError('Invalid email or password.')
+            attrs['user'] = user
+            return attrs
+
+    class LegacyLoginView(APIView):
+        permission_classes = [AllowAny]
+
+        def post(self, request):
+            serializer = LegacyLoginSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            user = authenticate(request, username=request.data['email'], password=request.data['password'])
+            if user is None:
+                return Response({'error': 'Invalid email or password.'}, status=status.HTTP_401_UNAUTHORIZED)
+            return Response({
+                'user':   UserProfileSerializer(user).data,
+                'tokens': get_tokens_for_user(user),
+            })
+
+    return LegacyLoginView.as_view()
+
+
+def run(view, users, logins, threads):
+    """Perform `logins` logins from `threads` threads; return elapsed seconds."""
+    from django.db import connections
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+
+    def login(i):
+        user     = users[i % len(users)]
+        request  = factory.post('/api/auth/login/', {'email': user.email, 'password': PASSWORD}, format='json')
+        response = view(request)
+        assert response.status_code == 200, response.status_code
+        connections.close_all()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(login, range(logins)))
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins',  type=int, default=40,  help='logins per measurement')
+    parser.add_argument('--threads', default='1,4',         help='comma-separated client thread counts')
+    args = parser.parse_args(argv)
+
+    setup()
+    from django.conf import settings
+    from apps.accounts.views import LoginView
+    from benchmarks.seed import seed_users
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    with test_database():
+        users = seed_users(8, password=PASSWORD)
+        print(f'{settings.PASSWORD_HASH_ITERATIONS} PBKDF2 iterations, '
+              f'{settings.PASSWORD_HASHING_THREADS} hashing threads, {cores} cores')
+        print(f"{'threads':>7}  {'pipeline':>8}  {'logins/s':>9}  {'per core':>9}")
+        for threads in (int(value) for value in args.threads.split(',')):
+            for name, view in (('before', legacy_view()), ('after', LoginView.as_view())):
+                elapsed = run(view, users, args.logins, threads)
+                rate    = args.logins / elapsed
+                busy    = min(threads, settings.PASSWORD_HASHING_THREADS or threads, cores)
+                print(f'{threads:>7}  {name:>8}  {rate:>9.1f}  {rate / busy:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
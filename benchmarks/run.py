@@ -0,0 +1,502 @@
+"""
+Latency, throughput and query counts for every API route, checked against a baseline.
+
+    python -m benchmarks.run                      # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save               # record a new baseline
+    python -m benchmarks.run --server asgi --only todos --concurrency 4
+
+Seeds `--users` users with `--rows` journal entries, todos and interviews
+each, then sends `--requests` requests to every route in `ROUTES` as the
+first user: in-process through Django's test client (`--server none`), or
+over HTTP to a WSGI (threaded) or ASGI (uvicorn) server started on the
+same database. Each route reports p50/p95/p99 latency, requests/s and SQL
+queries per request (from the `Server-Timing` header, so queries run
+while a streamed body is sent are not counted).
+
+Results are compared with the baseline file: the run fails (exit status
+1) when a route makes more queries per request than the baseline, when its
+`--percentile` latency grows by more than `--threshold` (and `--min-delta`
+ms), or when it answers with an unexpected status. Latency only compares
+well on the machine that recorded the baseline; `--queries-only` skips it
+(CI uses that). The baseline must have been recorded with the same
+`--users`, `--rows`, `--server` and `--concurrency`.
+"""
+import argparse
+import http.client
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from benchmarks import setup, test_database
+
+BASELINE      = os.path.join(os.path.dirname(__file__), 'baseline.json')
+PASSWORD      = 'Bench@1234'
+NEW_PASSWORD  = 'Bench@5678'
+METRICS_TOKEN = 'bench-metrics'
+QUERIES_RE    = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+# Routes that are not benchmarked: Google sign-in needs a real Google ID
+# token, and the allauth pages are server-rendered HTML outside the API
+EXCLUDED_NAMES = {
+    'google-login',
+    'socialaccount_login_cancelled',
+    'socialaccount_login_error',
+    'socialaccount_signup',
+    'socialaccount_connections',
+}
+
+
+class Route:
+    """
+    One benchmarked request.
+
+    `path`, `headers` and string `body` values are formatted with the run's
+    values (`{todo}`, `{entry}`, `{run}`, `{i}`, ...) plus whatever
+    `prepare(fixture, i)` returns; `prepare` runs untimed before each
+    request, e.g. to create the row a DELETE removes. `body` may also be a
+    callable taking those values. `serial` routes always run from one
+    client (as do all writes on SQLite).
+    """
+
+    def __init__(self, name, method, path, body=None, status=200, anonymous=False,
+                 multipart=False, headers=None, prepare=None, serial=False):
+        self.name      = name
+        self.method    = method
+        self.path      = path
+        self.body      = body
+        self.status    = status
+        self.anonymous = anonymous
+        self.multipart = multipart
+        self.headers   = headers or {}
+        self.prepare   = prepare
+        self.serial    = serial
+
+    @property
+    def key(self):
+        return f'{self.method} {self.name}'
+
+    def build(self, fixture, i):
+        """Return `(path, headers, body bytes, content type)` for request `i`."""
+        values = dict(fixture.values, i=i)
+        if self.prepare:
+            values.update(self.prepare(fixture, i))
+
+        headers = {name: value.format(**values) for name, value in self.headers.items()}
+        if not self.anonymous:
+            headers['Authorization'] = f'Bearer {fixture.token}'
+
+        body = self.body(values) if callable(self.body) else _format(self.body, values)
+        if body is None:
+            return self.path.format(**values), headers, b'', None
+        if self.multipart:
+            from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+            return self.path.format(**values), headers, encode_multipart(BOUNDARY, body), MULTIPART_CONTENT
+        return self.path.format(**values), headers, json.dumps(body).encode(), 'application/json'
+
+
+def _format(body, values):
+    if isinstance(body, str):
+        return body.format(**values)
+    if isinstance(body, dict):
+        return {key: _format(value, values) for key, value in body.items()}
+    if isinstance(body, list):
+        return [_format(value, values) for value in body]
+    return body
+
+
+# -- per-request fixtures ----------------------------------------------------
+
+def fresh_entry(fixture, i):
+    from apps.journal.models import JournalEntry
+    return {'pk': JournalEntry.objects.create(user=fixture.user, title=f'Doomed {i}', content='bye').pk}
+
+
+def fresh_todo(fixture, i):
+    from apps.todos.models import Todo
+    return {'pk': Todo.objects.create(user=fixture.user, title=f'Doomed {i}').pk}
+
+
+def fresh_todos(fixture, i):
+    from apps.todos.models import Todo
+    todos = Todo.objects.bulk_create(Todo(user=fixture.user, title=f'Doomed {i}.{n}') for n in range(5))
+    return {'ids': [todo.pk for todo in todos]}
+
+
+def fresh_interview(fixture, i):
+    from django.utils import timezone
+    from apps.interviews.models import Interview
+    interview = Interview.objects.create(user=fixture.user, company_name='Doomed', role='SRE',
+                                         scheduled_at=timezone.now())
+    return {'pk': interview.pk}
+
+
+def fresh_refresh_token(fixture, i):
+    from apps.accounts.tokens import RefreshToken
+    return {'refresh': str(RefreshToken.for_user(fixture.user))}
+
+
+def alternate_password(fixture, i):
+    # Each request flips the second user's password; `serial` keeps them in order
+    old, new = fixture.password, (NEW_PASSWORD if fixture.password == PASSWORD else PASSWORD)
+    fixture.password = new
+    return {'old_password': old, 'new_password': new}
+
+
+def import_file(values):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    lines = ''.join(json.dumps({'title': f'Imported {values["i"]}.{n}'}) + '\n' for n in range(20))
+    return {'resource': 'todos', 'file': SimpleUploadedFile('todos.ndjson', lines.encode())}
+
+
+ROUTES = [
+    # Accounts
+    Route('auth-register', 'POST', '/api/auth/register/', anonymous=True, status=201, body={
+        'username': 'new-{run}-{i}', 'email': 'new-{run}-{i}@example.com',
+        'password': PASSWORD, 'password2': PASSWORD,
+    }),
+    Route('auth-login',      'POST',  '/api/auth/login/', anonymous=True,
+          body={'email': '{email}', 'password': PASSWORD}),
+    Route('auth-logout',     'POST',  '/api/auth/logout/', body={'refresh': '{refresh}'},
+          prepare=fresh_refresh_token),
+    Route('token-refresh',   'POST',  '/api/auth/token/refresh/', anonymous=True, body={'refresh': '{refresh}'},
+          prepare=fresh_refresh_token),
+    Route('auth-profile',    'GET',   '/api/auth/me/'),
+    Route('auth-profile',    'PATCH', '/api/auth/me/', body={'bio': 'Benchmark {i}'}),
+    Route('change-password', 'POST',  '/api/auth/change-password/', anonymous=True, serial=True,
+          headers={'Authorization': 'Bearer {other_token}'}, prepare=alternate_password,
+          body={'old_password': '{old_password}', 'new_password': '{new_password}'}),
+
+    # Journal
+    Route('api-root',              'GET',    '/api/journal/'),
+    Route('journal-list',          'GET',    '/api/journal/entries/'),
+    Route('journal-list',          'POST',   '/api/journal/entries/', status=201, body={
+        'title': 'Benchmark {i}', 'content': 'focus plan ship review', 'mood': 'good', 'tags': ['bench'],
+    }),
+    Route('journal-detail',        'GET',    '/api/journal/entries/{entry}/'),
+    Route('journal-detail',        'PATCH',  '/api/journal/entries/{entry}/', body={'mood': 'great'}),
+    Route('journal-detail',        'DELETE', '/api/journal/entries/{pk}/', status=204, prepare=fresh_entry),
+    Route('journal-mood-summary',  'GET',    '/api/journal/entries/moods/'),
+    Route('journal-search',        'GET',    '/api/journal/entries/search/?q=focus'),
+    Route('journal-writing-stats', 'GET',    '/api/journal/entries/writing-stats/'),
+
+    # Todos
+    Route('todos-list',          'GET',    '/api/todos/'),
+    Route('todos-list',          'POST',   '/api/todos/', status=201, body={'title': 'Benchmark {i}'}),
+    Route('todos-detail',        'GET',    '/api/todos/{todo}/'),
+    Route('todos-detail',        'PATCH',  '/api/todos/{todo}/', body={'priority': 'high'}),
+    Route('todos-detail',        'DELETE', '/api/todos/{pk}/', status=204, prepare=fresh_todo),
+    Route('todos-toggle-status', 'PATCH',  '/api/todos/{todo}/toggle_status/'),
+    Route('todos-bulk',          'POST',   '/api/todos/bulk/', status=201,
+          body=lambda values: [{'title': f'Bulk {values["i"]}.{n}'} for n in range(5)]),
+    Route('todos-bulk',          'PATCH',  '/api/todos/bulk/',
+          body=lambda values: [{'id': pk, 'priority': 'low'} for pk in values['todos']]),
+    Route('todos-bulk-delete',   'POST',   '/api/todos/bulk-delete/', prepare=fresh_todos,
+          body=lambda values: {'ids': values['ids']}),
+    Route('todos-bulk-status',   'POST',   '/api/todos/bulk-status/',
+          body=lambda values: {'ids': values['todos'], 'status': ('done', 'pending')[values['i'] % 2]}),
+    Route('todos-overdue',       'GET',    '/api/todos/overdue/'),
+    Route('todos-summary',       'GET',    '/api/todos/summary/'),
+
+    # Interviews
+    Route('interviews-list',         'GET',    '/api/interviews/'),
+    Route('interviews-list',         'POST',   '/api/interviews/', status=201, body={
+        'company_name': 'Benchmark {i}', 'role': 'SRE', 'scheduled_at': '2030-01-01T10:00:00Z',
+    }),
+    Route('interviews-detail',       'GET',    '/api/interviews/{interview}/'),
+    Route('interviews-detail',       'PATCH',  '/api/interviews/{interview}/', body={'prep_notes': 'Benchmark {i}'}),
+    Route('interviews-detail',       'DELETE', '/api/interviews/{pk}/', status=204, prepare=fresh_interview),
+    Route('interviews-add-feedback', 'PATCH',  '/api/interviews/{interview}/add-feedback/',
+          body={'feedback': 'Benchmark {i}', 'result': 'on_hold'}),
+    Route('interviews-upcoming',     'GET',    '/api/interviews/upcoming/'),
+    Route('interviews-by-company',   'GET',    '/api/interviews/by-company/'),
+    Route('interviews-search',       'GET',    '/api/interviews/search/?q=goo'),
+    Route('interviews-companies',    'GET',    '/api/interviews/companies/?q=g'),
+    Route('interviews-summary',      'GET',    '/api/interviews/summary/'),
+
+    # Async reads
+    Route('async-journal-list',       'GET', '/api/async/journal/entries/'),
+    Route('async-todo-list',          'GET', '/api/async/todos/'),
+    Route('async-todo-overdue',       'GET', '/api/async/todos/overdue/'),
+    Route('async-interview-upcoming', 'GET', '/api/async/interviews/upcoming/'),
+    Route('async-interview-summary',  'GET', '/api/async/interviews/summary/'),
+
+    # Export / sync / import / notifications / monitoring
+    Route('export-ndjson',     'GET',  '/api/export/ndjson/'),
+    Route('export-csv',        'GET',  '/api/export/csv/todos/'),
+    Route('sync',              'GET',  '/api/sync/'),
+    Route('import-list',       'GET',  '/api/import/'),
+    Route('import-list',       'POST', '/api/import/', status=202, multipart=True, body=import_file),
+    Route('import-detail',     'GET',  '/api/import/{import}/'),
+    Route('notification-list', 'GET',  '/api/notifications/'),
+    Route('notification-read', 'POST', '/api/notifications/read/',
+          body=lambda values: {'ids': values['notifications']}),
+    Route('metrics',           'GET',  '/api/metrics/', anonymous=True,
+          headers={'Authorization': f'Bearer {METRICS_TOKEN}'}),
+
+    # API docs
+    Route('schema',     'GET', '/api/schema/',      anonymous=True, serial=True),  # generator is not thread-safe
+    Route('swagger-ui', 'GET', '/api/docs/',        anonymous=True),
+    Route('redoc',      'GET', '/api/docs/redoc/',  anonymous=True),
+]
+
+
+def uncovered_names():
+    """URL names in `lifeos/urls.py` that no route in `ROUTES` exercises."""
+    from django.urls import URLResolver, get_resolver
+
+    def names(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace != 'admin':
+                    yield from names(pattern.url_patterns)
+            elif pattern.name:
+                yield pattern.name
+
+    return sorted(set(names(get_resolver().url_patterns)) - EXCLUDED_NAMES - {route.name for route in ROUTES})
+
+
+class Fixture:
+    """
+    The seeded user the benchmark acts as, and the ids its routes refer to.
+
+    A second user only serves `change-password`, so the first one's
+    password never changes under `auth-login`.
+    """
+
+    def __init__(self, user, other):
+        from django.utils import timezone
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.core.models import ImportJob, Notification
+
+        job           = ImportJob.objects.create(user=user, resource='todos', file_format='ndjson', status='done')
+        todos         = list(user.todos.order_by('pk').values_list('pk', flat=True)[:5])
+        notifications = Notification.objects.bulk_create(
+            Notification(user=user, kind='todo_due', object_id=pk, title='Benchmark', due_at=timezone.now())
+            for pk in user.todos.order_by('pk').values_list('pk', flat=True)[:50]
+        )
+
+        self.user     = user
+        self.token    = str(AccessToken.for_user(user))
+        self.password = PASSWORD
+        self.values   = {
+            'run':         uuid.uuid4().hex[:8],
+            'email':       user.email,
+            'other_token': str(AccessToken.for_user(other)),
+            'entry':     user.journal_entries.order_by('pk').values_list('pk', flat=True)[0],
+            'todo':      todos[0],
+            'todos':     todos,
+            'interview': user.interviews.order_by('pk').values_list('pk', flat=True)[0],
+            'import':    job.pk,
+            'notifications': [notification.pk for notification in notifications[:5]],
+        }
+
+
+# -- transports --------------------------------------------------------------
+
+class InProcessClient:
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def send(self, method, path, headers, body, content_type):
+        response = self.client.generic(method, path, body, content_type or 'application/octet-stream',
+                                       headers=headers)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response.status_code, response.get('Server-Timing', '')
+
+    def close(self):
+        from django.db import connections
+        from django.db.backends.base.base import BaseDatabaseWrapper
+        for connection in connections.all(initialized_only=True):
+            # Django never closes in-memory SQLite connections; left to the garbage
+            # collector, one may be closed from inside another thread's SQL function
+            # call, which deadlocks on SQLite's shared-cache lock. The main thread's
+            # connection keeps the test database alive.
+            BaseDatabaseWrapper.close(connection)
+
+
+class HTTPClient:
+    def __init__(self, port):
+        self.connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+
+    def send(self, method, path, headers, body, content_type):
+        if content_type:
+            headers = dict(headers, **{'Content-Type': content_type})
+        self.connection.request(method, path, body=body or None, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+        return response.status, response.getheader('Server-Timing', '')
+
+    def close(self):
+        self.connection.close()
+
+
+def measure(route, fixture, make_client, requests, clients, warmup):
+    """Send `requests` timed requests for `route` from `clients` threads; return its result dict."""
+    def run(indices):
+        # Every client thread owns its client (and, in-process, its DB connections)
+        indices, lock, samples, errors = iter(indices), threading.Lock(), [], []
+
+        def client_thread():
+            client = make_client()
+            try:
+                while True:
+                    with lock:
+                        i = next(indices, None)
+                    if i is None:
+                        return
+                    request = route.build(fixture, i)
+                    start   = time.perf_counter()
+                    status, timing = client.send(route.method, *request)
+                    latency = (time.perf_counter() - start) * 1000
+                    match   = QUERIES_RE.search(timing)
+                    samples.append((latency, status, int(match.group(1)) if match else None))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                client.close()
+
+        threads = [threading.Thread(target=client_thread) for _ in range(clients)]
+        start   = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return time.perf_counter() - start, samples
+
+    run(range(warmup))
+    elapsed, samples = run(range(warmup, warmup + requests))
+
+    latencies = sorted(latency for latency, _, _ in samples)
+    queries   = [count for _, _, count in samples if count is not None]
+    cuts      = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        'p50':     round(cuts[49], 2),
+        'p95':     round(cuts[94], 2),
+        'p99':     round(cuts[98], 2),
+        'rps':     round(len(samples) / elapsed, 1),
+        'queries': round(statistics.median(queries), 1) if queries else None,
+        'errors':  sum(1 for _, status, _ in samples if status != route.status),
+    }
+
+
+def compare(result, baseline, args):
+    """Return the reasons `result` regressed against `baseline` (empty if it did not)."""
+    reasons = []
+    if result['errors']:
+        reasons.append(f"{result['errors']} unexpected responses")
+    if baseline is None:
+        return reasons
+    if result['queries'] is not None and baseline['queries'] is not None and result['queries'] > baseline['queries']:
+        reasons.append(f"queries {baseline['queries']:g} -> {result['queries']:g}")
+    if not args.queries_only:
+        before, after = baseline[args.percentile], result[args.percentile]
+        if after > before * (1 + args.threshold) and after - before > args.min_delta:
+            reasons.append(f'{args.percentile} {before:.1f} -> {after:.1f} ms')
+    return reasons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users',        type=int, default=10,    help='users to seed')
+    parser.add_argument('--rows',         type=int, default=200,   help='journal entries, todos and interviews per user')
+    parser.add_argument('--requests',     type=int, default=20,    help='timed requests per route')
+    parser.add_argument('--warmup',       type=int, default=2,     help='untimed requests per route')
+    parser.add_argument('--concurrency',  type=int, default=1,     help='concurrent clients per route')
+    parser.add_argument('--server',       choices=['none', 'wsgi', 'asgi'], default='none',
+                        help='in-process test client, or HTTP to a threaded WSGI / uvicorn server')
+    parser.add_argument('--only',         default='',              help='run routes whose name contains this')
+    parser.add_argument('--baseline',     default=BASELINE,        help='baseline JSON file')
+    parser.add_argument('--save',         action='store_true',     help='write the results as the new baseline')
+    parser.add_argument('--percentile',   choices=['p50', 'p95', 'p99'], default='p50',
+                        help='latency compared with the baseline')
+    parser.add_argument('--threshold',    type=float, default=0.25, help='allowed latency growth (0.25 = 25%%)')
+    parser.add_argument('--min-delta',    type=float, default=2.0, help='ignore latency growth below this many ms')
+    parser.add_argument('--queries-only', action='store_true',     help='compare query counts and statuses only')
+    args = parser.parse_args(argv)
+    if args.users < 2 or args.rows < 5:
+        parser.error('need at least 2 users and 5 rows')
+
+    setup()
+    from django.db import connections
+    from django.test.utils import override_settings
+    from drf_spectacular.drainage import GENERATOR_STATS
+    from benchmarks.async_reads import serve_asgi, serve_wsgi
+    from benchmarks.seed import seed
+
+    routes = [route for route in ROUTES if args.only in route.name]
+    config = {'users': args.users, 'rows': args.rows, 'server': args.server, 'concurrency': args.concurrency}
+    missing = uncovered_names()
+    if missing:
+        print(f"Not benchmarked: {', '.join(missing)}", file=sys.stderr)
+
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            recorded = json.load(f)
+        if recorded['config'] != config:
+            parser.error(f"baseline was recorded with {recorded['config']}, not {config}")
+        baseline = recorded['routes']
+
+    media_root = tempfile.mkdtemp(prefix='lifeos-bench-')
+    # SQLite fails concurrent writes ("database is locked") instead of queueing them
+    serial_writes = connections['default'].vendor == 'sqlite'
+    # GENERATOR_STATS: the schema route would print its generator warnings on every request
+    with test_database(), override_settings(METRICS_TOKEN=METRICS_TOKEN, MEDIA_ROOT=media_root), \
+            GENERATOR_STATS.silence():
+        users   = seed(users=args.users, entries=args.rows, todos=args.rows, interviews=args.rows)
+        fixture = Fixture(users[0], users[1])
+
+        stop = None
+        if args.server == 'wsgi':
+            port, stop = serve_wsgi(max(args.concurrency, 4))
+        elif args.server == 'asgi':
+            port, stop = serve_asgi()
+        make_client = InProcessClient if stop is None else lambda: HTTPClient(port)
+
+        print(f"{args.users} users x {args.rows} rows, {args.requests} requests per route, "
+              f"{args.concurrency} clients, server: {args.server}")
+        print(f"{'route':<38}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'req/s':>7}  {'queries':>7}  vs baseline")
+        results, failures = {}, {}
+        try:
+            for route in routes:
+                clients = 1 if route.serial or (serial_writes and route.method != 'GET') else args.concurrency
+                result  = measure(route, fixture, make_client, args.requests, clients, args.warmup)
+                reasons = compare(result, baseline.get(route.key), args)
+                results[route.key] = result
+                if reasons:
+                    failures[route.key] = reasons
+                queries = '-' if result['queries'] is None else f"{result['queries']:g}"
+                verdict = '; '.join(reasons) or ('ok' if route.key in baseline else 'new')
+                print(f"{route.key:<38}  {result['p50']:>8.1f}  {result['p95']:>8.1f}  {result['p99']:>8.1f}  "
+                      f"{result['rps']:>7.1f}  {queries:>7}  {verdict}")
+        finally:
+            if stop is not None:
+                stop()
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({'config': config, 'routes': results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+        return 1 if any(result['errors'] for result in results.values()) else 0
+
+    if failures:
+        print(f'\n{len(failures)} of {len(results)} routes regressed:', file=sys.stderr)
+        for key, reasons in failures.items():
+            print(f"  {key}: {'; '.join(reasons)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
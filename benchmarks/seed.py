@@ -0,0 +1,100 @@
+"""Bulk seeding helpers shared by the benchmarks."""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+BATCH_SIZE = 5000
+
+WORDS = (
+    'today focus meeting interview coffee code review plan write read walk '
+    'sleep learn ship debug design call family gym idea goal progress'
+).split()
+
+
+def seed_users(count, password='Bench@1234'):
+    User    = get_user_model()
+    encoded = make_password(password)  # hash once, share across rows
+    users   = [
+        User(username=f'bench{i}', email=f'bench{i}@example.com', password=encoded)
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+    return list(User.objects.filter(email__startswith='bench').order_by('id'))
+
+
+def _batched(model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed_journal(users, per_user, rng):
+    from apps.journal.models import JournalEntry
+
+    moods = [choice for choice, _ in JournalEntry.MOOD_CHOICES]
+    today = date.today()
+    _batched(JournalEntry, (
+        JournalEntry(
+            user=user,
+            title=f'Entry {i}',
+            content=' '.join(rng.choices(WORDS, k=rng.randint(20, 200))),
+            mood=rng.choice(moods),
+            tags=rng.sample(WORDS, 2),
+            date=today - timedelta(days=rng.randint(0, 3650)),
+        )
+        for user in users for i in range(per_user)
+    ))
+
+
+def seed_todos(users, per_user, rng):
+    from apps.todos.models import Todo
+
+    statuses   = [choice for choice, _ in Todo.STATUS_CHOICES]
+    priorities = [choice for choice, _ in Todo.PRIORITY_CHOICES]
+    today      = date.today()
+    _batched(Todo, (
+        Todo(
+            user=user,
+            title=f'Todo {i}',
+            status=rng.choice(statuses),
+            priority=rng.choice(priorities),
+            due_date=None if rng.random() < 0.2 else today + timedelta(days=rng.randint(-365, 365)),
+        )
+        for user in users for i in range(per_user)
+    ))
+
+
+def seed_interviews(users, per_user, rng):
+    from apps.interviews.models import Interview
+
+    statuses  = [choice for choice, _ in Interview.STATUS_CHOICES]
+    companies = ['Google', 'Acme', 'Initech', 'Globex', 'Umbrella', 'Hooli', 'Stark', 'Wayne']
+    now       = timezone.now()
+    _batched(Interview, (
+        Interview(
+            user=user,
+            company_name=rng.choice(companies),
+            role=rng.choice(['Backend Engineer', 'Frontend Engineer', 'SRE', 'Data Engineer']),
+            scheduled_at=now + timedelta(hours=rng.randint(-24 * 365, 24 * 60)),
+            status=rng.choice(statuses),
+        )
+        for user in users for i in range(per_user)
+    ))
+
+
+def seed(users=10, entries=100, todos=100, interviews=50, seed=0):
+    """Create `users` users, each with the given number of rows per table."""
+    rng   = random.Random(seed)
+    users = seed_users(users)
+    seed_journal(users, entries, rng)
+    seed_todos(users, todos, rng)
+    seed_interviews(users, interviews, rng)
+    return users
@@ -0,0 +1,99 @@
+"""
+Refresh-token rotation latency as the blacklist history grows.
+
+    python -m benchmarks.token_refresh --history 0,100000,1000000
+
+For each history size the token tables are topped up with that many
+rotated (outstanding + blacklisted) tokens, then `--refreshes` rotations
+are timed with simplejwt's stock serializer and with the cached one from
+`apps.accounts.tokens` (on a local-memory cache). Flat columns mean the
+refresh cost does not depend on how many tokens were ever rotated.
+Finally the expired half of the history is pruned.
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from benchmarks import setup, test_database
+
+BATCH_SIZE = 5000
+
+
+def seed_history(user, count):
+    """`count` rotated tokens; every other one already expired."""
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    now = timezone.now()
+    for start in range(0, count, BATCH_SIZE):
+        tokens = OutstandingToken.objects.bulk_create([
+            OutstandingToken(
+                user=user,
+                jti=uuid.uuid4().hex,
+                token='',
+                created_at=now,
+                expires_at=now + timedelta(days=-1 if i % 2 else 7),
+            )
+            for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens])
+
+
+def time_refreshes(serializer_class, user, count):
+    """Chain `count` rotations; return per-refresh latencies in ms."""
+    token   = str(serializer_class.token_class.for_user(user))
+    timings = []
+    for _ in range(count):
+        start      = time.perf_counter()
+        serializer = serializer_class(data={'refresh': token})
+        serializer.is_valid(raise_exception=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        token = serializer.validated_data['refresh']
+    return timings
+
+
+def percentile(values, pct):
+    return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else values[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history',   default='0,10000,100000', help='comma-separated history sizes')
+    parser.add_argument('--refreshes', type=int, default=300,    help='rotations timed per size')
+    args = parser.parse_args(argv)
+
+    setup()
+    from django.db import connection
+    from django.test.utils import override_settings
+    from rest_framework_simplejwt.serializers import TokenRefreshSerializer as StockSerializer
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+    from apps.accounts.tokens import TokenRefreshSerializer, prune_expired
+    from benchmarks.seed import seed_users
+
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    with test_database(), override_settings(CACHES=locmem):
+        user = seed_users(1)[0]
+        print(f'Token refresh on {connection.vendor}, {args.refreshes} rotations per row (ms)')
+        print(f"{'history':>10}  {'stock p50':>9}  {'stock p95':>9}  {'cached p50':>10}  {'cached p95':>10}")
+
+        seeded = 0
+        for size in (int(value) for value in args.history.split(',')):
+            seed_history(user, size - seeded)
+            seeded = max(size, seeded)
+            row = [f'{OutstandingToken.objects.count():>10}']
+            for serializer_class in (StockSerializer, TokenRefreshSerializer):
+                timings = time_refreshes(serializer_class, user, args.refreshes)
+                width   = 9 if serializer_class is StockSerializer else 10
+                row    += [f'{percentile(timings, 50):>{width}.2f}', f'{percentile(timings, 95):>{width}.2f}']
+            print('  '.join(row))
+
+        start   = time.perf_counter()
+        deleted = prune_expired()
+        print(f'\nPruned {deleted} expired tokens in {time.perf_counter() - start:.2f}s; '
+              f'{OutstandingToken.objects.count()} remain.')
+
+
+if __name__ == '__main__':
+    main()
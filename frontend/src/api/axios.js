@@ -33,4 +33,17 @@ api.interceptors.response.use(
   }
 )
 
-export default api
\ No newline at end of file
+export default api
+// Paginated lists return `{ next, results }`; `next` is a URL carrying the cursor
+export const cursorOf = (next) => next ? new URL(next, window.location.origin).searchParams.get('cursor') : null
+
+export const fetchAll = async (request, params) => {
+  const results = []
+  let cursor    = null
+  do {
+    const res = await request({ ...params, ...(cursor && { cursor }) })
+    results.push(...res.data.results)
+    cursor = cursorOf(res.data.next)
+  } while (cursor)
+  return results
+}
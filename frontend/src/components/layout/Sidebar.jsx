@@ -94,7 +94,7 @@ export default function Sidebar() {
         >
           <div style={{ width:'36px', height:'36px', borderRadius:'10px', background:'linear-gradient(135deg, var(--logo-life), var(--logo-os))', display:'flex', alignItems:'center', justifyContent:'center', fontSize:'13px', fontWeight:600, color:'white', flexShrink:0, overflow:'hidden' }}>
             {user?.avatar
-              ? <img src={user.avatar} alt="avatar" style={{ width:'100%', height:'100%', objectFit:'cover' }} />
+              ? <img src={user.avatar_urls?.['128']?.webp || user.avatar} alt="avatar" style={{ width:'100%', height:'100%', objectFit:'cover' }} />
               : initials
             }
           </div>
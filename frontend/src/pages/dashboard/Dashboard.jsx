@@ -1,7 +1,8 @@
 import { useState, useEffect, useRef } from 'react'
 import { useAuth } from '../../context/AuthContext'
-import { getEntries } from '../../api/journal'
-import { getTodos, toggleStatus } from '../../api/todos'
+import { fetchAll } from '../../api/axios'
+import { getEntries, getMoodSummary } from '../../api/journal'
+import { getTodos, getTodoSummary, toggleStatus } from '../../api/todos'
 import { getUpcoming, getSummary } from '../../api/interviews'
 import { useNavigate } from 'react-router-dom'
 import toast from 'react-hot-toast'
@@ -129,14 +130,20 @@ export default function Dashboard() {
   const [upcoming,   setUpcoming]   = useState([])
   const [intSummary, setIntSummary] = useState({})
   const [allEntries, setAllEntries] = useState([])
+  const [counts,     setCounts]     = useState({ journal:0, todos:{} })
   const [loading,    setLoading]    = useState(true)
 
   useEffect(() => {
-    Promise.all([getEntries(), getTodos(), getUpcoming(), getSummary()])
-      .then(([e, t, u, ss]) => {
-        setAllEntries(e.data)
-        setEntries(e.data.slice(0, 5))
-        setTodos(t.data.slice(0, 8))
+    // Counts come from the summary endpoints; the calendar needs every page of entries
+    Promise.all([fetchAll(getEntries), getTodos(), getUpcoming(), getSummary(), getMoodSummary(), getTodoSummary()])
+      .then(([e, t, u, ss, ms, ts]) => {
+        setAllEntries(e)
+        setEntries(e.slice(0, 5))
+        setCounts({
+          journal: ms.data.reduce((total, m) => total + m.count, 0),
+          todos:   Object.fromEntries(ts.data.map(({ status, count }) => [status, count])),
+        })
+        setTodos(t.data.results.slice(0, 8))
         setUpcoming(u.data.slice(0, 8))
         setIntSummary(ss.data)
       })
@@ -146,8 +153,10 @@ export default function Dashboard() {
 
   const handleToggle = async (id) => {
     try {
-      const res = await toggleStatus(id)
+      const res  = await toggleStatus(id)
+      const prev = todos.find(t => t.id === id).status
       setTodos(todos.map(t => t.id === id ? { ...t, status: res.data.status } : t))
+      setCounts(c => ({ ...c, todos: { ...c.todos, [prev]: (c.todos[prev] || 0) - 1, [res.data.status]: (c.todos[res.data.status] || 0) + 1 } }))
     } catch { toast.error('Failed to update') }
   }
 
@@ -159,8 +168,8 @@ export default function Dashboard() {
 
   if (loading) return <div style={{ display:'flex', alignItems:'center', justifyContent:'center', height:'60vh', color:'var(--muted)', fontSize:'14px' }}>Loading...</div>
 
-  const pendingCount   = todos.filter(t => t.status !== 'done').length
-  const completedCount = todos.filter(t => t.status === 'done').length
+  const pendingCount   = (counts.todos.pending || 0) + (counts.todos.in_progress || 0)
+  const completedCount = counts.todos.done || 0
   const overdueCount   = todos.filter(t => t.is_overdue).length
 
   return (
@@ -187,7 +196,7 @@ export default function Dashboard() {
 
         {/* Stat Cards row — full width under greeting */}
         <div style={{ display:'grid', gridTemplateColumns:'repeat(4,1fr)', gap:'10px' }}>
-          <StatCard label="Journal"    value={allEntries.length}      sub="entries"      topColor="linear-gradient(90deg,#fb923c,#fdba74)" onClick={() => navigate('/journal')} />
+          <StatCard label="Journal"    value={counts.journal}        sub="entries"      topColor="linear-gradient(90deg,#fb923c,#fdba74)" onClick={() => navigate('/journal')} />
           <StatCard label="Completed"  value={completedCount}         sub="tasks done"   subColor="var(--green)"  topColor="linear-gradient(90deg,#4ade80,#86efac)" onClick={() => navigate('/todos')} />
           <StatCard label="Pending"    value={pendingCount}           sub={overdueCount > 0 ? `${overdueCount} overdue` : 'on track'} subColor={overdueCount > 0 ? 'var(--red)' : 'var(--muted)'} topColor="linear-gradient(90deg,#fbbf24,#fde68a)" onClick={() => navigate('/todos')} />
           <StatCard label="Interviews" value={intSummary.total || 0}  sub={`${intSummary.selected||0} selected`} subColor="var(--green)" topColor="linear-gradient(90deg,#7dd3fc,#bae6fd)" onClick={() => navigate('/interviews')} />
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import { getInterviews, createInterview, updateInterview, deleteInterview, addFeedback } from '../../api/interviews'
+import { cursorOf } from '../../api/axios'
 import toast from 'react-hot-toast'
 
 const getDefaultDateTime = () => {
@@ -19,6 +20,7 @@ const RESULT_OPTIONS = ['waiting','selected','rejected','on_hold']
 
 export default function Interviews() {
   const [interviews, setInterviews] = useState([])
+  const [next,       setNext]       = useState(null)
   const [loading,    setLoading]    = useState(true)
   const [showForm,   setShowForm]   = useState(false)
   const [form,       setForm]       = useState(emptyForm)
@@ -26,11 +28,13 @@ export default function Interviews() {
   const [filter,     setFilter]     = useState('')
   const [feedback,   setFeedback]   = useState({ id:null, text:'', result:'waiting' })
 
-  const load = async () => {
+  // Without a cursor, reload from the first page; with one, append the next page
+  const load = async (cursor) => {
     try {
       const params = filter ? { status: filter } : {}
-      const res = await getInterviews(params)
-      setInterviews(res.data)
+      const res = await getInterviews(cursor ? { ...params, cursor } : params)
+      setInterviews(prev => cursor ? [...prev, ...res.data.results] : res.data.results)
+      setNext(res.data.next)
     } catch { toast.error('Failed to load interviews') }
     finally { setLoading(false) }
   }
@@ -98,7 +102,7 @@ export default function Interviews() {
       <div style={{ display:'flex', alignItems:'center', justifyContent:'space-between', marginBottom:'28px', paddingBottom:'22px', borderBottom:'1px solid var(--border)' }}>
         <div>
           <div style={{ fontFamily:'Instrument Serif, serif', fontSize:'28px', letterSpacing:'-0.5px' }}>Interviews</div>
-          <div style={{ fontSize:'13px', color:'var(--muted)', marginTop:'2px' }}>{interviews.length} tracked</div>
+          <div style={{ fontSize:'13px', color:'var(--muted)', marginTop:'2px' }}>{interviews.length}{next && '+'} tracked</div>
         </div>
         <button onClick={() => { setShowForm(true); setEditing(null); setForm(emptyForm) }} style={{ padding:'8px 18px', borderRadius:'8px', border:'none', background:'var(--accent)', color:'#0a0a0f', fontSize:'13px', fontWeight:600, cursor:'pointer', fontFamily:'DM Sans, sans-serif' }}>+ Add Interview</button>
       </div>
@@ -198,6 +202,7 @@ export default function Interviews() {
               {i.feedback   && <div style={{ fontSize:'12px', color:'var(--muted)', padding:'10px 12px', background: resultBg[i.result] || 'var(--green-bg)', borderRadius:'8px', marginTop:'8px' }}>💬 {i.feedback}</div>}
             </div>
           ))}
+          {next && <button onClick={() => load(cursorOf(next))} style={{ padding:'9px 20px', borderRadius:'8px', border:'1px solid var(--border2)', background:'var(--surface)', color:'var(--muted)', fontSize:'13px', cursor:'pointer', fontFamily:'DM Sans, sans-serif' }}>Load more</button>}
         </div>
       )}
     </div>
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { getEntries, createEntry, updateEntry, deleteEntry } from '../../api/journal'
+import { cursorOf } from '../../api/axios'
 import toast from 'react-hot-toast'
 
 const MOODS = ['great','good','neutral','bad','terrible']
@@ -12,17 +13,20 @@ export default function Journal() {
   const navigate = useNavigate()
 
   const [entries, setEntries] = useState([])
+  const [next,    setNext]    = useState(null)
   const [loading, setLoading] = useState(true)
   const [showForm, setShowForm] = useState(false)
   const [form, setForm]         = useState(emptyForm)
   const [editing, setEditing]   = useState(null)
   const [filter, setFilter]     = useState('')
 
-  const load = async () => {
+  // Without a cursor, reload from the first page; with one, append the next page
+  const load = async (cursor) => {
     try {
       const params = filter ? { mood: filter } : {}
-      const res = await getEntries(params)
-      setEntries(res.data)
+      const res = await getEntries(cursor ? { ...params, cursor } : params)
+      setEntries(prev => cursor ? [...prev, ...res.data.results] : res.data.results)
+      setNext(res.data.next)
     } catch { toast.error('Failed to load entries') }
     finally { setLoading(false) }
   }
@@ -63,7 +67,7 @@ export default function Journal() {
       <div style={{ display:'flex', alignItems:'center', justifyContent:'space-between', marginBottom:'28px', paddingBottom:'22px', borderBottom:'1px solid var(--border)' }}>
         <div>
           <div style={{ fontFamily:'Instrument Serif, serif', fontSize:'28px', letterSpacing:'-0.5px' }}>Journal</div>
-          <div style={{ fontSize:'13px', color:'var(--muted)', marginTop:'2px' }}>{entries.length} entries</div>
+          <div style={{ fontSize:'13px', color:'var(--muted)', marginTop:'2px' }}>{entries.length}{next && '+'} entries</div>
         </div>
         <button onClick={() => { setShowForm(true); setEditing(null); setForm(emptyForm) }} style={{ padding:'8px 18px', borderRadius:'8px', border:'none', background:'var(--accent)', color:'#0a0a0f', fontSize:'13px', fontWeight:600, cursor:'pointer', fontFamily:'DM Sans, sans-serif' }}>+ New Entry</button>
       </div>
@@ -147,6 +151,7 @@ export default function Journal() {
               )}
             </div>
           ))}
+          {next && <button onClick={() => load(cursorOf(next))} style={{ padding:'9px 20px', borderRadius:'8px', border:'1px solid var(--border2)', background:'var(--surface)', color:'var(--muted)', fontSize:'13px', cursor:'pointer', fontFamily:'DM Sans, sans-serif' }}>Load more</button>}
         </div>
       )}
     </div>
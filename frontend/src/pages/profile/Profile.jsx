@@ -114,7 +114,7 @@ export default function Profile() {
             fontSize: '24px', fontWeight: 600, color: 'white', overflow: 'hidden'
           }}>
             {user?.avatar
-              ? <img src={user.avatar} alt="avatar" style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
+              ? <img src={user.avatar_urls?.['256']?.webp || user.avatar} alt="avatar" style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
               : user?.first_name?.slice(0, 2).toUpperCase() || 'U'
             }
           </div>
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import { getTodos, createTodo, updateTodo, deleteTodo, toggleStatus } from '../../api/todos'
+import { cursorOf } from '../../api/axios'
 import toast from 'react-hot-toast'
 
 const PRIORITIES = ['low','medium','high']
@@ -7,17 +8,20 @@ const emptyForm  = { title:'', description:'', priority:'medium', category:'', d
 
 export default function Todos() {
   const [todos,    setTodos]    = useState([])
+  const [next,     setNext]     = useState(null)
   const [loading,  setLoading]  = useState(true)
   const [showForm, setShowForm] = useState(false)
   const [form,     setForm]     = useState(emptyForm)
   const [editing,  setEditing]  = useState(null)
   const [filter,   setFilter]   = useState('')
 
-  const load = async () => {
+  // Without a cursor, reload from the first page; with one, append the next page
+  const load = async (cursor) => {
     try {
       const params = filter ? { status: filter } : {}
-      const res = await getTodos(params)
-      setTodos(res.data)
+      const res = await getTodos(cursor ? { ...params, cursor } : params)
+      setTodos(prev => cursor ? [...prev, ...res.data.results] : res.data.results)
+      setNext(res.data.next)
     } catch { toast.error('Failed to load todos') }
     finally { setLoading(false) }
   }
@@ -131,6 +135,7 @@ export default function Todos() {
               </div>
             </div>
           ))}
+          {next && <button onClick={() => load(cursorOf(next))} style={{ padding:'9px 20px', borderRadius:'8px', border:'1px solid var(--border2)', background:'var(--surface)', color:'var(--muted)', fontSize:'13px', cursor:'pointer', fontFamily:'DM Sans, sans-serif' }}>Load more</button>}
         </div>
       )}
     </div>
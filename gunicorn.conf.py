@@ -0,0 +1,30 @@
+"""
+gunicorn settings for production:
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/lifeos-metrics gunicorn lifeos.wsgi -c gunicorn.conf.py
+
+With `PROMETHEUS_MULTIPROC_DIR` set, each worker records its metrics in
+that directory and `/api/metrics/` reports the sum over all workers (see
+`apps/core/metrics.py`).
+"""
+import glob
+import os
+
+from prometheus_client import multiprocess
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 3))
+bind    = os.environ.get('BIND', '0.0.0.0:8000')
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to the new totals
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for stale in glob.glob(os.path.join(path, '*.db')):
+            os.remove(stale)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(worker.pid)
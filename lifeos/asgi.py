@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lifeos.settings.dev')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# /api/events/ (server-sent events) is served in front of Django; see apps.core.events
+from apps.core.events import EventStreamApp  # noqa: E402
+
+application = EventStreamApp(django_application)
@@ -15,6 +15,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party
     'rest_framework',
@@ -25,6 +26,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
 
     # Our apps
+    'apps.core',
     'apps.accounts',
     'apps.journal',
     'apps.todos',
@@ -41,6 +43,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.metrics.RequestMetricsMiddleware',
+    'apps.core.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -55,7 +59,7 @@ MIDDLEWARE = [
 # DRF settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -70,6 +74,7 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.tokens.TokenRefreshSerializer',
 }
 
 AUTHENTICATION_BACKENDS = [
@@ -101,6 +106,18 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'lifeos.wsgi.application'
 
+PASSWORD_HASHERS = [
+    'apps.accounts.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Stored hashes with another count are upgraded on the next login
+PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 600000))
+# Concurrent hashes (CPU-bound); 0 hashes on the request thread
+PASSWORD_HASHING_THREADS = int(os.environ.get('PASSWORD_HASHING_THREADS', os.cpu_count() or 1))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -121,7 +138,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # API Documentation
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -142,12 +159,15 @@ TEST_RUNNER = 'django.test.runner.DiscoverRunner'
 #GOOGLE AUTH
 SITE_ID = 1
 
+GOOGLE_CLIENT_ID        = os.environ.get('GOOGLE_CLIENT_ID', '')
+GOOGLE_OAUTH2_CERTS_URL = os.environ.get('GOOGLE_OAUTH2_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+
 SOCIALACCOUNT_PROVIDERS = {
     'google': {
         'SCOPE': ['profile', 'email'],
         'AUTH_PARAMS': {'access_type': 'online'},
         'APP': {
-            'client_id': os.environ.get('GOOGLE_CLIENT_ID', ''),
+            'client_id': GOOGLE_CLIENT_ID,
             'secret':    os.environ.get('GOOGLE_CLIENT_SECRET', ''),
             'key': ''
         }
@@ -158,5 +178,46 @@ SOCIALACCOUNT_EMAIL_VERIFICATION = 'none'
 SOCIALACCOUNT_EMAIL_REQUIRED = False
 ACCOUNT_EMAIL_VERIFICATION = 'none'
 
+# Bearer token Prometheus scrapes /api/metrics/ with; the endpoint is off when empty
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Read replicas: aliases in DATABASES that serve the GETs of views' `replica_actions`.
+# After a write, the user's reads stay on the primary for REPLICA_STICKY_SECONDS.
+DATABASE_ROUTERS       = ['apps.core.replicas.ReplicaRouter']
+DATABASE_REPLICAS      = []
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+# Live updates (/api/events/): redis://... for Redis pub/sub, memory:// within one process
+EVENTS_BROKER_URL = os.environ.get('EVENTS_BROKER_URL', 'redis://localhost:6379/1')
+
+# Reminders (apps.core.reminders): in-app notifications, plus a digest email per user if enabled
+REMINDER_EMAILS    = os.environ.get('REMINDER_EMAILS', '').lower() == 'true'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'LifeOS <noreply@lifeos.local>')
+
 MEDIA_URL  = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Uploads that must never be served (import files); kept outside MEDIA_ROOT
+PRIVATE_MEDIA_ROOT = BASE_DIR / 'private_media'
+
+# Celery (background jobs such as data imports)
+CELERY_BROKER_URL        = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND    = None
+CELERY_TASK_SERIALIZER   = 'json'
+CELERY_ACCEPT_CONTENT    = ['json']
+CELERY_TIMEZONE          = TIME_ZONE
+CELERY_TASK_ACKS_LATE    = True
+CELERY_BEAT_SCHEDULE     = {
+    'prune-token-blacklist': {
+        'task':     'apps.accounts.tasks.prune_token_blacklist',
+        'schedule': timedelta(hours=6),
+    },
+    'prune-tombstones': {
+        'task':     'apps.core.tasks.prune_tombstones',
+        'schedule': timedelta(days=1),
+    },
+    'send-reminders': {
+        'task':     'apps.core.tasks.send_reminders',
+        'schedule': timedelta(minutes=5),
+    },
+}
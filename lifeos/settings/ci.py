@@ -17,9 +17,22 @@ DATABASES = {
     }
 }
 
+# Stand-in read replica for the routing tests (its own test database)
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'TEST': {'NAME': f"test_{os.environ.get('DB_NAME')}_replica"},
+}
+
 # Disable cache for CI
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
-}
\ No newline at end of file
+}
+
+# Run Celery tasks inline — no broker or worker needed
+CELERY_TASK_ALWAYS_EAGER     = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# Live update events stay in-process — no Redis needed
+EVENTS_BROKER_URL = 'memory://'
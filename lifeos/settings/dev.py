@@ -8,7 +8,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # A separate database standing in for a lagging read replica in the
+    # routing tests; not used unless listed in DATABASE_REPLICAS
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+    },
 }
 
 # Use dummy cache for testing — no Redis needed
@@ -16,4 +22,14 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
-}
\ No newline at end of file
+}
+
+# Run Celery tasks inline — no broker or worker needed
+CELERY_TASK_ALWAYS_EAGER     = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# Live update events stay in-process — no Redis needed
+EVENTS_BROKER_URL = 'memory://'
+
+# Reminder digests are printed, not sent
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
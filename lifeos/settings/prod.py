@@ -1,3 +1,4 @@
+import os
 from .base import *
 
 DEBUG = False
@@ -13,4 +14,16 @@ DATABASES = {
         'HOST': 'db',
         'PORT': '5432',
     }
-}
\ No newline at end of file
+}
+
+# Read replicas: comma-separated hosts in DB_REPLICA_HOSTS, same credentials as the primary
+for number, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica_{number}'] = {**DATABASES['default'], 'HOST': host.strip()}
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+# Outgoing mail (reminder digests)
+EMAIL_HOST          = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT          = int(os.environ.get('EMAIL_PORT', 587))
+EMAIL_HOST_USER     = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS       = os.environ.get('EMAIL_USE_TLS', 'true').lower() == 'true'
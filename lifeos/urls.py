@@ -14,6 +14,8 @@ urlpatterns = [
     path('api/journal/',    include('apps.journal.urls')),
     path('api/todos/',      include('apps.todos.urls')),
     path('api/interviews/', include('apps.interviews.urls')),
+    path('api/async/',      include('apps.core.async_urls')),
+    path('api/',            include('apps.core.urls')),
 
     # API Docs
     path('api/schema/',         SpectacularAPIView.as_view(),     name='schema'),